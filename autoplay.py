@@ -0,0 +1,281 @@
+"""Autoplay bot and headless soak test.
+
+The bot drives GameLogic through the same gesture dicts the camera
+produces: it moves the paddle under the predicted intercept, aims launches
+at live blocks and spends power shots while blocks remain. The soak loop
+runs uncapped without a window and reports crashes, balls stuck in
+loops that never touch the paddle or a block, and per-tick cost.
+
+Usage:
+    python autoplay.py --minutes 60 --difficulty HARD --endless
+"""
+import argparse
+import os
+import random
+import time
+import traceback
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from events import BallLost
+from game_logic import GameLogic
+from game_objects import SCREEN_WIDTH, SCREEN_HEIGHT
+from render_view import RenderView
+from trajectory_predictor import TrajectoryPredictor
+
+TICKS_PER_SECOND = 60
+
+
+class NullCamera:
+    """Stands in for cv2.VideoCapture so GameLogic never opens a camera"""
+
+    def read(self):
+        return False, None
+
+    def release(self):
+        pass
+
+
+def fold(x, low, high):
+    """Reflect x into [low, high] as a ball bouncing between two walls would be"""
+    span = high - low
+    x = (x - low) % (2 * span)
+    return low + (x if x <= span else 2 * span - x)
+
+
+class InterceptPredictor(TrajectoryPredictor):
+    """Closed-form version of the trajectory predictor for the bot.
+
+    Instead of stepping the ball it unfolds the wall bounces, which gives
+    where a ball will cross the paddle line in O(1). Blocks are ignored: a
+    ball that hits one comes back down and is re-predicted then.
+    """
+
+    def intercept(self, ball, line_y):
+        """(ticks until the ball reaches line_y, x there)"""
+        radius = ball.radius
+        if ball.vel_y > 0:
+            distance = line_y - radius - ball.y
+        else:
+            # Up to the ceiling and back down again
+            distance = (ball.y - radius - 1) + (line_y - 2 * radius - 1)
+        ticks = max(distance, 0) / max(abs(ball.vel_y), 1e-6)
+        return ticks, fold(ball.x + ball.vel_x * ticks, radius + 1, SCREEN_WIDTH - radius - 1)
+
+
+class AutoplayAgent:
+    """Produces one player's gesture dict per tick"""
+
+    def __init__(self, game_logic, player=0, seed=None, aim_ticks=30):
+        self.game_logic = game_logic
+        self.player = player
+        self.rng = random.Random(seed)
+        self.predictor = InterceptPredictor(game_logic)
+        self.aim_ticks = aim_ticks  # Aim is smoothed, so hold the cursor still before firing
+        self.aim_target = None
+        self.aim_held = 0
+        self.last_state = 'open'
+
+    def hand_x_for(self, paddle, center_x):
+        """Hand position that moves the paddle's centre to center_x"""
+        travel = max(paddle.max_x - paddle.min_x - paddle.width, 1)
+        ratio = max(0.0, min(1.0, (center_x - paddle.width / 2 - paddle.min_x) / travel))
+        low, high = paddle.input_range
+        return low + ratio * (high - low)
+
+    def live_blocks(self):
+        return [block for block in self.game_logic.blocks if not block.destroyed and block.y >= 0]
+
+    def act(self):
+        game = self.game_logic
+        paddle = game.paddles[self.player]
+        gesture = {'hand_x': 0.5, 'hand_y': 0.5, 'hand_state': 'open', 'detected': True, 'pinch': False}
+        fist = False
+
+        if not game.balls:
+            fist = self.aim(gesture, paddle)
+        else:
+            self.aim_target = None
+            self.track(gesture, paddle)
+            fist = self.want_power_shot(paddle)
+
+        # A fist only registers on the transition, so release it on alternate ticks
+        if fist and self.last_state != 'fist' and paddle.can_perform_fist_action():
+            gesture['hand_state'] = 'fist'
+        self.last_state = gesture['hand_state']
+        return gesture
+
+    def aim(self, gesture, paddle):
+        game = self.game_logic
+        if game.aim_mode and game.aim_player != self.player:
+            return False
+        if not game.aim_mode:
+            return True  # First fist enters aim mode
+        if self.aim_target is None:
+            blocks = self.live_blocks()
+            block = self.rng.choice(blocks) if blocks else None
+            self.aim_target = ((block.x + block.width / 2, block.y + block.height / 2) if block
+                               else (self.rng.uniform(0, SCREEN_WIDTH), SCREEN_HEIGHT / 3))
+            self.aim_held = 0
+        gesture['hand_x'] = self.aim_target[0] / SCREEN_WIDTH
+        gesture['hand_y'] = self.aim_target[1] / SCREEN_HEIGHT
+        self.aim_held += 1
+        return self.aim_held >= self.aim_ticks
+
+    def track(self, gesture, paddle):
+        # Follow the ball that reaches this paddle's lane first
+        best = None
+        for ball in self.game_logic.balls:
+            ticks, x = self.predictor.intercept(ball, paddle.y)
+            if paddle.min_x <= x <= paddle.max_x and (best is None or ticks < best[0]):
+                best = (ticks, x)
+        if best is None:
+            gesture['hand_x'] = self.hand_x_for(paddle, (paddle.min_x + paddle.max_x) / 2)
+            return
+        # Hit slightly off centre, towards a random side, so rallies do not repeat forever
+        offset = self.rng.uniform(-0.3, 0.3) * paddle.width if best[0] < 2 else 0
+        gesture['hand_x'] = self.hand_x_for(paddle, best[1] + offset)
+
+    def want_power_shot(self, paddle):
+        game = self.game_logic
+        if game.power_shots_remaining <= 0 or game.block_store.alive_count < 20:
+            return False
+        # Fire just after a ball leaves the paddle, when it is heading into the blocks
+        return any(ball.vel_y < 0 and ball.y > paddle.y - 60 for ball in game.balls)
+
+
+class SoakReport:
+    def __init__(self):
+        self.ticks = 0
+        self.tick_times = []
+        self.levels_completed = 0
+        self.launches = 0
+        self.balls_lost = 0
+        self.stuck_balls = []   # (tick, x, y, vel_x, vel_y)
+        self.crashes = []       # (tick, traceback text)
+        self.max_score = 0
+
+    def summary(self, wall_time):
+        times = np.array(self.tick_times) * 1000
+        game_time = self.ticks / TICKS_PER_SECOND
+        lines = [
+            f"Game time {game_time / 60:.1f} min in {wall_time:.1f} s ({game_time / max(wall_time, 1e-9):.0f}x real time)",
+            f"Ticks {self.ticks}, levels completed {self.levels_completed}, launches {self.launches}, "
+            f"balls lost {self.balls_lost}, best score {self.max_score}",
+        ]
+        if len(times):
+            p50, p99 = np.percentile(times, [50, 99])
+            lines.append(f"Tick cost: mean {times.mean():.3f} ms, p50 {p50:.3f} ms, p99 {p99:.3f} ms, max {times.max():.3f} ms")
+        lines.append(f"Stuck balls: {len(self.stuck_balls)}")
+        for tick, x, y, vel_x, vel_y in self.stuck_balls[:5]:
+            lines.append(f"  tick {tick}: at ({x:.0f}, {y:.0f}) moving ({vel_x:.2f}, {vel_y:.2f})")
+        lines.append(f"Crashes: {len(self.crashes)}")
+        for tick, text in self.crashes[:5]:
+            lines.append(f"  tick {tick}:\n{text}")
+        return "\n".join(lines)
+
+
+def close_game(game):
+    # GameLogic.cleanup() also tears down OpenCV windows, which headless OpenCV builds do not support
+    if game.endless_levels is not None:
+        game.endless_levels.shutdown()
+    if game.owns_level_cache:
+        game.level_cache.shutdown()
+
+
+def soak(minutes=60, difficulty="MEDIUM", players=1, endless=False, seed=0, stuck_after=60, draw_every=0):
+    """Play `minutes` of game time as fast as possible and return a SoakReport.
+
+    A ball that touches neither a paddle nor a block for `stuck_after`
+    seconds is reported and removed. A crash is recorded and play resumes
+    in a fresh game.
+    """
+    pygame.init()
+    view = RenderView(pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))) if draw_every else None
+    font = pygame.font.Font(None, 24) if draw_every else None
+    report = SoakReport()
+    total_ticks = int(minutes * 60 * TICKS_PER_SECOND)
+    stuck_ticks = stuck_after * TICKS_PER_SECOND
+
+    def new_game():
+        game = GameLogic(None, shared_camera=NullCamera(), difficulty=difficulty, players=players,
+                         endless=endless, seed=seed)
+        agents = [AutoplayAgent(game, player, seed=f"{seed}:{player}") for player in range(players)]
+        game.events.subscribe(BallLost, count_lost_ball)
+        return game, agents
+
+    def count_lost_ball(event):
+        report.balls_lost += 1
+
+    game, agents = new_game()
+    last_contact = {}  # ball -> tick it last touched a paddle or block
+    while report.ticks < total_ticks:
+        tick = report.ticks
+        report.ticks += 1
+        try:
+            gestures = [agent.act() for agent in agents]
+            game.current_gesture = gestures[0]
+            game.current_gestures = gestures
+            balls_before = len(game.balls)
+
+            velocities = {ball: ball.vel_y for ball in game.balls}
+            start = time.perf_counter()
+            result = game.update()
+            report.tick_times.append(time.perf_counter() - start)
+
+            if len(game.balls) > balls_before and balls_before == 0:
+                report.launches += 1
+            report.max_score = max(report.max_score, game.score)
+            if result == "LEVEL_COMPLETE":
+                report.levels_completed += 1
+                last_contact.clear()
+            elif result == "GAME_OVER":
+                game.reset_game()
+                last_contact.clear()
+
+            # A vertical bounce anywhere but the ceiling means the ball touched a paddle or block
+            for ball in game.balls:
+                vel_y = velocities.get(ball)
+                if vel_y is None or ((vel_y > 0) != (ball.vel_y > 0) and ball.y > ball.radius + 1):
+                    last_contact[ball] = tick
+            for ball in list(last_contact):
+                if ball not in game.balls:
+                    del last_contact[ball]
+                elif tick - last_contact[ball] > stuck_ticks:
+                    report.stuck_balls.append((tick, ball.x, ball.y, ball.vel_x, ball.vel_y))
+                    game.remove_ball(ball)
+                    del last_contact[ball]
+
+            if draw_every and tick % draw_every == 0:
+                game.draw(view, font, font)
+        except Exception:
+            report.crashes.append((tick, traceback.format_exc()))
+            close_game(game)
+            game, agents = new_game()
+            last_contact.clear()
+
+    close_game(game)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless autoplay soak test")
+    parser.add_argument('--minutes', type=float, default=60, help="game time to play")
+    parser.add_argument('--difficulty', default="MEDIUM", choices=["EASY", "MEDIUM", "HARD", "EXPERT"])
+    parser.add_argument('--players', type=int, default=1, choices=[1, 2])
+    parser.add_argument('--endless', action='store_true', help="continue with generated levels")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--stuck-after', type=float, default=60,
+                        help="seconds without touching a paddle or block before a ball counts as stuck")
+    parser.add_argument('--draw-every', type=int, default=0, help="also render every N ticks (0 = never)")
+    args = parser.parse_args()
+
+    wall_start = time.perf_counter()
+    report = soak(args.minutes, args.difficulty, args.players, args.endless, args.seed,
+                  args.stuck_after, args.draw_every)
+    print(report.summary(time.perf_counter() - wall_start))
+    if report.crashes:
+        raise SystemExit(1)
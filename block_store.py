@@ -0,0 +1,122 @@
+from array import array
+
+# Block types are stored as small integers; the index into this tuple is the code
+BLOCK_TYPES = ('normal', 'strong', 'extra_ball', 'speed_up', 'big_paddle', 'multi_hit')
+TYPE_CODES = {name: code for code, name in enumerate(BLOCK_TYPES)}
+DEFAULT_MAX_HITS = {'normal': 1, 'strong': 2, 'extra_ball': 1, 'speed_up': 1, 'big_paddle': 1, 'multi_hit': 3}
+
+BLOCK_WIDTH = 80
+BLOCK_HEIGHT = 30
+
+
+class BlockStore:
+    """Typed-array storage for the blocks of a level.
+
+    Each column holds one value per block, so a block costs a handful of bytes
+    instead of a full Python object. `alive_count` is kept up to date on every
+    destroy, which makes the level-complete check O(1).
+
+    Streaming levels release rows they no longer need; released rows are reused
+    by `add`. `y_offset` shifts every block vertically at once for scrolling.
+    """
+
+    def __init__(self, events=None):
+        self.events = events  # EventBus that Block handles publish to
+        self.x = array('f')
+        self.y = array('f')
+        self.type = array('B')
+        self.hits = array('H')
+        self.max_hits = array('H')
+        self.alive = array('B')
+        self.alive_count = 0
+        self.free = []
+        self.y_offset = 0.0
+
+    def __len__(self):
+        return len(self.alive)
+
+    def add(self, x, y, block_type='normal', max_hits=None):
+        """Append a block and return its index"""
+        if max_hits is None:
+            max_hits = DEFAULT_MAX_HITS[block_type]
+        self.alive_count += 1
+        if self.free:
+            index = self.free.pop()
+            self.x[index], self.y[index] = x, y
+            self.type[index] = TYPE_CODES[block_type]
+            self.hits[index], self.max_hits[index] = 0, max_hits
+            self.alive[index] = 1
+            return index
+        self.x.append(x)
+        self.y.append(y)
+        self.type.append(TYPE_CODES[block_type])
+        self.hits.append(0)
+        self.max_hits.append(max_hits)
+        self.alive.append(1)
+        return len(self.alive) - 1
+
+    def extend(self, records):
+        """Append (x, y, type, max_hits) records in bulk; returns their index range.
+
+        `records` is either a sequence of tuples or a level pack record array,
+        whose columns are copied in without touching individual blocks.
+        """
+        start = len(self.alive)
+        if hasattr(records, 'dtype'):
+            self.x.frombytes(records['x'].astype('=f4').tobytes())
+            self.y.frombytes(records['y'].astype('=f4').tobytes())
+            self.type.frombytes(records['type'].tobytes())
+            self.max_hits.frombytes(records['max_hits'].astype('=u2').tobytes())
+            records = ()
+        for x, y, block_type, max_hits in records:
+            self.x.append(x)
+            self.y.append(y)
+            self.type.append(TYPE_CODES[block_type])
+            self.max_hits.append(max_hits)
+        count = len(self.x) - start
+        self.hits.extend([0] * count)
+        self.alive.extend([1] * count)
+        self.alive_count += count
+        return range(start, start + count)
+
+    def destroy(self, index):
+        """Mark a block destroyed; returns False if it already was"""
+        if not self.alive[index]:
+            return False
+        self.alive[index] = 0
+        self.alive_count -= 1
+        return True
+
+    def release(self, index):
+        """Drop a block from the level entirely and make its row reusable"""
+        self.destroy(index)
+        self.free.append(index)
+
+    def reset(self, index, block_type, max_hits=None):
+        """Give a block a new type and full health, reviving it if it was destroyed"""
+        if max_hits is None:
+            max_hits = DEFAULT_MAX_HITS[block_type]
+        if not self.alive[index]:
+            self.alive[index] = 1
+            self.alive_count += 1
+        self.type[index] = TYPE_CODES[block_type]
+        self.hits[index], self.max_hits[index] = 0, max_hits
+
+    def hit(self, index):
+        """Register one hit; returns True if the block was destroyed by it"""
+        if not self.alive[index]:
+            return False
+        self.hits[index] += 1
+        if self.hits[index] >= self.max_hits[index]:
+            return self.destroy(index)
+        return False
+
+    def clear(self):
+        for column in (self.x, self.y, self.type, self.hits, self.max_hits, self.alive):
+            del column[:]
+        self.alive_count = 0
+        self.free = []
+        self.y_offset = 0.0
+
+    def all_destroyed(self):
+        return self.alive_count == 0
@@ -0,0 +1,184 @@
+"""Offline evaluation of the gesture classifier on recorded landmark sequences.
+
+Each sequence is a .npz file with
+    landmarks: (T, 21, 3) float array, NaN rows where no hand was detected
+    labels:    (T,) array of 'open', 'fist', 'peace', 'partial' or 'none'
+    pinch:     optional (T,) bool array, True where the hand is pinching
+
+Usage:
+    python evaluate_gestures.py recordings/
+    python evaluate_gestures.py recordings/ --grid fist_openness=0.3,0.35,0.4
+    python evaluate_gestures.py recordings/ --grid pinch=0.04,0.05 --sort pinch_f1
+"""
+import argparse
+import glob
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from gesture_classifier import DEFAULT_THRESHOLDS, HAND_STATES, classify
+from gesture_smoothing import GestureSmoother
+
+LABELS = HAND_STATES + ('none',)
+LABEL_INDEX = {label: i for i, label in enumerate(LABELS)}
+NONE = LABEL_INDEX['none']
+PINCH_THRESHOLDS = ('pinch', 'pinch_openness')
+
+_sequences = None  # loaded once per worker process
+
+
+def sequence_files(path):
+    return sorted(glob.glob(os.path.join(path, '*.npz'))) if os.path.isdir(path) else [path]
+
+
+def has_pinch_labels(path):
+    for file in sequence_files(path):
+        with np.load(file) as data:
+            if 'pinch' in data.files:
+                return True
+    return False
+
+
+def load_sequences(path):
+    files = sequence_files(path)
+    sequences = []
+    for file in files:
+        with np.load(file) as data:
+            labels = np.array([LABEL_INDEX[str(label)] for label in data['labels']], dtype=np.int8)
+            pinch = data['pinch'].astype(bool) if 'pinch' in data.files else None
+            sequences.append((data['landmarks'].astype(np.float32), labels, pinch))
+    return sequences
+
+
+def predict_sequence(landmarks, thresholds, smoothing_window=5):
+    """Run classifier and smoothing over one sequence, as the live detector does.
+
+    Returns (states, pinches); pinch is not smoothed, matching the detector.
+    """
+    detected = ~np.isnan(landmarks).any(axis=(1, 2))
+    predictions = np.full(len(landmarks), NONE, dtype=np.int8)
+    pinches = np.zeros(len(landmarks), dtype=bool)
+    if detected.any():
+        states, pinch, _ = classify(landmarks[detected], thresholds)
+        smoother = GestureSmoother(smoothing_window, min_samples=3)
+        smoothed = [LABEL_INDEX[smoother.update(HAND_STATES[state])] for state in states]
+        predictions[detected] = smoothed
+        pinches[detected] = pinch
+    return predictions, pinches
+
+
+def switch_latencies(labels, predictions):
+    """Frames from each label change until the prediction follows it"""
+    latencies, missed = [], 0
+    changes = np.flatnonzero(labels[1:] != labels[:-1]) + 1
+    bounds = list(changes[1:]) + [len(labels)]
+    for start, end in zip(changes, bounds):
+        hits = np.flatnonzero(predictions[start:end] == labels[start])
+        if len(hits):
+            latencies.append(int(hits[0]))
+        else:
+            missed += 1
+    return latencies, missed
+
+
+def evaluate(thresholds, sequences=None, smoothing_window=5):
+    sequences = _sequences if sequences is None else sequences
+    confusion = np.zeros((len(LABELS), len(LABELS)), dtype=np.int64)
+    latencies, missed = [], 0
+    pinch_counts = np.zeros(3, dtype=np.int64)  # true positives, false positives, false negatives
+    for landmarks, labels, pinch_labels in sequences:
+        predictions, pinches = predict_sequence(landmarks, thresholds, smoothing_window)
+        np.add.at(confusion, (labels, predictions), 1)
+        if pinch_labels is not None:
+            pinch_counts += [(pinches & pinch_labels).sum(), (pinches & ~pinch_labels).sum(),
+                             (~pinches & pinch_labels).sum()]
+        seq_latencies, seq_missed = switch_latencies(labels, predictions)
+        latencies += seq_latencies
+        missed += seq_missed
+    total = confusion.sum()
+    true_pos, false_pos, false_neg = (int(count) for count in pinch_counts)
+    precision = true_pos / (true_pos + false_pos) if true_pos + false_pos else None
+    recall = true_pos / (true_pos + false_neg) if true_pos + false_neg else None
+    f1 = 2 * precision * recall / (precision + recall) if precision and recall else None
+    return {
+        'thresholds': thresholds,
+        'accuracy': float(np.trace(confusion) / total) if total else 0.0,
+        'confusion': confusion.tolist(),
+        'switch_latency_mean': float(np.mean(latencies)) if latencies else None,
+        'switch_latency_p90': float(np.percentile(latencies, 90)) if latencies else None,
+        'switches_missed': missed,
+        'pinch_precision': precision,
+        'pinch_recall': recall,
+        'pinch_f1': f1,
+    }
+
+
+def _init_worker(path):
+    global _sequences
+    _sequences = load_sequences(path)
+
+
+def threshold_grid(grid_args):
+    """Expand ['name=a,b', ...] into threshold dicts over the full product"""
+    axes = []
+    for arg in grid_args:
+        name, values = arg.split('=', 1)
+        if name not in DEFAULT_THRESHOLDS:
+            raise ValueError(f"Unknown threshold '{name}'")
+        axes.append([(name, float(value)) for value in values.split(',')])
+    return [dict(DEFAULT_THRESHOLDS, **dict(combo)) for combo in itertools.product(*axes)]
+
+
+def print_report(result):
+    print(f"Accuracy: {result['accuracy']:.3f}")
+    if result['switch_latency_mean'] is not None:
+        print(f"Switch latency: mean {result['switch_latency_mean']:.2f} frames, "
+              f"p90 {result['switch_latency_p90']:.1f}, missed {result['switches_missed']}")
+    if result['pinch_f1'] is not None:
+        print(f"Pinch: precision {result['pinch_precision']:.3f}, recall {result['pinch_recall']:.3f}, "
+              f"F1 {result['pinch_f1']:.3f}")
+    print("Confusion (rows = label, cols = prediction):")
+    print("         " + " ".join(f"{label:>8}" for label in LABELS))
+    for label, row in zip(LABELS, result['confusion']):
+        print(f"{label:>8} " + " ".join(f"{count:>8}" for count in row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate gesture thresholds on recorded landmarks")
+    parser.add_argument('data', help="directory of .npz sequences (or a single file)")
+    parser.add_argument('--grid', action='append', default=[], metavar='NAME=V1,V2,...',
+                        help="threshold values to sweep; repeat for several thresholds")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--window', type=int, default=5, help="smoothing window")
+    parser.add_argument('--top', type=int, default=5, help="sweep results to list")
+    parser.add_argument('--sort', default='accuracy', choices=['accuracy', 'pinch_f1'], help="metric to rank by")
+    parser.add_argument('--output', help="write all results as JSON")
+    args = parser.parse_args()
+
+    grid = threshold_grid(args.grid) if args.grid else [dict(DEFAULT_THRESHOLDS)]
+    sweeps_pinch = any(arg.split('=', 1)[0] in PINCH_THRESHOLDS for arg in args.grid)
+    if (sweeps_pinch or args.sort == 'pinch_f1') and not has_pinch_labels(args.data):
+        parser.error("pinch thresholds can only be scored on recordings with a 'pinch' array")
+    if len(grid) == 1:
+        results = [evaluate(grid[0], load_sequences(args.data), args.window)]
+    else:
+        with ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(args.data,)) as pool:
+            results = list(pool.map(evaluate, grid, itertools.repeat(None), itertools.repeat(args.window),
+                                    chunksize=max(1, len(grid) // (4 * (args.workers or os.cpu_count() or 1)))))
+
+    results.sort(key=lambda result: result[args.sort] or 0.0, reverse=True)
+    for rank, result in enumerate(results[:args.top], 1):
+        changed = {k: v for k, v in result['thresholds'].items() if v != DEFAULT_THRESHOLDS[k]}
+        print(f"\n#{rank} {changed or 'defaults'}")
+        print_report(result)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+from collections import deque, namedtuple
+
+# Game events. Handlers subscribe by event class.
+BlockHit = namedtuple('BlockHit', 'block')
+BlockDestroyed = namedtuple('BlockDestroyed', 'block power_shot')
+PowerUpReleased = namedtuple('PowerUpReleased', 'power_type x y')
+ScoreAwarded = namedtuple('ScoreAwarded', 'points')
+BallLost = namedtuple('BallLost', 'x')
+
+POWER_UP_TYPES = ('extra_ball', 'speed_up', 'big_paddle')
+
+
+class EventBus:
+    """Queue of game events, delivered to subscribers once per frame"""
+
+    def __init__(self):
+        self._handlers = {}
+        self._queue = deque()
+
+    def subscribe(self, event_type, handler):
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    def unsubscribe(self, event_type, handler):
+        handlers = self._handlers.get(event_type, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    def publish(self, event):
+        self._queue.append(event)
+
+    def dispatch(self):
+        """Deliver queued events, including ones published by handlers"""
+        queue = self._queue
+        while queue:
+            event = queue.popleft()
+            for handler in self._handlers.get(type(event), ()):
+                handler(event)
+
+    def clear(self):
+        self._queue.clear()
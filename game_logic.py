@@ -1,25 +1,56 @@
 import pygame
 import cv2
 import random
-import json
-import os
 import math
-from game_objects import Ball, Block, Paddle, SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK, YELLOW, GREEN, ORANGE, RED
+import time
+from game_objects import BallPool, Block, Paddle, SCREEN_WIDTH, SCREEN_HEIGHT
+from block_store import BlockStore
+from level_cache import LevelCache
+from level_generator import EndlessLevelSource
+from scrolling_level import LevelChunks, ScrollingLevel
+import snapshot
+import telemetry
+from level_watcher import diff_blocks
+from events import BallLost, BlockDestroyed, EventBus, PowerUpReleased, ScoreAwarded
+from particles import ParticleSystem
+from timers import TimerWheel
 from trajectory_predictor import TrajectoryPredictor
 
 class GameLogic:
-    def __init__(self, gesture_detector, shared_camera=None, difficulty="MEDIUM"):    
+    def __init__(self, gesture_detector, shared_camera=None, difficulty="MEDIUM", max_balls=32, players=1,
+                 level_cache=None, endless=False, seed=None, autosaver=None, stats_store=None, level=1,
+                 single_level=False):
         self.gesture_detector = gesture_detector
-        self.paddle = Paddle()
+        self.owns_level_cache = level_cache is None  # Shut down with the game unless it is shared
+        self.level_cache = level_cache if level_cache is not None else LevelCache()
+        # Replay and snapshot headers store the seed as u32, so keep it in range
+        self.seed = seed & 0xFFFFFFFF if seed is not None else random.randrange(1 << 30)
+        self.rng = random.Random(self.seed)  # All gameplay randomness, so replays are deterministic
+        # Endless mode continues with generated levels once the authored ones run out
+        self.endless_levels = EndlessLevelSource(self.seed) if endless else None
+        self.timers = TimerWheel()  # Cooldowns and timed effects, one tick per update()
+        self.players = players
+        self.paddles = self.create_paddles(players)
+        self.paddle = self.paddles[0]
+        self.ball_pool = BallPool(max_balls, self.timers)
         self.balls = []
         self.blocks = []
+        self.scrolling_level = None  # Set while a scrolling level streams its blocks in
+        self.events = EventBus()
+        self.events.subscribe(PowerUpReleased, self.on_power_up_released)
+        self.events.subscribe(ScoreAwarded, self.on_score_awarded)
+        self.events.subscribe(BlockDestroyed, self.on_block_destroyed)
+        self.events.subscribe(BallLost, self.on_ball_lost)
+        self.particles = ParticleSystem()
+        self.block_store = BlockStore(self.events)
         self.score = 0
-        self.level = 1
-        self.last_gesture_state = 'none'
+        self.level = level
+        self.last_gesture_states = ['none'] * players
         self.power_shots_remaining = 2
         self.difficulty = difficulty
         self.apply_difficulty_settings()
         self.aim_mode = False
+        self.aim_player = 0  # Player whose fist entered aim mode
         self.aim_vector = (0, -1)
         self.smooth_aim_vector = (0, -1)  # Used for smoothing
 
@@ -28,6 +59,18 @@ class GameLogic:
         self.trajectory_bounces    = 3      # max wall bounces
         self.trajectory_predictor = TrajectoryPredictor(self)
 
+        # Quality levers, lowered by the quality governor on slow machines
+        self.show_trails = True
+        self.show_block_labels = True
+        self.particle_density = 1.0  # Fraction of the full particle count per burst
+        self.recorder = None  # ReplayRecorder, when this session is being recorded
+        self.autosaver = autosaver  # Writes a snapshot at the start of every level
+        self.checkpoint = None  # Snapshot of the current level's start, for retries
+        self.stats_store = stats_store  # StatsStore receiving scores, clear times and session stats
+        # Tools playing one level in isolation: no next level is loaded or prefetched and loads are not announced
+        self.single_level = single_level
+        self.start_session()
+
 
 
         # Use shared camera or create own (for backwards compatibility)
@@ -41,46 +84,109 @@ class GameLogic:
         self.camera_width = 200
         self.camera_height = 150
         
-        self.load_level(difficulty)
+        self.load_level(difficulty, level)
         self.current_gesture = {'hand_x': 0.5, 'hand_state': 'none', 'detected': False}
+        # One gesture per player; in single-player mode this mirrors current_gesture
+        self.current_gestures = [dict(self.current_gesture) for _ in range(players)]
         self.camera_frame = None
+        self.level_started()
+
+    def create_paddles(self, players):
+        """One paddle per player; with two players each gets half the screen"""
+        if players == 1:
+            return [Paddle(self.timers)]
+        lane = SCREEN_WIDTH / players
+        return [Paddle(self.timers, min_x=i * lane, max_x=(i + 1) * lane, input_range=(i / players, (i + 1) / players))
+                for i in range(players)]
     
     # Add this method to replace generate_blocks()
     def load_level(self, difficulty="MEDIUM", level=1):
-        """Load level from JSON file based on difficulty and level number"""
+        """Load level from the level cache based on difficulty and level number"""
         self.blocks = []
+        self.block_store = BlockStore(self.events)
+        self.scrolling_level = None
         self.current_level_name = f"{difficulty} Level {level}"
-        level_file = os.path.join("levels", f"{difficulty}_{level}.json")
+        level_file = self.level_cache.level_path(difficulty, level)
+        load_start = time.perf_counter()
 
-        if not os.path.exists(level_file):
-            print(f"⚠️ Level file {level_file} not found, using fallback")
+        try:
+            level_data = self.level_cache.get(difficulty, level)
+        except FileNotFoundError:
+            if self.endless_levels is None:
+                if not self.single_level:
+                    print(f"⚠️ Level file {level_file} not found, using fallback")
+                self.generate_blocks_fallback()
+                telemetry.emit("level_load", difficulty=difficulty, level=level, source="fallback",
+                               blocks=len(self.blocks), reason="not found")
+                return
+            level_data = self.endless_levels.get(level)
+        except Exception as e:
+            print(f"❌ Error loading {level_file}: {e}")
+            telemetry.exception("level_load_error", difficulty=difficulty, level=level, path=level_file)
             self.generate_blocks_fallback()
             return
 
-        try:
-            with open(level_file, 'r') as f:
-                level_data = json.load(f)
-            
-            self.current_level_name = level_data.get('level_name', f"{difficulty} Level {level}")
-            level_description = level_data.get('description', '')
+        self.current_level_name = level_data.name or f"{difficulty} Level {level}"
+        if level_data.scrolling:
+            chunks = LevelChunks(level_data.blocks)
+            self.scrolling_level = ScrollingLevel(chunks, self.block_store, self.blocks)
+            message = f"✅ Streaming {len(level_data.blocks)} blocks in {len(chunks)} chunks from {level_data.source}"
+        else:
+            self.blocks = [Block.handle(self.block_store, i) for i in self.block_store.extend(level_data.blocks)]
+            message = f"✅ Loaded {len(self.blocks)} blocks from {level_data.source}"
+        if not self.single_level:
+            print(message)
+            if level_data.description:
+                print(f"📝 {level_data.description}")
+        telemetry.emit("level_load", difficulty=difficulty, level=level, source=level_data.source,
+                       blocks=len(level_data.blocks), scrolling=level_data.scrolling,
+                       ms=round((time.perf_counter() - load_start) * 1000, 3))
 
-            blocks_data = level_data.get('blocks', [])
-            for block_data in blocks_data:
-                block = Block.from_dict(block_data)
-                self.blocks.append(block)
+        # Parse the next level in the background while this one is played
+        if not self.single_level:
+            self.level_cache.prefetch(difficulty, level + 1)
 
-            print(f"✅ Loaded {len(self.blocks)} blocks from {level_file}")
-            if level_description:
-                print(f"📝 {level_description}")
-        except Exception as e:
-            print(f"❌ Error loading {level_file}: {e}")
-            self.generate_blocks_fallback()
 
+    def apply_level_edit(self, level_data):
+        """Patch the running level to match an edited level file, keeping balls and paddles"""
+        if self.scrolling_level is not None or level_data.scrolling:
+            print("⚠️ Scrolling levels are not hot-reloaded; restart the level to see changes")
+            return
+        added, removed, changed = self.patch_blocks(level_data)
+        print(f"🔄 Reloaded {level_data.source}: +{len(added)} -{len(removed)} ~{len(changed)} blocks")
+
+        # Patch the level-start checkpoint the same way, so retries and the autosave get the new layout
+        if self.checkpoint is not None:
+            current = snapshot.capture(self)
+            snapshot.restore(self, self.checkpoint)
+            self.patch_blocks(level_data)
+            self.checkpoint = snapshot.capture(self)
+            snapshot.restore(self, current)
+            if self.autosaver is not None:
+                self.autosaver.save(self, self.checkpoint)
+        if self.recorder is not None:
+            self.recorder.request_keyframe()
+
+    def patch_blocks(self, level_data):
+        """Turn the live blocks into the layout of `level_data`; returns the diff applied"""
+        added, removed, changed = diff_blocks(self.blocks, level_data.blocks)
+        for block in removed:
+            self.block_store.release(block.index)
+        if removed:
+            removed_set = set(removed)
+            self.blocks = [block for block in self.blocks if block not in removed_set]
+        for block, block_type, max_hits in changed:
+            self.block_store.reset(block.index, block_type, max_hits)
+        for x, y, block_type, max_hits in added:
+            self.blocks.append(Block(x, y, block_type, self.block_store, max_hits))
+        self.current_level_name = level_data.name or self.current_level_name
+        return added, removed, changed
 
     # Keep the old generate_blocks as a fallback
     def generate_blocks_fallback(self):
         """Fallback procedural block generation (original method)"""
         self.blocks = []
+        self.block_store = BlockStore(self.events)
         for row in range(6):
             for col in range(10):
                 x, y = col * 90 + 50, row * 40 + 80
@@ -89,10 +195,10 @@ class GameLogic:
                 elif row == 1:
                     block_type = 'strong'
                 elif col % 4 == 0:
-                    block_type = random.choice(['extra_ball', 'speed_up', 'big_paddle'])
+                    block_type = self.rng.choice(['extra_ball', 'speed_up', 'big_paddle'])
                 else:
                     block_type = 'normal'
-                self.blocks.append(Block(x, y, block_type))
+                self.blocks.append(Block(x, y, block_type, self.block_store))
 #.
 #.
 #.
@@ -117,20 +223,49 @@ class GameLogic:
             self.paddle_size_multiplier = 0.6
         
         # Apply paddle size immediately if paddle exists
-        if hasattr(self, 'paddle'):
+        if hasattr(self, 'paddles'):
             base_width = 100
-            self.paddle.width = int(base_width * self.paddle_size_multiplier)
+            for paddle in self.paddles:
+                paddle.width = int(base_width * self.paddle_size_multiplier)
 
     def reset_game(self):
+        self.finish_session()
+        self.start_session()
         self.score, self.level = 0, 1
-        self.balls = []
+        self.clear_balls()
+        self.events.clear()
+        self.particles.clear()
         self.load_level(self.difficulty, level=1)
-        self.paddle.power_ups = {}
-        self.paddle.peace_cooldown = 0
+        for paddle in self.paddles:
+            paddle.clear_power_ups()
+            paddle.peace_cooldown = 0
         self.aim_mode = False
         self.aim_vector = (0, -1)
         self.trajectory_points = []
         self.apply_difficulty_settings()
+        self.level_started()
+        if self.recorder is not None:
+            self.recorder.request_keyframe()
+
+    def level_started(self):
+        """Checkpoint the fresh level for retries and autosave it in the background"""
+        self.level_start_tick = self.timers.tick
+        if self.scrolling_level is not None:
+            self.checkpoint = None  # Streamed levels cannot be snapshotted
+            return
+        self.checkpoint = snapshot.capture(self)
+        if self.autosaver is not None:
+            self.autosaver.save(self, self.checkpoint)
+
+    def retry_level(self):
+        """Go back to the start of the current level; returns False if there is no checkpoint"""
+        if self.checkpoint is None:
+            return False
+        snapshot.restore(self, self.checkpoint, keep_tick=True)
+        self.level_start_tick = self.timers.tick
+        if self.recorder is not None:
+            self.recorder.request_keyframe()
+        return True
 
     
     def update_gesture(self):
@@ -143,105 +278,194 @@ class GameLogic:
                 self.current_gesture = gesture
                 self.camera_frame = cv2.resize(processed_frame, (self.camera_width, self.camera_height))
     
-    def handle_fist_gesture(self):
+    def handle_fist_gesture(self, player=0):
+        gesture = self.current_gestures[player]
+        paddle = self.paddles[player]
         # Triggered when a new “fist” is detected and paddle is ready
-        if (self.current_gesture['hand_state'] == 'fist'
-                and self.last_gesture_state != 'fist'
-                and self.paddle.can_perform_fist_action()):
+        if (gesture['hand_state'] == 'fist'
+                and self.last_gesture_states[player] != 'fist'
+                and paddle.can_perform_fist_action()):
             
             # ===== Aim-and-Launch Mode =====
             if len(self.balls) == 0:
                 if not self.aim_mode:
                     # First fist: enter aim mode (show trajectory)
                     self.aim_mode = True
-                    self.paddle.perform_fist_action()
+                    self.aim_player = player
+                    paddle.perform_fist_action()
                     return "AIM_MODE"
-                else:
+                elif player == self.aim_player:
                     # Second fist: fire along the selected aim_vector
                     self.launch_ball_with_aim()
                     self.aim_mode = False
                     self.trajectory_points = []
-                    self.paddle.perform_fist_action()
+                    paddle.perform_fist_action()
                     return "LAUNCH"
             
             # ===== Existing Power-Shot Logic =====
             elif self.power_shots_remaining > 0:
                 self.activate_power_shots()
                 self.power_shots_remaining -= 1
-                self.paddle.perform_fist_action()
+                self.session_stats['power_shots_used'] += 1
+                paddle.perform_fist_action()
                 return "POWER_SHOT"
 
         return None
     
     def launch_ball(self):
-        base_vel_x = random.choice([-5, 5])
+        base_vel_x = self.rng.choice([-5, 5])
         base_vel_y = -8
         vel_x = base_vel_x * self.ball_speed_multiplier
         vel_y = base_vel_y * self.ball_speed_multiplier
-        new_ball = Ball(self.paddle.x + self.paddle.width // 2, self.paddle.y - 20, vel_x, vel_y)
-        self.balls.append(new_ball)
+        self.spawn_ball(self.paddle.x + self.paddle.width // 2, self.paddle.y - 20, vel_x, vel_y)
     
+    def spawn_ball(self, x, y, vel_x, vel_y):
+        """Take a ball from the pool; ignored once the live-ball cap is reached"""
+        if not vel_x:
+            # Ball would otherwise pick a random direction from the module RNG
+            vel_x = self.rng.choice([-6, 6])
+        ball = self.ball_pool.acquire(x, y, vel_x, vel_y)
+        if ball is not None:
+            self.balls.append(ball)
+        return ball
+
+    def remove_ball(self, ball):
+        self.balls.remove(ball)
+        self.ball_pool.release(ball)
+
+    def clear_balls(self):
+        for ball in self.balls:
+            self.ball_pool.release(ball)
+        self.balls = []
+
     def activate_power_shots(self):
         for ball in self.balls:
-            ball.power_shot = True
-            ball.power_shot_timer = 100
-            ball.destruction_radius = 40
+            ball.start_power_shot(100, 40)
     
     def update(self):
         # Only update gesture if we own the camera
         if self.owns_camera:
             self.update_gesture()
         
-        self.handle_fist_gesture()
-        self.last_gesture_state = self.current_gesture['hand_state']
+        if self.players == 1:
+            self.current_gestures[0] = self.current_gesture
+        if self.recorder is not None:
+            # Play the tick with the inputs exactly as the replay will store them
+            self.current_gestures = self.recorder.record(self, self.current_gestures)
+            self.current_gesture = self.current_gestures[0]
         
-        self.paddle.update(self.current_gesture)
-        if self.aim_mode and self.current_gesture.get('detected'):
-            cx = int(self.current_gesture['hand_x'] * SCREEN_WIDTH)
-            cy = int(self.current_gesture['hand_y'] * SCREEN_HEIGHT)
+        self.timers.advance()
+        for player, (gesture, paddle) in enumerate(zip(self.current_gestures, self.paddles)):
+            self.handle_fist_gesture(player)
+            if gesture['hand_state'] not in ('none', self.last_gesture_states[player]):
+                self.session_stats['gestures_recognized'] += 1
+            self.last_gesture_states[player] = gesture['hand_state']
+            paddle.update(gesture)
+
+        aim_gesture = self.current_gestures[self.aim_player]
+        if self.aim_mode and aim_gesture.get('detected'):
+            cx = int(aim_gesture['hand_x'] * SCREEN_WIDTH)
+            cy = int(aim_gesture['hand_y'] * SCREEN_HEIGHT)
             self.update_aim_direction(cx, cy)
         # Update balls
         for ball in self.balls[:]:
-            if ball.update(self.paddle, self.blocks):
-                self.score += 5
+            if ball.update(self.paddles, self.blocks, self.show_trails):
+                self.events.publish(ScoreAwarded(5))
             if ball.is_out_of_bounds():
-                self.balls.remove(ball)
+                self.events.publish(BallLost(ball.x))
+                self.remove_ball(ball)
         
-        # Handle power-ups
-        for block in self.blocks:
-            if block.destroyed and block.type in ['extra_ball', 'speed_up', 'big_paddle']:
-                if block.type == 'extra_ball':
-                    base_vel_x = random.choice([-4, 4])
-                    base_vel_y = -6
-                    vel_x = base_vel_x * self.ball_speed_multiplier
-                    vel_y = base_vel_y * self.ball_speed_multiplier
-                    new_ball = Ball(self.paddle.x + self.paddle.width // 2, self.paddle.y - 20, vel_x, vel_y)
-                    self.balls.append(new_ball)
-                elif block.type == 'speed_up':
-                    self.paddle.activate_power_up('speed_up')
-                elif block.type == 'big_paddle':
-                    self.paddle.activate_power_up('big_paddle')
-                block.type = 'normal'
+        # Deliver block, power-up and score events raised this frame
+        self.events.dispatch()
+
+        self.particles.update()
+
+        # Scroll while a ball is in play; after dispatch, so no queued event refers to a released block
+        if self.scrolling_level is not None:
+            self.scrolling_level.update(bool(self.balls))
         
         # In the update() method, replace this section:
         # Check win conditions
-        if all(block.destroyed for block in self.blocks):
+        if self.level_complete():
+            self.record_level_clear()
+            if self.single_level:
+                return "LEVEL_COMPLETE"
             self.level += 1
             self.load_level(self.difficulty, self.level)
-            self.balls = []
+            self.clear_balls()
+            self.level_started()
             return "LEVEL_COMPLETE"
         
-        # Check lose condition (no balls and no way to launch)
-        if len(self.balls) == 0 and not any(not block.destroyed for block in self.blocks):
+        # Check lose condition (no balls and no way to launch); a scrolling level with
+        # chunks still to come is not over just because the screen is empty
+        if len(self.balls) == 0 and self.block_store.all_destroyed() and self.scrolling_level is None:
             return "GAME_OVER"
         
         return "PLAYING"
+
+    def start_session(self):
+        # Identifies this run's score row; a continued game takes over the id of the run it resumes.
+        # Drawn outside self.rng so replays stay deterministic
+        self.run_id = random.getrandbits(63)
+        self.session_started = time.time()
+        self.session_recorded = False
+        self.session_stats = {'levels_cleared': 0, 'power_shots_used': 0, 'gestures_recognized': 0,
+                              'balls_lost': 0, 'blocks_destroyed': 0}
+
+    def record_level_clear(self):
+        self.session_stats['levels_cleared'] += 1
+        if self.stats_store is not None:
+            seconds = (self.timers.tick - self.level_start_tick) / 60  # Game time, so pauses do not count
+            self.stats_store.record_level_clear(self.difficulty, self.level, seconds)
+
+    def finish_session(self):
+        """Queue the score and session stats; only the first call per session records anything"""
+        if self.stats_store is None or self.session_recorded:
+            return
+        self.session_recorded = True
+        self.stats_store.record_score(self.difficulty, self.score, self.level, self.players,
+                                      self.endless_levels is not None, self.run_id)
+        self.stats_store.record_session(self.session_started, self.difficulty, self.players,
+                                        self.endless_levels is not None, self.score, self.level, self.session_stats,
+                                        self.run_id)
+
+    def level_complete(self):
+        if self.scrolling_level is not None:
+            return self.scrolling_level.finished()
+        return self.block_store.all_destroyed()
     
-    def draw_background(self, screen):
-        screen.fill((13, 17, 23))  # Same dark navy as UI
+    def on_power_up_released(self, event):
+        # With two players the power-up goes to the paddle nearest the block
+        paddle = min(self.paddles, key=lambda p: abs(p.x + p.width / 2 - event.x))
+        if event.power_type == 'extra_ball':
+            base_vel_x = self.rng.choice([-4, 4])
+            base_vel_y = -6
+            vel_x = base_vel_x * self.ball_speed_multiplier
+            vel_y = base_vel_y * self.ball_speed_multiplier
+            self.spawn_ball(paddle.x + paddle.width // 2, paddle.y - 20, vel_x, vel_y)
+        else:
+            paddle.activate_power_up(event.power_type)
+
+    def on_score_awarded(self, event):
+        self.score += event.points
+
+    def on_ball_lost(self, event):
+        self.session_stats['balls_lost'] += 1
+
+    def on_block_destroyed(self, event):
+        self.session_stats['blocks_destroyed'] += 1
+        block = event.block
+        rect = (block.x, block.y, block.width, block.height)
+        if event.power_shot:
+            # Blast-radius kills get a hotter, faster burst
+            self.particles.burst(rect, (255, 200, 80), int(16 * self.particle_density), speed=5.0)
+        self.particles.burst(rect, block.color, int(24 * self.particle_density))
+
+    def draw_background(self, view):
+        view.fill((13, 17, 23))  # Same dark navy as UI
 
     
-    def draw_ui(self, screen, font, small_font):
+    def draw_ui(self, view, font, small_font):
         stats = [
             f"Score: {self.score}",
             f"Level: {self.level}",
@@ -251,58 +475,75 @@ class GameLogic:
         
         for i, text in enumerate(stats):
             surface = small_font.render(text, True, (255, 255, 255))
-            screen.blit(surface, (20, 20 + i * 25))
+            view.blit(surface, (20, 20 + i * 25))
 
         # Gesture status
-        gesture = self.current_gesture
-        gesture_text = "Hand: " + gesture['hand_state'].upper() if gesture['detected'] else "No Hand"
-        gesture_color = (0, 255, 0) if gesture['detected'] else (255, 64, 64)
-        gesture_surface = small_font.render(gesture_text, True, gesture_color)
-        screen.blit(gesture_surface, (20, 140))
+        for player, gesture in enumerate(self.current_gestures):
+            gesture_text = "Hand: " + gesture['hand_state'].upper() if gesture['detected'] else "No Hand"
+            if self.players > 1:
+                gesture_text = f"P{player + 1} {gesture_text}"
+            gesture_color = (0, 255, 0) if gesture['detected'] else (255, 64, 64)
+            gesture_surface = small_font.render(gesture_text, True, gesture_color)
+            view.blit(gesture_surface, (20, 140 + player * 25))
 
         if len(self.balls) == 0:
             text = font.render("FIST TO LAUNCH!", True, (255, 255, 0))
-            screen.blit(text, text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2)))
+            view.blit(text, (SCREEN_WIDTH//2, SCREEN_HEIGHT//2), 'center')
 
     
-    def draw_camera_feed(self, screen):
+    def draw_camera_feed(self, view):
         """Draw camera feed - only if we own the camera (backwards compatibility)"""
         if self.owns_camera and hasattr(self, 'camera_frame') and self.camera_frame is not None:
             frame_rgb = cv2.cvtColor(self.camera_frame, cv2.COLOR_BGR2RGB)
             frame_surface = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
-            screen.blit(frame_surface, (SCREEN_WIDTH - self.camera_width - 10, SCREEN_HEIGHT - self.camera_height - 10))
+            size = view.scale_point((self.camera_width, self.camera_height))
+            if frame_surface.get_size() != size:
+                frame_surface = pygame.transform.scale(frame_surface, size)
+            view.blit(frame_surface, (SCREEN_WIDTH - self.camera_width - 10, SCREEN_HEIGHT - self.camera_height - 10))
     
-    def draw(self, screen, font, small_font):
-        self.draw_background(screen)
+    def draw(self, view, font, small_font):
+        """Draw the game through a RenderView; `font` and `small_font` come from the same view"""
+        self.draw_background(view)
         for block in self.blocks:
-            block.draw(screen)
+            block.draw(view, self.show_block_labels)
+        self.particles.draw(view)
         for ball in self.balls:
-            ball.draw(screen)
-        self.paddle.draw(screen)
-        self.draw_ui(screen, font, small_font)
-        self.draw_aim_overlay(screen)
+            ball.draw(view, self.show_trails)
+        for paddle in self.paddles:
+            paddle.draw(view)
+        self.draw_ui(view, font, small_font)
+        self.draw_aim_overlay(view)
 
         # Only draw camera feed if we own the camera
         if self.owns_camera:
-            self.draw_camera_feed(screen)
+            self.draw_camera_feed(view)
     
     def cleanup(self):
+        self.finish_session()
         # Only release camera if we own it
         if self.owns_camera and hasattr(self, 'cap'):
             self.cap.release()
+        if self.endless_levels is not None:
+            self.endless_levels.shutdown()
+        if self.owns_level_cache:
+            self.level_cache.shutdown()
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
         cv2.destroyAllWindows()
 
     def launch_ball_with_aim(self):
             base_speed = 8
             vx = self.aim_vector[0] * base_speed * self.ball_speed_multiplier
             vy = self.aim_vector[1] * base_speed * self.ball_speed_multiplier
-            b = Ball(self.paddle.x + self.paddle.width // 2,
-                    self.paddle.y - 20, vx, vy)
-            self.balls.append(b)
+            paddle = self.paddles[self.aim_player]
+            self.spawn_ball(paddle.x + paddle.width // 2,
+                            paddle.y - 20, vx, vy)
 
     def update_aim_direction(self, cursor_x, cursor_y):
-        px = self.paddle.x + self.paddle.width // 2
-        py = self.paddle.y
+        paddle = self.paddles[self.aim_player]
+        px = paddle.x + paddle.width // 2
+        py = paddle.y
 
         dx = cursor_x - px
         dy = cursor_y - py
@@ -329,6 +570,6 @@ class GameLogic:
 
 
 
-    def draw_aim_overlay(self, screen):
+    def draw_aim_overlay(self, view):
         if self.aim_mode and self.trajectory_points:
-            self.trajectory_predictor.draw(screen, self.trajectory_points)
\ No newline at end of file
+            self.trajectory_predictor.draw(view, self.trajectory_points)
\ No newline at end of file
@@ -1,6 +1,9 @@
 import pygame
 import math
 import random
+from block_store import BlockStore, BLOCK_TYPES, BLOCK_WIDTH, BLOCK_HEIGHT
+from timers import TimerWheel
+from events import BlockHit, BlockDestroyed, PowerUpReleased, POWER_UP_TYPES
 
 #.
 #.
@@ -22,27 +25,90 @@ CYAN = (0, 255, 255)
 SCREEN_WIDTH = 1000
 SCREEN_HEIGHT = 700
 
+class Trail:
+    """Fixed-capacity ring buffer of recent ball positions, oldest first"""
+    __slots__ = ('points', 'start', 'size')
+
+    def __init__(self, capacity=10):
+        self.points = [(0, 0)] * capacity
+        self.start = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        capacity = len(self.points)
+        for i in range(self.size):
+            yield self.points[(self.start + i) % capacity]
+
+    def append(self, point, limit=None):
+        """Add a point, dropping the oldest ones beyond `limit`"""
+        capacity = len(self.points)
+        limit = capacity if limit is None else min(limit, capacity)
+        self.points[(self.start + self.size) % capacity] = point
+        self.size += 1
+        if self.size > limit:
+            self.start = (self.start + self.size - limit) % capacity
+            self.size = limit
+
+    def clear(self):
+        self.start = 0
+        self.size = 0
+
+
 class Ball:
-    def __init__(self, x, y, vel_x=None, vel_y=None, power_shot=False):
+    __slots__ = ('x', 'y', 'radius', 'vel_x', 'vel_y', 'trail', 'active', 'timers', 'owns_timers',
+                 'power_shot', 'destruction_radius', 'power_shot_expiry')
+
+    def __init__(self, x, y, vel_x=None, vel_y=None, power_shot=False, timers=None):
+        self.trail = Trail(10)
+        self.timers = None
+        self.power_shot_expiry = None
+        self.reset(x, y, vel_x, vel_y, power_shot, timers)
+
+    def reset(self, x, y, vel_x=None, vel_y=None, power_shot=False, timers=None):
+        """Reinitialise the ball in place so pooled instances can be reused"""
+        if self.timers is not None:
+            self.timers.cancel(self.power_shot_expiry)
         self.x, self.y = x, y
         self.radius = 8
         self.vel_x = vel_x or random.choice([-6, 6])
         self.vel_y = vel_y or -7
-        self.trail = []
+        self.trail.clear()
         self.active = True
-        self.power_shot = power_shot
-        self.power_shot_timer = 300 if power_shot else 0
-        self.destruction_radius = 60 if power_shot else 0
+        # Balls created outside a game tick their own wheel in update()
+        self.timers = timers if timers is not None else TimerWheel()
+        self.owns_timers = timers is None
+        self.power_shot = False
+        self.destruction_radius = 0
+        self.power_shot_expiry = None
+        if power_shot:
+            self.start_power_shot(300, 60)
+
+    @property
+    def power_shot_timer(self):
+        return self.timers.remaining(self.power_shot_expiry)
+
+    def start_power_shot(self, duration, destruction_radius):
+        self.timers.cancel(self.power_shot_expiry)
+        self.power_shot = True
+        self.destruction_radius = destruction_radius
+        self.power_shot_expiry = self.timers.schedule(duration, self.end_power_shot, 'ball.power_shot')
+
+    def end_power_shot(self):
+        self.timers.cancel(self.power_shot_expiry)
+        self.power_shot_expiry = None
+        self.power_shot = False
+        self.destruction_radius = 0
         
-    def update(self, paddle, blocks):
+    def update(self, paddles, blocks, record_trail=True):
+        """Move one step; `paddles` is a Paddle or a list of them"""
         if not self.active:
             return False
         
-        if self.power_shot_timer > 0:
-            self.power_shot_timer -= 1
-            if self.power_shot_timer <= 0:
-                self.power_shot = False
-                self.destruction_radius = 0
+        if self.owns_timers:
+            self.timers.advance()
             
         self.x += self.vel_x
         self.y += self.vel_y
@@ -59,9 +125,8 @@ class Ball:
             self.vel_y *= factor
         
         # Trail
-        self.trail.append((int(self.x), int(self.y)))
-        if len(self.trail) > (10 if self.power_shot else 6):
-            self.trail.pop(0)
+        if record_trail:
+            self.trail.append((int(self.x), int(self.y)), 10 if self.power_shot else 6)
         
         # Wall collisions
         if self.x <= self.radius or self.x >= SCREEN_WIDTH - self.radius:
@@ -72,7 +137,9 @@ class Ball:
             self.vel_y = -self.vel_y
             self.y = self.radius + 1
         
-        return self.check_paddle_collision(paddle) or self.check_block_collisions(blocks)
+        if isinstance(paddles, Paddle):
+            paddles = (paddles,)
+        return any(self.check_paddle_collision(paddle) for paddle in paddles) or self.check_block_collisions(blocks)
     
     def check_paddle_collision(self, paddle):
         if (self.y + self.radius >= paddle.y and self.y + self.radius <= paddle.y + paddle.height + 10 and
@@ -126,7 +193,7 @@ class Ball:
             # Destroy all hit blocks
             for block in hit_blocks:
                 if self.power_shot and block.type != 'multi_hit':
-                    block.destroyed = True
+                    block.destroy(power_shot=True)
                 else:
                     block.hit()
             
@@ -142,61 +209,148 @@ class Ball:
     def is_out_of_bounds(self):
         return self.y > SCREEN_HEIGHT + 50
     
-    def draw(self, screen):
+    def draw(self, view, show_trail=True):
         if not self.active:
             return
 
         ball_color = (242, 242, 242)  # Slightly off-white
         edge_color = (0, 255, 255)
 
+        if show_trail and len(self.trail) > 1:
+            # Older points are smaller and darker
+            trail_color = (255, 56, 96) if self.power_shot else edge_color
+            count = len(self.trail)
+            for i, point in enumerate(self.trail):
+                fade = (i + 1) / (count + 1)
+                color = tuple(int(c * fade) for c in trail_color)
+                view.circle(color, point, max(1, int(self.radius * fade * 0.8)))
+
         if self.power_shot:
             pulse = 1 + 0.3 * math.sin(pygame.time.get_ticks() * 0.02)
             radius = int(self.radius * pulse)
-            pygame.draw.circle(screen, (255, 56, 96), (int(self.x), int(self.y)), radius)
-            pygame.draw.circle(screen, (255, 255, 0), (int(self.x), int(self.y)), radius, 2)
+            view.circle((255, 56, 96), (int(self.x), int(self.y)), radius)
+            view.circle((255, 255, 0), (int(self.x), int(self.y)), radius, 2)
         else:
-            pygame.draw.circle(screen, ball_color, (int(self.x), int(self.y)), self.radius)
-            pygame.draw.circle(screen, edge_color, (int(self.x), int(self.y)), self.radius, 2)
+            view.circle(ball_color, (int(self.x), int(self.y)), self.radius)
+            view.circle(edge_color, (int(self.x), int(self.y)), self.radius, 2)
+
+
+class BallPool:
+    """Recycles Ball instances and caps how many can be live at once"""
 
+    def __init__(self, max_live=32, timers=None):
+        self.max_live = max_live
+        self.timers = timers
+        self.live = 0
+        self.free = []
+
+    def acquire(self, x, y, vel_x=None, vel_y=None, power_shot=False):
+        """Return a ready ball, or None when `max_live` balls are in play"""
+        if self.live >= self.max_live:
+            return None
+        self.live += 1
+        if self.free:
+            ball = self.free.pop()
+            ball.reset(x, y, vel_x, vel_y, power_shot, self.timers)
+            return ball
+        return Ball(x, y, vel_x, vel_y, power_shot, self.timers)
+
+    def release(self, ball):
+        ball.end_power_shot()
+        ball.active = False
+        self.live -= 1
+        self.free.append(ball)
 
 
 class Block:
-    def __init__(self, x, y, block_type='normal'):
-        self.x, self.y = x, y
-        self.width, self.height = 80, 30
-        self.type = block_type
-        self.destroyed = False
-        self.hits = 0
-        self.max_hits = {'normal': 1, 'strong': 2, 'extra_ball': 1, 'speed_up': 1, 'big_paddle': 1, 'multi_hit': 3}[block_type]
-        self.color = {'normal': BLUE, 'strong': RED, 'extra_ball': GREEN, 'speed_up': YELLOW, 'big_paddle': PURPLE, 'multi_hit': ORANGE}[block_type]
-    
+    """Lightweight handle to one block row in a BlockStore"""
+    __slots__ = ('store', 'index')
+
+    width, height = BLOCK_WIDTH, BLOCK_HEIGHT
+    colors = {'normal': BLUE, 'strong': RED, 'extra_ball': GREEN, 'speed_up': YELLOW, 'big_paddle': PURPLE, 'multi_hit': ORANGE}
+
+    def __init__(self, x, y, block_type='normal', store=None, max_hits=None):
+        # Standalone blocks get a private store so old call sites keep working
+        self.store = store if store is not None else BlockStore()
+        self.index = self.store.add(x, y, block_type, max_hits)
+
     @classmethod
-    def from_dict(cls, block_data):
+    def from_dict(cls, block_data, store=None):
         """Create a Block instance from a dictionary (JSON data)"""
         block_type = block_data.get('type', 'normal')
         x = block_data.get('x', 0)
         y = block_data.get('y', 0)
-        
-        # Create the block with the specified type
-        block = cls(x, y, block_type)
-        
+
         # Override max_hits if specified in JSON (for custom hit counts)
-        if 'hits' in block_data:
-            block.max_hits = block_data['hits']  # Set max hits from JSON
-            # block.hits stays at 0 (no hits taken yet)
-        
+        max_hits = block_data.get('hits')
+
+        return cls(x, y, block_type, store, max_hits)
+
+    @classmethod
+    def handle(cls, store, index):
+        """Wrap an existing store row without adding a new block"""
+        block = cls.__new__(cls)
+        block.store = store
+        block.index = index
         return block
-    
+
+    @property
+    def x(self):
+        return self.store.x[self.index]
+
+    @property
+    def y(self):
+        return self.store.y[self.index] + self.store.y_offset
+
+    @property
+    def type(self):
+        return BLOCK_TYPES[self.store.type[self.index]]
+
+    @property
+    def hits(self):
+        return self.store.hits[self.index]
+
+    @property
+    def max_hits(self):
+        return self.store.max_hits[self.index]
+
+    @property
+    def color(self):
+        return self.colors[self.type]
+
+    @property
+    def destroyed(self):
+        return not self.store.alive[self.index]
+
+    @destroyed.setter
+    def destroyed(self, value):
+        if value:
+            self.destroy()
+
     def hit(self):
-        self.hits += 1
-        if self.hits >= self.max_hits:
-            self.destroyed = True
+        events = self.store.events
+        if events is not None:
+            events.publish(BlockHit(self))
+        if self.store.hit(self.index):
+            self._publish_destroyed(power_shot=False)
             return self.type
         return None
-    
-    
-    
-    def draw(self, screen):
+
+    def destroy(self, power_shot=False):
+        """Destroy the block outright, e.g. from a power shot's blast radius"""
+        if self.store.destroy(self.index):
+            self._publish_destroyed(power_shot)
+
+    def _publish_destroyed(self, power_shot):
+        events = self.store.events
+        if events is None:
+            return
+        events.publish(BlockDestroyed(self, power_shot))
+        block_type = self.type
+        if block_type in POWER_UP_TYPES:
+            events.publish(PowerUpReleased(block_type, self.x + self.width / 2, self.y + self.height / 2))
+
+    def draw(self, view, show_label=True):
         if self.destroyed:
             return
 
@@ -209,12 +363,12 @@ class Block:
 
         # Rounded block with border
         block_rect = pygame.Rect(self.x, self.y, self.width, self.height)
-        pygame.draw.rect(screen, color, block_rect, border_radius=6)
-        pygame.draw.rect(screen, (255, 255, 255), block_rect, width=2, border_radius=6)
+        view.rect(color, block_rect, border_radius=6)
+        view.rect((255, 255, 255), block_rect, width=2, border_radius=6)
 
         # Subtle text indicator
-        if self.type != 'normal':
-            font = pygame.font.Font(None, 20)
+        if show_label and self.type != 'normal':
+            font = view.font(None, 20)
             text_map = {
                 'strong': 'S',
                 'extra_ball': '+',
@@ -224,51 +378,71 @@ class Block:
             }
             label = text_map.get(self.type, '?')
             text = font.render(label, True, (255, 255, 255))
-            text_rect = text.get_rect(center=block_rect.center)
-            screen.blit(text, text_rect)
+            view.blit(text, block_rect.center, 'center')
 
     
 
 
 class Paddle:
-    def __init__(self):
+    def __init__(self, timers=None, min_x=0, max_x=SCREEN_WIDTH, input_range=(0.0, 1.0)):
         self.width, self.height = 100, 15
-        self.x = SCREEN_WIDTH // 2 - self.width // 2
+        # Horizontal lane the paddle may use, and the slice of the camera's
+        # hand_x range mapped onto it (split-screen two-player mode)
+        self.min_x, self.max_x = min_x, max_x
+        self.input_range = input_range
+        self.x = (min_x + max_x) // 2 - self.width // 2
         self.y = SCREEN_HEIGHT - 40
         self.speed = 8
         self.target_x = self.x
-        self.power_ups = {}
-        self.fist_action_cooldown = 0
-        self.peace_cooldown = 0
+        # Cooldowns and power-ups are timers on the game's wheel; a paddle
+        # created on its own ticks a private wheel in update()
+        self.timers = timers if timers is not None else TimerWheel()
+        self.owns_timers = timers is None
+        self.power_ups = {}  # power type -> expiry Timer
+        self.fist_timer = None
+        self.peace_timer = None
+
+    @property
+    def fist_action_cooldown(self):
+        return self.timers.remaining(self.fist_timer)
+
+    @fist_action_cooldown.setter
+    def fist_action_cooldown(self, ticks):
+        self.timers.cancel(self.fist_timer)
+        self.fist_timer = self.timers.schedule(ticks, name='paddle.fist_cooldown') if ticks > 0 else None
+
+    @property
+    def peace_cooldown(self):
+        return self.timers.remaining(self.peace_timer)
+
+    @peace_cooldown.setter
+    def peace_cooldown(self, ticks):
+        self.timers.cancel(self.peace_timer)
+        self.peace_timer = self.timers.schedule(ticks, name='paddle.peace_cooldown') if ticks > 0 else None
         
     def update(self, gesture):
+        if self.owns_timers:
+            self.timers.advance()
+
         if not gesture['detected']:
             return
-        
-        # Update cooldowns
-        if self.fist_action_cooldown > 0:
-            self.fist_action_cooldown -= 1
-        if self.peace_cooldown > 0:
-            self.peace_cooldown -= 1
             
         # Movement
-        target_ratio = gesture['hand_x']
-        self.target_x = (SCREEN_WIDTH - self.width) * target_ratio
+        low, high = self.input_range
+        target_ratio = max(0.0, min(1.0, (gesture['hand_x'] - low) / (high - low)))
+        self.target_x = self.min_x + (self.max_x - self.min_x - self.width) * target_ratio
         diff = self.target_x - self.x
         self.x += diff * 0.4
-        self.x = max(0, min(SCREEN_WIDTH - self.width, self.x))
+        self.clamp()
         
         # Peace gesture for big paddle (with cooldown)
         if gesture['hand_state'] == 'peace' and self.peace_cooldown <= 0 and 'big_paddle' not in self.power_ups:
             self.activate_power_up('big_paddle')
             self.peace_cooldown = 1200  # 20 second cooldown
-        
-        # Update power-up timers
-        for power_up in list(self.power_ups.keys()):
-            self.power_ups[power_up] -= 1
-            if self.power_ups[power_up] <= 0:
-                self.deactivate_power_up(power_up)
     
+    def clamp(self):
+        self.x = max(self.min_x, min(self.max_x - self.width, self.x))
+
     def can_perform_fist_action(self):
         return self.fist_action_cooldown <= 0
     
@@ -280,33 +454,46 @@ class Paddle:
     
     def activate_power_up(self, power_type):
         if power_type == 'big_paddle':
-            self.power_ups['big_paddle'] = 600  # 10 seconds
             old_width = self.width
             self.width = 150
             self.x -= (self.width - old_width) / 2
-            self.x = max(0, min(SCREEN_WIDTH - self.width, self.x))
+            self.clamp()
         elif power_type == 'speed_up':
-            self.power_ups['speed_up'] = 600
             self.speed = 12
+        else:
+            return
+        # Re-activating restarts the 10 second duration
+        self.schedule_power_up_expiry(power_type, 600)
+
+    def schedule_power_up_expiry(self, power_type, ticks):
+        self.timers.cancel(self.power_ups.get(power_type))
+        self.power_ups[power_type] = self.timers.schedule(
+            ticks, lambda: self.deactivate_power_up(power_type), 'paddle.' + power_type)
     
     def deactivate_power_up(self, power_type):
         if power_type == 'big_paddle':
             old_width = self.width
             self.width = 100
             self.x += (old_width - self.width) / 2
-            self.x = max(0, min(SCREEN_WIDTH - self.width, self.x))
+            self.clamp()
         elif power_type == 'speed_up':
             self.speed = 8
-        del self.power_ups[power_type]
+        self.timers.cancel(self.power_ups.pop(power_type))
+
+    def clear_power_ups(self):
+        """Drop active power-ups without their deactivation effects"""
+        for timer in self.power_ups.values():
+            self.timers.cancel(timer)
+        self.power_ups = {}
     
-    def draw(self, screen):
+    def draw(self, view):
         # Paddle glow if power-up active
         glow = 'big_paddle' in self.power_ups
         paddle_rect = pygame.Rect(int(self.x), int(self.y), self.width, self.height)
         
         if glow:
             glow_color = (131, 56, 236)
-            pygame.draw.rect(screen, glow_color, paddle_rect.inflate(10, 4), border_radius=8)
+            view.rect(glow_color, paddle_rect.inflate(10, 4), border_radius=8)
         
-        pygame.draw.rect(screen, (0, 255, 225), paddle_rect, border_radius=8)
-        pygame.draw.rect(screen, (255, 255, 255), paddle_rect, 2, border_radius=8)
\ No newline at end of file
+        view.rect((0, 255, 225), paddle_rect, border_radius=8)
+        view.rect((255, 255, 255), paddle_rect, 2, border_radius=8)
\ No newline at end of file
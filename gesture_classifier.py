@@ -0,0 +1,89 @@
+import numpy as np
+
+# MediaPipe hand landmark indices
+THUMB_IP, THUMB_TIP = 3, 4
+PALM_CENTER = 9
+FINGER_TIPS = np.array([4, 8, 12, 16, 20])
+FINGER_PIP_PAIRS = np.array([[8, 6], [12, 10], [16, 14], [20, 18]])  # index, middle, ring, pinky
+
+# Hand-tuned thresholds in normalised image units
+DEFAULT_THRESHOLDS = {
+    'pinch': 0.05,            # thumb-index tip distance for a pinch
+    'pinch_openness': 0.25,   # minimum openness for a pinch to count
+    'fist_openness': 0.35,    # below this (with <= 2 fingers) is a fist
+    'open_openness': 0.45,    # above this is an open palm
+    'thumb': 0.03,            # sideways thumb offset for "thumb up"
+}
+
+HAND_STATES = ('open', 'fist', 'peace', 'partial')
+OPEN, FIST, PEACE, PARTIAL = range(len(HAND_STATES))
+
+
+def landmarks_to_array(hand_landmarks):
+    """Convert one MediaPipe hand to a (21, 3) float32 array"""
+    return np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32)
+
+
+def extract_features(landmarks, thresholds=None):
+    """Compute per-hand features for a (21, 3) array or an (N, 21, 3) batch.
+
+    Returns a dict of arrays with a leading batch dimension.
+    """
+    t = DEFAULT_THRESHOLDS if thresholds is None else thresholds
+    lm = np.asarray(landmarks, dtype=np.float32)
+    if lm.ndim == 2:
+        lm = lm[np.newaxis]
+    xy = lm[:, :, :2]
+
+    tip_distances = np.linalg.norm(xy[:, FINGER_TIPS] - xy[:, PALM_CENTER:PALM_CENTER + 1], axis=-1)
+    openness = np.minimum(tip_distances.sum(axis=1), 0.8)
+    pinch_distance = np.linalg.norm(xy[:, THUMB_TIP] - xy[:, 8], axis=-1)
+
+    thumb_up = np.abs(xy[:, THUMB_TIP, 0] - xy[:, THUMB_IP, 0]) > t['thumb']
+    fingers_extended = xy[:, FINGER_PIP_PAIRS[:, 0], 1] < xy[:, FINGER_PIP_PAIRS[:, 1], 1]
+    fingers_up = thumb_up.astype(np.int32) + fingers_extended.sum(axis=1)
+
+    return {
+        'hand_x': xy[:, PALM_CENTER, 0],
+        'hand_y': xy[:, PALM_CENTER, 1],
+        'openness': openness,
+        'pinch_distance': pinch_distance,
+        'fingers_extended': fingers_extended,
+        'fingers_up': fingers_up,
+    }
+
+
+def classify(landmarks, thresholds=None):
+    """Classify one hand or a batch of hands in a single vectorised pass.
+
+    Returns (states, pinch, features) where `states` indexes HAND_STATES and
+    `pinch` is a bool array, both with a leading batch dimension.
+    """
+    t = DEFAULT_THRESHOLDS if thresholds is None else thresholds
+    f = extract_features(landmarks, t)
+    openness, fingers_up = f['openness'], f['fingers_up']
+    extended = f['fingers_extended']
+    pinch_detected = f['pinch_distance'] < t['pinch']
+
+    # Checked in priority order, first match wins
+    pinch = pinch_detected & (fingers_up >= 2) & (openness > t['pinch_openness'])
+    fist = (openness < t['fist_openness']) & (fingers_up <= 2) & ~pinch_detected
+    peace = (fingers_up == 2) & extended[:, 0] & extended[:, 1] & ~pinch_detected
+    is_open = openness > t['open_openness']
+
+    states = np.select([pinch, fist, peace, is_open], [OPEN, FIST, PEACE, OPEN], default=PARTIAL)
+    return states, pinch, f
+
+
+def build_gestures(states, pinch, features):
+    """Turn classify() output into the gesture dicts the game consumes"""
+    return [
+        {
+            'hand_x': float(features['hand_x'][i]),
+            'hand_y': float(features['hand_y'][i]),
+            'hand_state': HAND_STATES[states[i]],
+            'detected': True,
+            'pinch': bool(pinch[i]),
+        }
+        for i in range(len(states))
+    ]
@@ -1,82 +1,90 @@
 import cv2
 import mediapipe as mp
-import math
+import numpy as np
+from gesture_classifier import DEFAULT_THRESHOLDS, landmarks_to_array, extract_features, classify, build_gestures
+from gesture_smoothing import GestureSmoother
+from hand_tracking import HandTracker
+
+PLAYER_COLORS = [(0, 255, 0), (255, 160, 0)]  # BGR landmark colours per player
 
 class ImprovedGestureDetector:
-    def __init__(self):
+    def __init__(self, smoothing_window=5, hysteresis=0, min_confidence=None, thresholds=None, max_num_hands=1):
         self.mp_hands = mp.solutions.hands
+        self.connections = np.array(sorted(self.mp_hands.HAND_CONNECTIONS))
+        self.thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+        self.smoothing = (smoothing_window, hysteresis, min_confidence)
+        self.hands = None
+        self.set_max_hands(max_num_hands)
+
+    def set_max_hands(self, max_num_hands):
+        """Track up to `max_num_hands` hands, one per player"""
+        if self.hands is not None and self.max_num_hands == max_num_hands:
+            return
+        if self.hands is not None:
+            self.hands.close()
+        # Video mode: MediaPipe reuses each hand's tracked ROI from the previous
+        # frame and only reruns palm detection when a hand is lost
         self.hands = self.mp_hands.Hands(
             static_image_mode=False,
-            max_num_hands=1,
+            max_num_hands=max_num_hands,
             min_detection_confidence=0.7,
             min_tracking_confidence=0.6
         )
-        self.mp_draw = mp.solutions.drawing_utils
-        self.gesture_history = []
+        self.max_num_hands = max_num_hands
+        window, hysteresis, min_confidence = self.smoothing
+        self.smoothers = [GestureSmoother(window, min_samples=3, hysteresis=hysteresis, min_confidence=min_confidence)
+                          for _ in range(max_num_hands)]
+        self.smoother = self.smoothers[0]
+        self.tracker = HandTracker(max_num_hands)
         
     def get_hand_openness(self, landmarks):
-        palm_center = landmarks[9]
-        total_distance = sum(
-            math.sqrt((landmarks[tip][0] - palm_center[0])**2 + (landmarks[tip][1] - palm_center[1])**2)
-            for tip in [4, 8, 12, 16, 20]
-        )
-        return min(total_distance, 0.8)
+        return float(extract_features(landmarks)['openness'][0])
     
     def detect_pinch(self, landmarks):
         """Detect pinch gesture between thumb and index finger"""
-        thumb_tip = landmarks[4]
-        index_tip = landmarks[8]
-        distance = math.sqrt((thumb_tip[0] - index_tip[0])**2 + (thumb_tip[1] - index_tip[1])**2)
-        return distance < 0.05  # Threshold for pinch detection
+        return bool(extract_features(landmarks)['pinch_distance'][0] < self.thresholds['pinch'])
     
     def detect_gesture(self, frame):
+        gestures, frame = self.detect_gestures(frame, 1)
+        return gestures[0], frame
+
+    def detect_gestures(self, frame, num_players=None):
+        """Detect one gesture per player; players without a hand get an undetected gesture"""
+        num_players = num_players or self.max_num_hands
         results = self.hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        gesture = {'hand_x': 0.5, 'hand_y': 0.5, 'hand_state': 'none', 'detected': False, 'pinch': False}
+        gestures = [{'hand_x': 0.5, 'hand_y': 0.5, 'hand_state': 'none', 'detected': False, 'pinch': False}
+                    for _ in range(num_players)]
         
         if results.multi_hand_landmarks:
-            landmarks = [[lm.x, lm.y] for lm in results.multi_hand_landmarks[0].landmark]
-            gesture['hand_x'] = landmarks[9][0]  # Palm center X
-            gesture['hand_y'] = landmarks[9][1]  # Palm center Y
-            openness = self.get_hand_openness(landmarks)
-            
-            # Count fingers
-            fingers_up = 0
-            if abs(landmarks[4][0] - landmarks[3][0]) > 0.03: fingers_up += 1  # Thumb
-            for tip, pip in [(8, 6), (12, 10), (16, 14), (20, 18)]:
-                if landmarks[tip][1] < landmarks[pip][1]: fingers_up += 1
-            
-            # Detect pinch FIRST and more strictly
-            pinch_detected = self.detect_pinch(landmarks)
-            
-            # Determine gesture with improved logic
-            if pinch_detected and fingers_up >= 2 and openness > 0.25:
-                # Only pinch if hand is somewhat open and has multiple fingers
-                gesture['hand_state'] = 'open'  # Treat as open for paddle movement
-                gesture['pinch'] = True
-            elif openness < 0.35 and fingers_up <= 2 and not pinch_detected:
-                # More lenient fist detection: slightly higher openness and finger count
-                # But still exclude pinch to avoid confusion
-                gesture['hand_state'] = 'fist'
-                gesture['pinch'] = False
-            elif fingers_up == 2 and landmarks[8][1] < landmarks[6][1] and landmarks[12][1] < landmarks[10][1] and not pinch_detected:
-                # Peace sign only if not pinching
-                gesture['hand_state'] = 'peace'
-                gesture['pinch'] = False
-            elif openness > 0.45:
-                gesture['hand_state'] = 'open'
-                gesture['pinch'] = False
+            # All hands as one (N, 21, 3) batch: features and thresholds are evaluated in one vectorised pass
+            landmarks = np.stack([landmarks_to_array(hand) for hand in results.multi_hand_landmarks])
+            classified = build_gestures(*classify(landmarks, self.thresholds))
+
+            if num_players == 1:
+                players = [0] + [None] * (len(classified) - 1)
             else:
-                gesture['hand_state'] = 'partial'
-                gesture['pinch'] = False
-            
-            gesture['detected'] = True
-            self.gesture_history.append(gesture['hand_state'])
-            if len(self.gesture_history) > 5:  # Increased history for better stability
-                self.gesture_history.pop(0)
-            if len(self.gesture_history) >= 3:
+                players = self.tracker.assign(landmarks[:, 9, :2])
+
+            for gesture, player in zip(classified, players):
+                if player is None or player >= num_players:
+                    continue
                 # Use majority voting for more stable gesture recognition
-                gesture['hand_state'] = max(set(self.gesture_history), key=self.gesture_history.count)
-            
-            self.mp_draw.draw_landmarks(frame, results.multi_hand_landmarks[0], self.mp_hands.HAND_CONNECTIONS)
+                smoother = self.smoothers[player]
+                gesture['hand_state'] = smoother.update(gesture['hand_state'])
+                gesture['confidence'] = smoother.confidence
+                gestures[player] = gesture
+
+            self.draw_hands(frame, landmarks, players)
         
-        return gesture, frame
\ No newline at end of file
+        return gestures, frame
+
+    def draw_hands(self, frame, landmarks, players):
+        """Draw every hand's skeleton with a single polylines call per player"""
+        height, width = frame.shape[:2]
+        points = (landmarks[:, :, :2] * (width, height)).astype(np.int32)
+        for player in set(players):
+            if player is None:
+                continue
+            hands = points[[i for i, p in enumerate(players) if p == player]]
+            segments = hands[:, self.connections].reshape(-1, 2, 2)
+            cv2.polylines(frame, segments, False, PLAYER_COLORS[player % len(PLAYER_COLORS)], 2)
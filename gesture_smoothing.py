@@ -0,0 +1,65 @@
+class GestureSmoother:
+    """Majority vote over the last `window` raw gesture states.
+
+    Keeps a fixed ring of recent states plus a running count per state, so
+    each update is O(1) whatever the window size. `hysteresis` is how many
+    extra votes a challenger needs to replace the current state, and
+    `min_confidence` maps a gesture to the share of the window it must hold
+    before it can be switched to.
+    """
+
+    def __init__(self, window=5, min_samples=3, hysteresis=0, min_confidence=None):
+        self.window = window
+        self.min_samples = min_samples
+        self.hysteresis = hysteresis
+        self.min_confidence = dict(min_confidence or {})
+        self.reset()
+
+    def reset(self):
+        self.ring = [None] * self.window
+        self.pos = 0
+        self.size = 0
+        self.counts = {}
+        self.state = None
+
+    @property
+    def confidence(self):
+        """Share of the window that agrees with the current state"""
+        if not self.size or self.state is None:
+            return 0.0
+        return self.counts.get(self.state, 0) / self.size
+
+    def update(self, raw_state):
+        """Add one raw state and return the smoothed state"""
+        counts = self.counts
+        evicted = None
+        if self.size == self.window:
+            evicted = self.ring[self.pos]
+            counts[evicted] -= 1
+            if not counts[evicted]:
+                del counts[evicted]
+        else:
+            self.size += 1
+        self.ring[self.pos] = raw_state
+        self.pos = (self.pos + 1) % self.window
+        counts[raw_state] = counts.get(raw_state, 0) + 1
+
+        if self.state is None:
+            self.state = raw_state
+            return raw_state
+
+        # Only the incoming state gained a vote; if the current state lost one,
+        # any state may now lead (a scan over the handful of gesture states)
+        challenger = raw_state
+        if evicted == self.state:
+            challenger = max(counts, key=counts.get)
+
+        if challenger != self.state:
+            votes = counts[challenger]
+            if (votes > counts.get(self.state, 0) + self.hysteresis
+                    and votes / self.size >= self.min_confidence.get(challenger, 0.0)):
+                self.state = challenger
+
+        if self.size < self.min_samples:
+            return raw_state
+        return self.state
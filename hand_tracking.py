@@ -0,0 +1,48 @@
+import itertools
+import math
+
+
+class HandTracker:
+    """Keeps each detected hand assigned to the same player across frames.
+
+    Hands are matched to the player whose palm was last seen closest; a
+    player who has not been seen yet is anchored to their side of the
+    camera image (player 1 on the left).
+    """
+
+    def __init__(self, num_players=2, forget_after=30):
+        self.num_players = num_players
+        self.forget_after = forget_after  # frames before a lost player falls back to their anchor
+        self.positions = [None] * num_players
+        self.missed = [0] * num_players
+
+    def anchor(self, player):
+        return ((player + 0.5) / self.num_players, 0.5)
+
+    def assign(self, palms):
+        """Map palm positions (x, y) to player slots; extra hands get None"""
+        players = range(self.num_players)
+        known = [self.positions[p] or self.anchor(p) for p in players]
+        n = min(len(palms), self.num_players)
+
+        best, best_cost = None, math.inf
+        # At most two players, so checking every assignment is cheap
+        for hands in itertools.permutations(range(len(palms)), n):
+            for slots in itertools.permutations(players, n):
+                cost = sum(math.dist(palms[h], known[p]) for h, p in zip(hands, slots))
+                if cost < best_cost:
+                    best, best_cost = list(zip(hands, slots)), cost
+
+        assignment = [None] * len(palms)
+        seen = set()
+        for hand, player in best or []:
+            assignment[hand] = player
+            self.positions[player] = tuple(palms[hand])
+            self.missed[player] = 0
+            seen.add(player)
+        for player in players:
+            if player not in seen:
+                self.missed[player] += 1
+                if self.missed[player] > self.forget_after:
+                    self.positions[player] = None
+        return assignment
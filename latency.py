@@ -0,0 +1,185 @@
+"""End-to-end input latency measurement.
+
+MainGame stamps each freshly detected gesture as it passes through the
+frame: when the camera read starts, when the frame is captured, when
+inference finishes, when the game has updated and when the display has
+flipped. LatencyTracker turns those stamps into per-stage durations.
+
+Run directly, this is a test harness: a synthetic camera shows a bright
+square "hand" that jumps across the frame every `--period` frames, and a
+synthetic detector finds it. Besides the per-stage breakdown it reports
+how long the paddle takes to respond on screen to each jump, which
+includes gesture smoothing and paddle easing that the stages do not show.
+Physical camera exposure and transfer time are not included.
+
+Usage:
+    python main.py --latency                       # report real camera runs on exit
+    python latency.py --frames 1200 --inference-ms 12
+"""
+import argparse
+import bisect
+import os
+import tempfile
+import time
+
+import numpy as np
+
+STAGES = ('capture', 'inference', 'update', 'flip')
+
+
+class LatencyTracker:
+    """Collects per-frame stage stamps and reports latency percentiles"""
+
+    def __init__(self):
+        self.samples = []  # per measured frame: duration of each stage, in seconds
+
+    def start(self):
+        """Stamps for a new frame, begun just before the camera read"""
+        return [time.perf_counter()]
+
+    def stamp(self, stamps):
+        """Mark the end of the next stage; ignored for gestures already measured (e.g. reused between inferences)"""
+        if stamps is None or len(stamps) > len(STAGES):
+            return
+        stamps.append(time.perf_counter())
+        if len(stamps) == len(STAGES) + 1:
+            self.samples.append(np.diff(stamps))
+
+    def report(self):
+        if not self.samples:
+            return "No frames measured"
+        samples = np.array(self.samples) * 1000
+        lines = [f"Latency per stage over {len(samples)} frames (ms)",
+                 f"  {'':<28} {'p50':>7} {'p90':>7} {'p99':>7} {'max':>7}"]
+        columns = [(stage, samples[:, i]) for i, stage in enumerate(STAGES)] + [('total', samples.sum(axis=1))]
+        for name, values in columns:
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            lines.append(f"  {name:<28} {p50:7.2f} {p90:7.2f} {p99:7.2f} {values.max():7.2f}")
+        return "\n".join(lines)
+
+
+class SyntheticCamera:
+    """Camera stand-in: a bright square that jumps between two positions every `period` frames"""
+
+    def __init__(self, size=(640, 480), period=90, positions=(0.25, 0.75), hand_size=80):
+        self.size = size
+        self.period = period
+        self.positions = positions
+        self.hand_size = hand_size
+        self.frame = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+        self.frames = 0
+        self.steps = []  # (time the first frame showing the new position was returned, hand_x)
+
+    def read(self):
+        width, height = self.size
+        hand_x = self.positions[(self.frames // self.period) % len(self.positions)]
+        # MainGame mirrors the camera image, so draw the hand where it will be after the flip
+        left = int((1 - hand_x) * width) - self.hand_size // 2
+        top = height // 2 - self.hand_size // 2
+        self.frame[:] = 0
+        self.frame[top:top + self.hand_size, left:left + self.hand_size] = 255
+        if self.frames % self.period == 0:
+            self.steps.append((time.perf_counter(), hand_x))
+        self.frames += 1
+        return True, self.frame.copy()
+
+    def release(self):
+        pass
+
+
+class SyntheticDetector:
+    """Gesture detector stand-in that locates the synthetic hand as the centroid of bright pixels.
+
+    `inference_ms` sleeps on every frame to stand in for model inference.
+    """
+
+    def __init__(self, inference_ms=0.0):
+        self.inference_ms = inference_ms
+
+    def set_max_hands(self, max_num_hands):
+        pass
+
+    def detect_gestures(self, frame, num_players=None):
+        if self.inference_ms:
+            time.sleep(self.inference_ms / 1000)
+        gestures = [{'hand_x': 0.5, 'hand_y': 0.5, 'hand_state': 'none', 'detected': False, 'pinch': False}
+                    for _ in range(num_players or 1)]
+        columns = np.flatnonzero(frame[:, :, 0].max(axis=0) > 128)
+        rows = np.flatnonzero(frame[:, :, 0].max(axis=1) > 128)
+        if len(columns):
+            gestures[0] = {'hand_x': (columns.mean() + 0.5) / frame.shape[1],
+                           'hand_y': (rows.mean() + 0.5) / frame.shape[0],
+                           'hand_state': 'open', 'detected': True, 'pinch': False}
+        return gestures, frame
+
+
+def response_times(steps, paddle_track, fraction):
+    """Seconds from each motion step until the paddle on screen has covered `fraction` of its move.
+
+    paddle_track: (flip time, paddle x, target x) after every frame.
+    """
+    times = []
+    flip_times = [entry[0] for entry in paddle_track]
+    for (step_time, _), next_step in zip(steps, [step[0] for step in steps[1:]] + [float('inf')]):
+        first = bisect.bisect_left(flip_times, step_time)
+        track = [entry for entry in paddle_track[first:] if entry[0] < next_step]
+        if not track or first == 0:
+            continue
+        # Measure from where the paddle was on the last frame shown before the jump
+        start_x, target_x = paddle_track[first - 1][1], track[-1][2]
+        distance = target_x - start_x
+        if abs(distance) < 1:
+            continue
+        for flip_time, x, _ in track:
+            if (x - start_x) / distance >= fraction:
+                times.append(flip_time - step_time)
+                break
+    return np.array(times) * 1000
+
+
+def run_synthetic(scratch_dir, frames=1200, period=90, inference_ms=0.0, difficulty="MEDIUM"):
+    """Play `frames` frames of MainGame against the synthetic camera; returns (game, steps, paddle track).
+
+    The autosave and stats database go to `scratch_dir`, so the player's save and leaderboard are untouched.
+    """
+    from main import MainGame
+    camera = SyntheticCamera(period=period)
+    game = MainGame(camera=camera, gesture_detector=SyntheticDetector(inference_ms), latency=LatencyTracker(),
+                    autosave_path=os.path.join(scratch_dir, "autosave.snap"),
+                    stats_path=os.path.join(scratch_dir, "stats.db"))
+    game.selected_difficulty = difficulty
+    game.start_game()
+
+    # The frame loop of MainGame.run, sampling the paddle after each flip
+    paddle_track = []
+    for _ in range(frames):
+        game.handle_events()
+        game.update()
+        game.draw()
+        paddle = game.game_logic.paddle
+        paddle_track.append((time.perf_counter(), paddle.x, paddle.target_x))
+        game.ui_manager.clock.tick(game.FPS)
+    return game, camera.steps, paddle_track
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure input latency with a synthetic camera")
+    parser.add_argument('--frames', type=int, default=1200)
+    parser.add_argument('--period', type=int, default=90, help="frames between hand jumps")
+    parser.add_argument('--inference-ms', type=float, default=0.0, help="simulated inference time per frame")
+    parser.add_argument('--difficulty', default="MEDIUM", choices=["EASY", "MEDIUM", "HARD", "EXPERT"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        game, steps, paddle_track = run_synthetic(scratch_dir, args.frames, args.period, args.inference_ms,
+                                                  args.difficulty)
+        print(game.latency.report())
+        print("Hand jump to paddle on screen (ms)")
+        print(f"  {'':<28} {'p50':>7} {'p90':>7} {'max':>7}")
+        for label, fraction in (("first movement", 0.01), ("half way", 0.5), ("90% of the way", 0.9)):
+            times = response_times(steps, paddle_track, fraction)
+            if len(times):
+                p50, p90 = np.percentile(times, [50, 90])
+                print(f"  {label:<28} {p50:7.2f} {p90:7.2f} {times.max():7.2f}  ({len(times)} jumps)")
+        game.latency = None  # Already reported
+        game.cleanup()
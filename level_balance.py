@@ -0,0 +1,223 @@
+"""Monte-Carlo level balancing with the autoplay bot.
+
+Plays many seeded, headless bot games per level across a process pool and
+reports clear rate, clear time, balls lost, power-up usage and how often
+each block is hit. Games run in batches; finished batches are merged into
+a JSON checkpoint so an interrupted run can be resumed with --resume.
+
+Usage:
+    python level_balance.py --games 2000 --difficulty HARD
+    python level_balance.py --games 2000 --resume --checkpoint balance.json
+"""
+import argparse
+import glob
+import json
+import multiprocessing.util
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pygame
+
+from autoplay import AutoplayAgent, NullCamera, TICKS_PER_SECOND, close_game
+from events import BallLost, BlockDestroyed, BlockHit, PowerUpReleased, POWER_UP_TYPES
+from game_logic import GameLogic
+from level_cache import LevelCache
+from level_pack import LEVEL_FILE_PATTERN
+
+DIFFICULTIES = ["EASY", "MEDIUM", "HARD", "EXPERT"]
+
+_level_cache = None  # one per worker process, so each level is parsed once per worker
+
+
+def _init_worker():
+    global _level_cache
+    pygame.init()
+    _level_cache = LevelCache()
+    # Pool workers leave through multiprocessing's exit handlers, not atexit
+    multiprocessing.util.Finalize(None, _level_cache.shutdown, exitpriority=10)
+
+
+def available_levels(level_cache, difficulties=DIFFICULTIES):
+    """(difficulty, level) for every level file or pack entry"""
+    levels = set()
+    for path in glob.glob(os.path.join(level_cache.levels_dir, '*.json')):
+        match = LEVEL_FILE_PATTERN.match(os.path.basename(path))
+        if match:
+            levels.add((match.group(1), int(match.group(2))))
+    if level_cache.pack is not None:
+        levels.update(level_cache.pack.index)
+    return sorted(key for key in levels if key[0] in difficulties)
+
+
+def play_level(difficulty, level, seed, max_ticks):
+    """Play one bot game of a level; returns its stats"""
+    game = GameLogic(None, shared_camera=NullCamera(), difficulty=difficulty, level_cache=_level_cache, seed=seed,
+                     level=level, single_level=True)
+    if game.scrolling_level is not None:
+        raise ValueError(f"{difficulty} level {level} is a scrolling level")
+    agent = AutoplayAgent(game, seed=seed)
+
+    hits = np.zeros(len(game.blocks), dtype=np.int64)
+    stats = {'balls_lost': 0, 'launches': 0, 'power_ups': dict.fromkeys(POWER_UP_TYPES, 0)}
+
+    def on_hit(event):
+        hits[event.block.index] += 1
+
+    def on_destroyed(event):
+        # Power-shot blasts destroy blocks without a BlockHit
+        if event.power_shot:
+            hits[event.block.index] += 1
+
+    def on_lost(event):
+        stats['balls_lost'] += 1
+
+    def on_power_up(event):
+        stats['power_ups'][event.power_type] += 1
+
+    game.events.subscribe(BlockHit, on_hit)
+    game.events.subscribe(BlockDestroyed, on_destroyed)
+    game.events.subscribe(BallLost, on_lost)
+    game.events.subscribe(PowerUpReleased, on_power_up)
+
+    power_shots = game.power_shots_remaining
+    layout = [(float(block.x), float(block.y), block.type) for block in game.blocks]
+    cleared_at = None
+    for tick in range(max_ticks):
+        gesture = agent.act()
+        game.current_gesture = gesture
+        game.current_gestures = [gesture]
+        had_balls = bool(game.balls)
+        if game.update() == "LEVEL_COMPLETE":
+            cleared_at = tick + 1
+            break
+        if game.balls and not had_balls:
+            stats['launches'] += 1
+    stats['power_shots'] = power_shots - game.power_shots_remaining
+    close_game(game)
+    return dict(stats, cleared_at=cleared_at, hits=hits, layout=layout)
+
+
+def play_batch(difficulty, level, seeds, max_ticks):
+    """Play several games and sum them, so only one small result crosses the process boundary"""
+    summary = empty_summary()
+    for seed in seeds:
+        merge(summary, game_summary(play_level(difficulty, level, seed, max_ticks)))
+    return summary
+
+
+def empty_summary():
+    return {'games': 0, 'cleared': 0, 'clear_ticks': [], 'balls_lost': 0, 'launches': 0, 'power_shots': 0,
+            'power_ups': dict.fromkeys(POWER_UP_TYPES, 0), 'hits': None, 'layout': None}
+
+
+def game_summary(result):
+    return {'games': 1, 'cleared': int(result['cleared_at'] is not None),
+            'clear_ticks': [result['cleared_at']] if result['cleared_at'] is not None else [],
+            'balls_lost': result['balls_lost'], 'launches': result['launches'],
+            'power_shots': result['power_shots'], 'power_ups': result['power_ups'],
+            'hits': result['hits'].tolist(), 'layout': result['layout']}
+
+
+def merge(total, part):
+    for key in ('games', 'cleared', 'balls_lost', 'launches', 'power_shots'):
+        total[key] += part[key]
+    total['clear_ticks'] += part['clear_ticks']
+    for power_type, count in part['power_ups'].items():
+        total['power_ups'][power_type] += count
+    if part['hits'] is not None:
+        total['hits'] = part['hits'] if total['hits'] is None else \
+            [a + b for a, b in zip(total['hits'], part['hits'])]
+        total['layout'] = part['layout']
+    return total
+
+
+def level_report(key, summary):
+    games = max(summary['games'], 1)
+    clear_seconds = np.array(summary['clear_ticks'], dtype=float) / TICKS_PER_SECOND
+    lines = [f"{key}: {summary['games']} games, cleared {summary['cleared'] / games:.1%}"]
+    if len(clear_seconds):
+        p50, p90 = np.percentile(clear_seconds, [50, 90])
+        lines.append(f"  clear time: mean {clear_seconds.mean():.1f} s, p50 {p50:.1f} s, p90 {p90:.1f} s")
+    lines.append(f"  per game: balls lost {summary['balls_lost'] / games:.2f}, "
+                 f"launches {summary['launches'] / games:.2f}, power shots {summary['power_shots'] / games:.2f}")
+    lines.append("  power-ups per game: " + ", ".join(
+        f"{power_type} {count / games:.2f}" for power_type, count in summary['power_ups'].items()))
+    if summary['hits']:
+        hits = np.array(summary['hits']) / games
+        order = np.argsort(hits)
+        describe = lambda i: f"({summary['layout'][i][0]:.0f}, {summary['layout'][i][1]:.0f}) {summary['layout'][i][2]} {hits[i]:.2f}"
+        lines.append("  most hit blocks: " + "; ".join(describe(i) for i in order[::-1][:3]))
+        lines.append("  least hit blocks: " + "; ".join(describe(i) for i in order[:3]))
+    return "\n".join(lines)
+
+
+def save_checkpoint(path, checkpoint):
+    # Write then rename, so an interrupted run never leaves a half-written checkpoint
+    with open(path + '.tmp', 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(path + '.tmp', path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Balance levels with parallel bot games")
+    parser.add_argument('--games', type=int, default=1000, help="games per level")
+    parser.add_argument('--difficulty', action='append', choices=DIFFICULTIES,
+                        help="difficulty to analyse; repeat for several (default: all)")
+    parser.add_argument('--level', action='append', type=int, help="level number; repeat for several (default: all)")
+    parser.add_argument('--minutes', type=float, default=10, help="game time before a game counts as not cleared")
+    parser.add_argument('--batch', type=int, default=20, help="games per worker task")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--checkpoint', default="balance_checkpoint.json")
+    parser.add_argument('--resume', action='store_true', help="continue from the checkpoint")
+    parser.add_argument('--output', help="write the per-level summaries as JSON")
+    args = parser.parse_args()
+
+    level_cache = LevelCache()
+    try:
+        levels = [key for key in available_levels(level_cache, args.difficulty or DIFFICULTIES)
+                  if args.level is None or key[1] in args.level]
+    finally:
+        level_cache.shutdown()
+    if not levels:
+        raise SystemExit("No levels to analyse")
+
+    checkpoint = {'summaries': {}, 'done': []}
+    if args.resume and os.path.exists(args.checkpoint):
+        with open(args.checkpoint) as f:
+            checkpoint = json.load(f)
+    done = set(checkpoint['done'])
+
+    max_ticks = int(args.minutes * 60 * TICKS_PER_SECOND)
+    batches = []
+    for difficulty, level in levels:
+        for start in range(0, args.games, args.batch):
+            batch_id = f"{difficulty}_{level}:{start}"
+            if batch_id not in done:
+                seeds = range(args.seed + start, args.seed + min(start + args.batch, args.games))
+                batches.append((batch_id, difficulty, level, list(seeds)))
+
+    print(f"🎲 {len(batches)} batches to play ({len(done)} already in {args.checkpoint})")
+    started = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, initializer=_init_worker) as pool:
+        futures = {pool.submit(play_batch, difficulty, level, seeds, max_ticks): (batch_id, f"{difficulty}_{level}")
+                   for batch_id, difficulty, level, seeds in batches}
+        for finished, future in enumerate(as_completed(futures), 1):
+            batch_id, key = futures[future]
+            summary = checkpoint['summaries'].setdefault(key, empty_summary())
+            merge(summary, future.result())
+            checkpoint['done'].append(batch_id)
+            save_checkpoint(args.checkpoint, checkpoint)
+            print(f"  {finished}/{len(batches)} batches, {time.perf_counter() - started:.0f} s")
+
+    for key in sorted(checkpoint['summaries']):
+        print(level_report(key, checkpoint['summaries'][key]))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(checkpoint['summaries'], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
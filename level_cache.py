@@ -0,0 +1,82 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from level_data import parse_level
+from level_pack import LevelPack
+
+class LevelCache:
+    """Parses each level file once and prefetches upcoming levels on a worker thread.
+
+    Results are cached per (difficulty, level), including failures, so a
+    missing file is only looked up once. `get` raises FileNotFoundError or
+    ValueError for levels that cannot be used.
+    """
+
+    def __init__(self, levels_dir="levels", pack_path="levels.pack"):
+        self.levels_dir = levels_dir
+        # Loose JSON files win over the compiled pack so levels can be edited during development
+        self.pack = LevelPack(pack_path) if pack_path and os.path.exists(pack_path) else None
+        self.levels = {}   # (difficulty, level) -> LevelData or the exception raised loading it
+        self.pending = {}  # (difficulty, level) -> Future
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-prefetch")
+
+    def level_path(self, difficulty, level):
+        return os.path.join(self.levels_dir, f"{difficulty}_{level}.json")
+
+    def load(self, difficulty, level):
+        """Read one level from its JSON file or the pack, returning a LevelData or the exception"""
+        path = self.level_path(difficulty, level)
+        try:
+            if self.pack is not None and not os.path.exists(path):
+                return self.pack.get(difficulty, level)._replace(source=f"level pack ({difficulty} {level})")
+            with open(path, 'r') as f:
+                return parse_level(json.load(f))._replace(source=path)
+        except Exception as e:
+            return e
+
+    def get(self, difficulty, level):
+        key = (difficulty, level)
+        with self.lock:
+            result = self.levels.get(key)
+            future = self.pending.get(key)
+        if result is None:
+            # Wait for an in-flight prefetch rather than parsing twice
+            result = future.result() if future is not None else self.load(difficulty, level)
+            with self.lock:
+                self.levels[key] = result
+                self.pending.pop(key, None)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def prefetch(self, difficulty, level):
+        """Start parsing a level in the background if it is not cached yet"""
+        key = (difficulty, level)
+        with self.lock:
+            if key in self.levels or key in self.pending:
+                return
+            self.pending[key] = self.executor.submit(self._prefetch, key)
+
+    def _prefetch(self, key):
+        result = self.load(*key)
+        with self.lock:
+            if key in self.pending:
+                self.levels[key] = result
+                del self.pending[key]
+        return result
+
+    def invalidate(self, difficulty, level):
+        with self.lock:
+            self.levels.pop((difficulty, level), None)
+            self.pending.pop((difficulty, level), None)
+
+    def shutdown(self):
+        # Prefetches still reading the pack finish first; the mapping cannot be closed under them.
+        # Cached levels hold copies of their records, so they stay valid after the close
+        self.executor.shutdown(wait=self.pack is not None)
+        if self.pack is not None:
+            self.pack.close()
+            self.pack = None
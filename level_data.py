@@ -0,0 +1,31 @@
+from collections import namedtuple
+
+from block_store import DEFAULT_MAX_HITS
+
+# Parsed, validated level. `blocks` holds (x, y, type, max_hits) records: a tuple
+# when parsed from JSON, a record array when read from a level pack. `source`
+# names the file it came from. Scrolling levels may be taller than the screen and
+# are streamed in chunks (see scrolling_level.py).
+LevelData = namedtuple('LevelData', 'name description blocks source scrolling', defaults=(None, False))
+
+
+def parse_level(level_data):
+    """Validate level JSON and convert it to a LevelData"""
+    blocks = []
+    for i, block in enumerate(level_data.get('blocks', [])):
+        block_type = block.get('type', 'normal')
+        if block_type not in DEFAULT_MAX_HITS:
+            raise ValueError(f"block {i}: unknown type '{block_type}'")
+        x, y = block.get('x', 0), block.get('y', 0)
+        if not isinstance(x, (int, float)) or not isinstance(y, (int, float)):
+            raise ValueError(f"block {i}: position must be numeric")
+        # Custom hit counts override the type's default
+        max_hits = block.get('hits', DEFAULT_MAX_HITS[block_type])
+        if not isinstance(max_hits, int) or max_hits < 1:
+            raise ValueError(f"block {i}: hits must be a positive integer")
+        blocks.append((x, y, block_type, max_hits))
+    scrolling = level_data.get('scrolling', False)
+    if not isinstance(scrolling, bool):
+        raise ValueError("scrolling must be true or false")
+    return LevelData(level_data.get('level_name'), level_data.get('description', ''), tuple(blocks),
+                     scrolling=scrolling)
@@ -0,0 +1,108 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from block_store import BLOCK_WIDTH, BLOCK_HEIGHT
+from game_objects import SCREEN_WIDTH, SCREEN_HEIGHT
+from level_data import LevelData
+
+# Blocks must stay clear of the paddle's area at the bottom of the screen
+PLAYFIELD_BOTTOM = SCREEN_HEIGHT - 200
+GRID_COLS, GRID_LEFT, GRID_TOP = 10, 50, 80
+COL_SPACING, ROW_SPACING = 90, 40
+MAX_ROWS = (PLAYFIELD_BOTTOM - GRID_TOP - BLOCK_HEIGHT) // ROW_SPACING + 1
+
+
+def validate_layout(blocks):
+    """Raise ValueError if a block is off screen or two blocks overlap"""
+    cells = {}
+    for i, (x, y, block_type, max_hits) in enumerate(blocks):
+        if x < 0 or y < 0 or x + BLOCK_WIDTH > SCREEN_WIDTH or y + BLOCK_HEIGHT > PLAYFIELD_BOTTOM:
+            raise ValueError(f"block {i} at ({x}, {y}) is outside the playfield")
+        # Blocks are no larger than a cell, so overlaps can only come from neighbouring cells
+        cx, cy = int(x // BLOCK_WIDTH), int(y // BLOCK_HEIGHT)
+        for nx in (cx - 1, cx, cx + 1):
+            for ny in (cy - 1, cy, cy + 1):
+                for j in cells.get((nx, ny), ()):
+                    ox, oy = blocks[j][0], blocks[j][1]
+                    if abs(ox - x) < BLOCK_WIDTH and abs(oy - y) < BLOCK_HEIGHT:
+                        raise ValueError(f"blocks {j} and {i} overlap")
+        cells.setdefault((cx, cy), []).append(i)
+
+
+class LevelGenerator:
+    """Seeded procedural levels that grow denser and tougher with the level number.
+
+    Each level has its own RNG derived from the seed, so a given seed and
+    level always produce the same layout regardless of generation order.
+    """
+
+    def __init__(self, seed=None):
+        self.seed = seed if seed is not None else random.randrange(1 << 30)
+
+    def generate(self, level):
+        rng = random.Random(f"{self.seed}:{level}")
+        rows = min(4 + level // 2, MAX_ROWS)
+        density = min(0.45 + 0.05 * level, 0.95)
+        strong_chance = min(0.1 + 0.03 * level, 0.4)
+        multi_hit_chance = min(0.02 * level, 0.25)
+        power_up_chance = max(0.12 - 0.005 * level, 0.04)
+
+        blocks = []
+        half = GRID_COLS // 2
+        for row in range(rows):
+            # Generate the left half and mirror it for a symmetric layout
+            row_types = []
+            for col in range(half):
+                if rng.random() > density:
+                    row_types.append(None)
+                    continue
+                roll = rng.random()
+                if roll < multi_hit_chance:
+                    row_types.append('multi_hit')
+                elif roll < multi_hit_chance + strong_chance:
+                    row_types.append('strong')
+                elif roll < multi_hit_chance + strong_chance + power_up_chance:
+                    row_types.append(rng.choice(['extra_ball', 'speed_up', 'big_paddle']))
+                else:
+                    row_types.append('normal')
+            row_types += row_types[::-1]
+
+            for col, block_type in enumerate(row_types):
+                if block_type is None:
+                    continue
+                max_hits = {'strong': 2, 'multi_hit': min(3 + level // 5, 6)}.get(block_type, 1)
+                blocks.append((col * COL_SPACING + GRID_LEFT, row * ROW_SPACING + GRID_TOP, block_type, max_hits))
+
+        if not blocks:
+            blocks.append((half * COL_SPACING + GRID_LEFT, GRID_TOP, 'normal', 1))
+        validate_layout(blocks)
+        return LevelData(f"Endless {level}", f"Procedural level {level} (seed {self.seed})",
+                         tuple(blocks), "endless generator")
+
+
+class EndlessLevelSource:
+    """Generates endless levels ahead of the player on a background worker"""
+
+    def __init__(self, seed=None, buffer_size=3):
+        self.generator = LevelGenerator(seed)
+        self.buffer_size = buffer_size
+        self.ready = {}  # level -> Future; only touched from the game thread
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="endless-levels")
+
+    def get(self, level):
+        future = self.ready.pop(level, None)
+        level_data = future.result() if future is not None else self.generator.generate(level)
+
+        # Forget levels behind the player (e.g. after a restart) and keep the buffer topped up
+        for stale in [n for n in self.ready if n < level]:
+            self.ready.pop(stale).cancel()
+        for ahead in range(level + 1, level + 1 + self.buffer_size):
+            if ahead not in self.ready:
+                self.ready[ahead] = self.executor.submit(self.generator.generate, ahead)
+        return level_data
+
+    def shutdown(self):
+        for future in self.ready.values():
+            future.cancel()
+        self.ready.clear()
+        self.executor.shutdown(wait=False)
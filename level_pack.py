@@ -0,0 +1,121 @@
+"""Compile levels/*.json into one indexed binary pack, and read it via mmap.
+
+Layout (little-endian):
+    header       magic, version, level count
+    offset table one fixed-size entry per level: difficulty, level number,
+                 name/description lengths, flags, string offset, block offset,
+                 block count
+    strings      UTF-8 level names and descriptions
+    blocks       fixed-width records: x f32, y f32, type u8, pad u8, max_hits u16
+
+Usage:
+    python level_pack.py [levels_dir] [output]
+"""
+import glob
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+
+import numpy as np
+
+from block_store import TYPE_CODES
+from level_data import LevelData, parse_level
+
+MAGIC = b'BRKPACK\0'
+VERSION = 1
+HEADER = struct.Struct('<8sHHI')         # magic, version, level count, reserved
+ENTRY = struct.Struct('<12sHHHHIII')     # difficulty, level, name len, desc len, flags, strings, blocks, count
+FLAG_SCROLLING = 1
+BLOCK_DTYPE = np.dtype([('x', '<f4'), ('y', '<f4'), ('type', 'u1'), ('pad', 'u1'), ('max_hits', '<u2')])
+
+LEVEL_FILE_PATTERN = re.compile(r'^([A-Z]+)_(\d+)\.json$')
+
+
+def compile_pack(levels_dir="levels", output="levels.pack"):
+    """Validate every level JSON file and write them into a single pack"""
+    levels = []
+    for path in sorted(glob.glob(os.path.join(levels_dir, '*.json'))):
+        match = LEVEL_FILE_PATTERN.match(os.path.basename(path))
+        if not match:
+            continue
+        with open(path, 'r') as f:
+            try:
+                level_data = parse_level(json.load(f))
+            except ValueError as e:
+                raise ValueError(f"{path}: {e}") from None
+        levels.append((match.group(1), int(match.group(2)), level_data))
+
+    strings = bytearray()
+    blocks = bytearray()
+    entries = []
+    for difficulty, level, level_data in levels:
+        name = (level_data.name or '').encode('utf-8')
+        description = (level_data.description or '').encode('utf-8')
+        records = np.zeros(len(level_data.blocks), dtype=BLOCK_DTYPE)
+        for i, (x, y, block_type, max_hits) in enumerate(level_data.blocks):
+            records[i] = (x, y, TYPE_CODES[block_type], 0, max_hits)
+        flags = FLAG_SCROLLING if level_data.scrolling else 0
+        entries.append((difficulty.encode('ascii'), level, len(name), len(description), flags,
+                        len(strings), len(blocks), len(records)))
+        strings += name + description
+        blocks += records.tobytes()
+
+    strings_start = HEADER.size + ENTRY.size * len(entries)
+    # Keep block records 4-byte aligned for the memory-mapped views
+    padding = -(strings_start + len(strings)) % 4
+    blocks_start = strings_start + len(strings) + padding
+
+    with open(output, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(entries), 0))
+        for difficulty, level, name_len, desc_len, flags, string_offset, block_offset, count in entries:
+            f.write(ENTRY.pack(difficulty, level, name_len, desc_len, flags,
+                               strings_start + string_offset, blocks_start + block_offset, count))
+        f.write(strings)
+        f.write(b'\0' * padding)
+        f.write(blocks)
+    return len(entries)
+
+
+class LevelPack:
+    """Memory-mapped level pack; only the pages of the levels actually played are read"""
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, _ = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} level pack")
+        self.index = {}
+        for i in range(count):
+            entry = ENTRY.unpack_from(self.data, HEADER.size + i * ENTRY.size)
+            difficulty = entry[0].rstrip(b'\0').decode('ascii')
+            self.index[(difficulty, entry[1])] = entry[2:]
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def get(self, difficulty, level):
+        entry = self.index.get((difficulty, level))
+        if entry is None:
+            raise FileNotFoundError(f"{difficulty} level {level} is not in the level pack")
+        name_len, desc_len, flags, string_offset, block_offset, count = entry
+        strings = self.data[string_offset:string_offset + name_len + desc_len]
+        name = strings[:name_len].decode('utf-8') or None
+        description = strings[name_len:].decode('utf-8')
+        # Copied out of the mapping, so levels still in use never keep it from being closed
+        blocks = np.frombuffer(self.data, dtype=BLOCK_DTYPE, count=count, offset=block_offset).copy()
+        return LevelData(name, description, blocks, scrolling=bool(flags & FLAG_SCROLLING))
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+
+if __name__ == "__main__":
+    levels_dir = sys.argv[1] if len(sys.argv) > 1 else "levels"
+    output = sys.argv[2] if len(sys.argv) > 2 else "levels.pack"
+    count = compile_pack(levels_dir, output)
+    print(f"✅ Packed {count} levels from {levels_dir} into {output}")
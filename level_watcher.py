@@ -0,0 +1,79 @@
+import os
+import queue
+import threading
+
+from level_pack import LEVEL_FILE_PATTERN
+
+
+class LevelWatcher:
+    """Development helper that reloads level files as they are saved.
+
+    A background thread polls the levels directory for modification times
+    and parses changed files through the level cache, so the game thread
+    only has to drain `changes()` and apply the already-parsed results.
+    """
+
+    def __init__(self, level_cache, interval=0.5):
+        self.level_cache = level_cache
+        self.interval = interval
+        self.queue = queue.Queue()
+        self.stopped = threading.Event()
+        self.stamps = self.scan()
+        self.thread = threading.Thread(target=self.run, name="level-watcher", daemon=True)
+        self.thread.start()
+
+    def scan(self):
+        """(difficulty, level) -> (mtime, size) for every level file"""
+        stamps = {}
+        try:
+            entries = list(os.scandir(self.level_cache.levels_dir))
+        except FileNotFoundError:
+            return stamps
+        for entry in entries:
+            match = LEVEL_FILE_PATTERN.match(entry.name)
+            if match:
+                stat = entry.stat()
+                stamps[(match.group(1), int(match.group(2)))] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            stamps = self.scan()
+            for key, stamp in stamps.items():
+                if self.stamps.get(key) != stamp:
+                    self.queue.put((key, self.level_cache.load(*key)))
+            self.stamps = stamps
+
+    def changes(self):
+        """Reloaded levels since the last call, as ((difficulty, level), LevelData or exception)"""
+        changes = []
+        while True:
+            try:
+                changes.append(self.queue.get_nowait())
+            except queue.Empty:
+                return changes
+
+    def stop(self):
+        self.stopped.set()
+
+
+def position_key(x, y):
+    # Block positions are stored as float32, so compare them at a coarser precision
+    return round(float(x), 2), round(float(y), 2)
+
+
+def diff_blocks(blocks, records):
+    """Compare live blocks with a level's (x, y, type, max_hits) records by position.
+
+    Returns (added records, removed blocks, changed (block, type, max_hits)).
+    Blocks already destroyed in play stay destroyed unless their record changed.
+    """
+    live = {position_key(block.x, block.y): block for block in blocks}
+    added, changed = [], []
+    for x, y, block_type, max_hits in records:
+        block = live.pop(position_key(x, y), None)
+        if block is None:
+            added.append((x, y, block_type, max_hits))
+        elif block.type != block_type or block.max_hits != max_hits:
+            changed.append((block, block_type, max_hits))
+    return added, list(live.values()), changed
@@ -1,10 +1,26 @@
+import argparse
 import pygame
+import os
 import sys
+import time
 import cv2
 from ui_manager import UIManager
 from game_logic import GameLogic
 from gesture_detector import ImprovedGestureDetector
 from emotion_detector import EmotionDetector
+from quality_governor import QualityGovernor
+from level_cache import LevelCache
+from level_watcher import LevelWatcher
+from replay import ReplayRecorder
+from stats_store import StatsStore
+from latency import LatencyTracker
+from video_recorder import VideoRecorder
+from game_objects import SCREEN_WIDTH, SCREEN_HEIGHT
+import snapshot
+import telemetry
+
+AUTOSAVE_PATH = "autosave.snap"
+STATS_PATH = "stats.db"
 
 
 #.
@@ -12,10 +28,27 @@ from emotion_detector import EmotionDetector
 #.
 #.
 class MainGame:
-    def __init__(self):
-        self.ui_manager = UIManager()
-        self.gesture_detector = ImprovedGestureDetector()
+    def __init__(self, fullscreen=False, resizable=False, render_scale=1.0, dev=False, replay_dir=None,
+                 continue_saved=False, record_path=None, record_fps=30, record_scale=0.5, camera=None,
+                 gesture_detector=None, latency=None, autosave_path=AUTOSAVE_PATH, stats_path=STATS_PATH):
+        self.ui_manager = UIManager(fullscreen, resizable, render_scale)
+        self.gesture_detector = gesture_detector if gesture_detector is not None else ImprovedGestureDetector()
+        self.latency = latency  # LatencyTracker stamping each detected gesture through the frame
         self.game_logic = None
+        self.level_cache = LevelCache()  # Shared across games so restarts reuse parsed levels
+        # Dev mode reloads level files as they are saved
+        self.level_watcher = LevelWatcher(self.level_cache) if dev else None
+        self.replay_dir = replay_dir  # Each game is recorded here when set
+        self.autosave_path = autosave_path
+        self.autosaver = snapshot.Autosaver(autosave_path)  # Every level start is saved for crash recovery
+        self.stats_store = StatsStore(stats_path)  # High scores and session stats, written in the background
+        self.video_recorder = None  # Records the composited screen when --record is given
+        if record_path:
+            try:
+                self.video_recorder = VideoRecorder(record_path, (SCREEN_WIDTH, SCREEN_HEIGHT), record_fps, record_scale)
+                print(f"🎥 Recording video to {record_path}")
+            except OSError as e:
+                print(f"❌ Error starting video recording: {e}")
         self.running = True
         self.emotion_detector = EmotionDetector()
         self.current_emotion = None
@@ -24,39 +57,99 @@ class MainGame:
 
         self.FPS = 60
         self.selected_difficulty = "MEDIUM"
+        self.players = 1
+        self.endless = False
 
         # Single camera setup - shared between UI and game
-        self.camera = cv2.VideoCapture(0)
+        self.camera = camera if camera is not None else cv2.VideoCapture(0)
         self.current_gesture = {'hand_x': 0.5, 'hand_y': 0.5, 'hand_state': 'none', 'detected': False, 'pinch': False}
+        self.current_gestures = [self.current_gesture]
         self.camera_frame = None
         self.camera_width = 200
         self.camera_height = 150
+        self.camera_frame_version = 0
+        self.camera_surface = None
+        self.camera_surface_key = None
         # For pause gesture detection
         self.last_pinch_state = False
+        # Per-player gesture state and frames since the hand was last seen, for telemetry
+        self.telemetry_states = ['none', 'none']
+        self.dropout_frames = [0, 0]
+        self.frame_times = telemetry.FrameTimeHistogram()
+
+        # Frame-time driven quality levels; F3 toggles the debug overlay
+        self.quality_governor = QualityGovernor(self.FPS)
+        self.camera_wait = 0.0  # Seconds spent blocked in camera.read() this frame
+        self.frame_count = 0
+        self.show_debug = False
+        self.apply_quality()
+
+        if continue_saved:
+            self.continue_saved_game()
         
     def run(self):
         try:
             while self.running:
+                frame_start = time.perf_counter()
+                self.camera_wait = 0.0
                 self.handle_events()
                 self.update()
                 self.draw()
+                # Only the work counts against the budget, not the tick() sleep or the camera read,
+                # which blocks until the next camera frame however cheap the rest of the frame is
+                frame_time = time.perf_counter() - frame_start
+                self.frame_times.record(frame_time)
+                if self.quality_governor.record(frame_time - self.camera_wait):
+                    print(f"🎚️ Quality level: {self.quality_governor.settings['name']}")
+                    telemetry.emit("quality_level", name=self.quality_governor.settings['name'])
+                    self.apply_quality()
                 self.ui_manager.clock.tick(self.FPS)
             
             self.cleanup()
         except Exception as e:
             print(f"❌ Error: {e}")
+            game = self.game_logic
+            telemetry.exception("crash", state=self.ui_manager.current_state, frame=self.frame_count,
+                                difficulty=game.difficulty if game else None, level=game.level if game else None,
+                                seed=game.seed if game else None)
             self.cleanup()
             input("Press Enter to exit...")
     
     def update_gesture(self):
         """Update gesture detection - shared between UI and game"""
+        self.frame_count += 1
+        quality = self.quality_governor.settings
+        stamps = self.latency.start() if self.latency is not None else None
+        read_start = time.perf_counter()
         ret, frame = self.camera.read()
+        self.camera_wait += time.perf_counter() - read_start
         if ret:
+            if stamps is not None:
+                self.latency.stamp(stamps)
             frame = cv2.flip(frame, 1)
 
-            # Gesture detection
-            gesture, processed_frame = self.gesture_detector.detect_gesture(frame)
-            self.current_gesture = gesture
+            # On slow machines hand inference skips frames, keeping the last gestures
+            if self.frame_count % quality['inference_every'] == 0:
+                scale = quality['inference_scale']
+                hand_frame = frame
+                if scale != 1.0:
+                    # Landmarks are normalised, so a smaller input only costs precision; emotion
+                    # detection below keeps the full-size frame
+                    hand_frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+                # Gesture detection (one gesture per player, player 1 drives the menus)
+                gestures, processed_frame = self.gesture_detector.detect_gestures(hand_frame, self.players)
+                if stamps is not None:
+                    self.latency.stamp(stamps)
+                    for gesture in gestures:
+                        gesture['stamps'] = stamps
+                self.current_gestures = gestures
+                self.current_gesture = gestures[0]
+
+                # Resize frame for display, at a reduced rate on lower quality levels
+                if self.frame_count % quality['preview_every'] == 0:
+                    self.camera_frame = cv2.resize(processed_frame, (self.camera_width, self.camera_height))
+                    self.camera_frame_version += 1
 
             # Emotion detection only every N frames
             self.emotion_counter += 1
@@ -64,14 +157,29 @@ class MainGame:
                 emotion_result = self.emotion_detector.detect_emotion(frame)
                 if emotion_result:
                     self.current_emotion, score = emotion_result
+                    telemetry.emit("emotion", emotion=self.current_emotion, score=score)
                 else:
                     self.current_emotion = None
                 self.emotion_counter = 0
-
-            # Resize frame for display
-            self.camera_frame = cv2.resize(processed_frame, (self.camera_width, self.camera_height))
         else:
             self.current_gesture = {'hand_x': 0.5, 'hand_y': 0.5, 'hand_state': 'none', 'detected': False, 'pinch': False}
+            self.current_gestures = [dict(self.current_gesture) for _ in range(self.players)]
+        if telemetry.enabled():
+            self.emit_gesture_telemetry(ret)
+
+    def emit_gesture_telemetry(self, camera_ok):
+        for player, gesture in enumerate(self.current_gestures):
+            state = gesture['hand_state']
+            if state != self.telemetry_states[player]:
+                telemetry.emit("gesture", player=player, previous=self.telemetry_states[player], state=state)
+                self.telemetry_states[player] = state
+            if not gesture.get('detected'):
+                if self.dropout_frames[player] == 0:
+                    telemetry.emit("detection_lost", player=player, camera_ok=camera_ok)
+                self.dropout_frames[player] += 1
+            elif self.dropout_frames[player]:
+                telemetry.emit("detection_regained", player=player, frames_lost=self.dropout_frames[player])
+                self.dropout_frames[player] = 0
 
 
 
@@ -85,33 +193,41 @@ class MainGame:
             self.last_pinch_state = False
         return False
     
-    def draw_camera_feed(self, screen):
+    def draw_camera_feed(self, view):
         """Draw camera feed for all screens"""
         if hasattr(self, 'camera_frame') and self.camera_frame is not None:
             
-            # Copy the frame
-            frame = self.camera_frame.copy()
-
-            # Draw emotion label
-            if self.current_emotion:
-                cv2.putText(
-                    frame,
-                    f"Emotion: {self.current_emotion}",
-                    (10, 20),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.6,
-                    (0, 255, 0),
-                    2
-                )
-
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_surface = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
+            # Only convert to a surface when the preview frame or label changed
+            key = (self.camera_frame_version, self.current_emotion)
+            if key != self.camera_surface_key:
+                # Copy the frame
+                frame = self.camera_frame.copy()
+
+                # Draw emotion label
+                if self.current_emotion:
+                    cv2.putText(
+                        frame,
+                        f"Emotion: {self.current_emotion}",
+                        (10, 20),
+                        cv2.FONT_HERSHEY_SIMPLEX,
+                        0.6,
+                        (0, 255, 0),
+                        2
+                    )
+
+                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                self.camera_surface = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
+                size = view.scale_point((self.camera_width, self.camera_height))
+                if self.camera_surface.get_size() != size:
+                    self.camera_surface = pygame.transform.scale(self.camera_surface, size)
+                self.camera_surface_key = key
+            frame_surface = self.camera_surface
             
             if self.ui_manager.current_state == "GAME":
-                screen.blit(frame_surface, (screen.get_width() - self.camera_width - 10, 
-                                            screen.get_height() - self.camera_height - 10))
+                view.blit(frame_surface, (SCREEN_WIDTH - self.camera_width - 10, 
+                                          SCREEN_HEIGHT - self.camera_height - 10))
             else:
-                screen.blit(frame_surface, (screen.get_width() - self.camera_width - 10, 10))
+                view.blit(frame_surface, (SCREEN_WIDTH - self.camera_width - 10, 10))
 
 
     
@@ -126,6 +242,10 @@ class MainGame:
             if event.type == pygame.QUIT:
                 self.running = False
                 return
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.show_debug = not self.show_debug
+                continue
             
             # Handle keyboard input for UI navigation
             if self.ui_manager.current_state in ["HOME", "INSTRUCTIONS", "DIFFICULTY", "PAUSE", "GAME_OVER"]:    
@@ -143,6 +263,16 @@ class MainGame:
     
     def handle_menu_action(self, action):
         if action == "PLAY GAME":
+            self.set_players(1)
+            self.endless = False
+            self.ui_manager.set_state("DIFFICULTY")
+        elif action == "TWO PLAYER":
+            self.set_players(2)
+            self.endless = False
+            self.ui_manager.set_state("DIFFICULTY")
+        elif action == "ENDLESS":
+            self.set_players(1)
+            self.endless = True
             self.ui_manager.set_state("DIFFICULTY")
         elif action in ["EASY", "MEDIUM", "HARD", "EXPERT"]:
             self.selected_difficulty = action
@@ -158,17 +288,91 @@ class MainGame:
                 self.game_logic = None
         elif action == "RESUME":
             self.ui_manager.set_state("GAME")
+        elif action == "RETRY LEVEL":
+            if self.game_logic and self.game_logic.retry_level():
+                self.ui_manager.set_state("GAME")
         elif action == "RESTART":
             self.start_game()
         elif action == "QUIT":
             self.running = False
     
-    def start_game(self):
+    def apply_level_changes(self):
+        """Apply level files edited since the last frame (dev mode)"""
+        for (difficulty, level), level_data in self.level_watcher.changes():
+            self.level_cache.invalidate(difficulty, level)
+            if isinstance(level_data, Exception):
+                print(f"❌ Error reloading {difficulty} level {level}: {level_data}")
+                continue
+            game = self.game_logic
+            if game is not None and (game.difficulty, game.level) == (difficulty, level):
+                game.apply_level_edit(level_data)
+
+    def set_players(self, players):
+        self.players = players
+        self.gesture_detector.set_max_hands(players)
+        self.current_gestures = [dict(self.current_gesture) for _ in range(players)]
+
+    def continue_saved_game(self):
+        """Resume from the start of the last autosaved level"""
+        try:
+            settings, data = snapshot.load(self.autosave_path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ No saved game to continue: {e}")
+            return
+        self.set_players(settings['players'])
+        self.selected_difficulty = settings['difficulty']
+        self.endless = settings['endless']
+        self.start_game(seed=settings['seed'], saved_state=data, run_id=settings['run'])
+        print(f"💾 Continuing {self.game_logic.current_level_name}")
+
+    def start_game(self, seed=None, saved_state=None, run_id=None):
+        """Start a new game, or resume run `run_id` from a snapshot of a level start"""
         if self.game_logic:
             self.game_logic.cleanup()
-        # Pass the shared camera and selected difficulty to game logic
-        self.game_logic = GameLogic(self.gesture_detector, shared_camera=self.camera, difficulty=self.selected_difficulty)
+        # Pass the shared camera and selected difficulty to game logic. When resuming, the
+        # autosaver is attached only after the restore, so the fresh level 1 never replaces the save
+        self.game_logic = GameLogic(self.gesture_detector, shared_camera=self.camera, difficulty=self.selected_difficulty,
+                                    players=self.players, level_cache=self.level_cache, endless=self.endless,
+                                    seed=seed, autosaver=self.autosaver if saved_state is None else None,
+                                    stats_store=self.stats_store)
+        if saved_state is not None:
+            try:
+                snapshot.restore(self.game_logic, saved_state)
+            except ValueError as e:
+                # The fresh game is untouched; keep the save file and play on from level 1
+                print(f"⚠️ Could not restore the saved game: {e}")
+            else:
+                # Clear times count from the restored tick, not from the tick the fresh game started at
+                self.game_logic.level_start_tick = self.game_logic.timers.tick
+                self.game_logic.checkpoint = saved_state
+                # Still the same run, so its score replaces the one recorded when it was left
+                self.game_logic.run_id = run_id
+                self.autosaver.save(self.game_logic, saved_state)
+            self.game_logic.autosaver = self.autosaver
+        if self.replay_dir:
+            os.makedirs(self.replay_dir, exist_ok=True)
+            path = os.path.join(self.replay_dir, time.strftime("replay_%Y%m%d_%H%M%S.brr"))
+            self.game_logic.recorder = ReplayRecorder(path, self.game_logic)
+            print(f"⏺️ Recording replay to {path}")
         self.ui_manager.set_state("GAME")
+        self.apply_quality()
+
+    def apply_quality(self):
+        """Push the governor's current quality settings to the running systems"""
+        quality = self.quality_governor.settings
+        self.emotion_interval = quality['emotion_interval']
+        if self.game_logic:
+            self.game_logic.show_trails = quality['trails']
+            self.game_logic.show_block_labels = quality['block_labels']
+            self.game_logic.particle_density = quality['particles']
+
+    def draw_debug_overlay(self, view):
+        governor = self.quality_governor
+        text = (f"Quality: {governor.settings['name']}  "
+                f"Work: {governor.average * 1000:.1f} ms  "
+                f"FPS: {self.ui_manager.clock.get_fps():.0f}")
+        surface = self.ui_manager.small_font.render(text, True, (255, 255, 0))
+        view.blit(surface, (SCREEN_WIDTH // 2, 8), 'midtop')
     
     def update(self):
         # Always update gesture detection with shared camera
@@ -176,6 +380,9 @@ class MainGame:
         
         # Update UI animations
         self.ui_manager.update()
+
+        if self.level_watcher is not None:
+            self.apply_level_changes()
         
         # Update game logic if in game
         if self.ui_manager.current_state == "GAME" and self.game_logic:
@@ -185,6 +392,7 @@ class MainGame:
             else:
                 # Pass the current gesture to game logic instead of letting it capture separately
                 self.game_logic.current_gesture = self.current_gesture
+                self.game_logic.current_gestures = self.current_gestures
                 self.game_logic.camera_frame = self.camera_frame
                 
                 game_state = self.game_logic.update()
@@ -192,48 +400,76 @@ class MainGame:
                 if game_state == "GAME_OVER":
                     # Check if truly game over (no balls and can't launch more)
                     if len(self.game_logic.balls) == 0:
+                        self.game_logic.finish_session()  # Puts the score on the leaderboard shown next
                         self.ui_manager.set_state("GAME_OVER")
+
+        if self.latency is not None:
+            self.latency.stamp(self.current_gesture.get('stamps'))
     
     def draw(self):
+        view = self.ui_manager.view
         if self.ui_manager.current_state == "HOME":
             self.ui_manager.draw_home_screen()
-            self.draw_camera_feed(self.ui_manager.screen)
+            self.draw_camera_feed(view)
         elif self.ui_manager.current_state == "INSTRUCTIONS":
             self.ui_manager.draw_instructions_screen()
-            self.draw_camera_feed(self.ui_manager.screen)
+            self.draw_camera_feed(view)
         elif self.ui_manager.current_state == "DIFFICULTY":
             self.ui_manager.draw_difficulty_screen()
-            self.draw_camera_feed(self.ui_manager.screen)
+            self.draw_camera_feed(view)
 
         elif self.ui_manager.current_state == "GAME":
             if self.game_logic:
                 font, small_font = self.ui_manager.get_fonts()
-                self.game_logic.draw(self.ui_manager.screen, font, small_font)
+                self.game_logic.draw(view, font, small_font)
                 
                 # Draw level information
                 level_name = getattr(self.game_logic, 'current_level_name', 'Unknown Level')
                 self.ui_manager.draw_level_info(level_name, self.selected_difficulty)
                 
                 # Draw camera feed on top of game
-                self.draw_camera_feed(self.ui_manager.screen)
+                self.draw_camera_feed(view)
 
         elif self.ui_manager.current_state == "PAUSE":
             if self.game_logic:
                 font, small_font = self.ui_manager.get_fonts()
-                self.game_logic.draw(self.ui_manager.screen, font, small_font)
+                self.game_logic.draw(view, font, small_font)
             self.ui_manager.draw_pause_screen()
-            self.draw_camera_feed(self.ui_manager.screen)
+            self.draw_camera_feed(view)
         elif self.ui_manager.current_state == "GAME_OVER":
             score = self.game_logic.score if self.game_logic else 0
             level = self.game_logic.level if self.game_logic else 1
-            self.ui_manager.draw_game_over_screen(score, level)
-            self.draw_camera_feed(self.ui_manager.screen)
+            high_scores = self.stats_store.top_scores(self.selected_difficulty, self.players, self.endless)
+            self.ui_manager.draw_game_over_screen(score, level, high_scores)
+            self.draw_camera_feed(view)
+
+        if self.show_debug:
+            self.draw_debug_overlay(view)
+
+        if self.video_recorder is not None:
+            self.video_recorder.capture(view.surface)
         
-        pygame.display.flip()
+        self.ui_manager.present()
+        if self.latency is not None:
+            self.latency.stamp(self.current_gesture.get('stamps'))
     
     def cleanup(self):
+        if self.latency is not None:
+            print(self.latency.report())
         if self.game_logic:
             self.game_logic.cleanup()
+        if self.level_watcher is not None:
+            self.level_watcher.stop()
+        self.autosaver.close()
+        self.stats_store.close()
+        if self.video_recorder is not None:
+            self.video_recorder.close()
+            recorder = self.video_recorder
+            print(f"🎥 Saved {recorder.written} video frames to {recorder.path} ({recorder.dropped} dropped)")
+            telemetry.emit("video_recording", path=recorder.path, frames=recorder.written, dropped=recorder.dropped)
+            self.video_recorder = None
+        self.level_cache.shutdown()
+        telemetry.shutdown()
         if hasattr(self, 'camera'):
             self.camera.release()
         cv2.destroyAllWindows()
@@ -241,5 +477,29 @@ class MainGame:
         sys.exit()
 
 if __name__ == "__main__":
-    game = MainGame()
+    parser = argparse.ArgumentParser(description="Gesture Block Breaker")
+    parser.add_argument('--fullscreen', action='store_true', help="scale the game to a fullscreen window")
+    parser.add_argument('--resizable', action='store_true', help="allow resizing the window")
+    parser.add_argument('--render-scale', type=float, default=1.0,
+                        help="draw at this fraction of 1000x700 and scale up to the window, e.g. 0.5 on slow machines")
+    parser.add_argument('--dev', action='store_true', help="reload level files while the game runs")
+    parser.add_argument('--replay-dir', help="record a replay of every game into this directory")
+    parser.add_argument('--continue', dest='continue_saved', action='store_true',
+                        help="resume from the start of the last autosaved level")
+    parser.add_argument('--record', nargs='?', const=time.strftime("session_%Y%m%d_%H%M%S.mp4"),
+                        help="record the game window to a video file")
+    parser.add_argument('--record-fps', type=float, default=30, help="video frames per second")
+    parser.add_argument('--record-scale', type=float, default=0.5, help="video size relative to 1000x700")
+    parser.add_argument('--latency', action='store_true', help="report input latency per frame stage on exit")
+    parser.add_argument('--telemetry-dir', help="record telemetry as rotating JSON-lines files in this directory")
+    args = parser.parse_args()
+    if not 0.25 <= args.render_scale <= 1:
+        parser.error("--render-scale must be between 0.25 and 1")
+
+    if args.telemetry_dir:
+        telemetry.configure(args.telemetry_dir)
+    game = MainGame(fullscreen=args.fullscreen, resizable=args.resizable, render_scale=args.render_scale,
+                    dev=args.dev, replay_dir=args.replay_dir, continue_saved=args.continue_saved,
+                    record_path=args.record, record_fps=args.record_fps, record_scale=args.record_scale,
+                    latency=LatencyTracker() if args.latency else None)
     game.run()
\ No newline at end of file
@@ -1,11 +1,18 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
 
+sys.path.insert(0, SPECPATH)
+from level_pack import compile_pack
+
+# Rebuild the level pack from levels/*.json so every build ships the current levels
+compile_pack(os.path.join(SPECPATH, 'levels'), os.path.join(SPECPATH, 'levels.pack'))
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('assets', 'assets'), ('levels', 'levels'), ('fer2013_mini_XCEPTION.102-0.66.hdf5', '.')],
+    datas=[('assets', 'assets'), ('levels.pack', '.'), ('fer2013_mini_XCEPTION.102-0.66.hdf5', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,89 @@
+import math
+
+import numpy as np
+import pygame
+
+
+class ParticleSystem:
+    """Fixed-capacity particle pool stored in preallocated NumPy arrays.
+
+    Bursts requested during a frame are queued and emitted together in one
+    vectorised step on the next `update`. When the pool is full the oldest
+    particles are overwritten, so the per-frame cost never exceeds
+    `capacity` particles however many blocks break at once.
+    """
+
+    def __init__(self, capacity=2048, gravity=0.12, drag=0.97, seed=None):
+        self.capacity = capacity
+        self.gravity = gravity
+        self.drag = drag
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)      # ticks left; dead at 0
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.float32)
+        self.cursor = 0  # next slot to write; wraps around over the oldest particles
+        self.rng = np.random.default_rng(seed)
+        self.pending = []  # (rect, color, count, speed)
+
+    def burst(self, rect, color, count=24, speed=3.0):
+        """Queue `count` particles spraying out of rect (x, y, width, height)"""
+        if count > 0:
+            self.pending.append((rect, color, count, speed))
+
+    def emit_pending(self):
+        counts = np.array([burst[2] for burst in self.pending])
+        total = int(counts.sum())
+        rects = np.repeat(np.array([burst[0] for burst in self.pending], dtype=np.float32), counts, axis=0)
+        colors = np.repeat(np.array([burst[1] for burst in self.pending], dtype=np.float32), counts, axis=0)
+        speeds = np.repeat(np.array([burst[3] for burst in self.pending], dtype=np.float32), counts)
+        self.pending.clear()
+        if total > self.capacity:
+            # Only the newest particles would survive the wrap-around anyway
+            rects, colors, speeds = rects[-self.capacity:], colors[-self.capacity:], speeds[-self.capacity:]
+            total = self.capacity
+
+        rng = self.rng
+        slots = (self.cursor + np.arange(total)) % self.capacity
+        self.cursor = int((self.cursor + total) % self.capacity)
+        self.pos[slots, 0] = rects[:, 0] + rng.random(total, dtype=np.float32) * rects[:, 2]
+        self.pos[slots, 1] = rects[:, 1] + rng.random(total, dtype=np.float32) * rects[:, 3]
+        angle = rng.random(total, dtype=np.float32) * (2 * math.pi)
+        magnitude = speeds * (0.3 + 0.7 * rng.random(total, dtype=np.float32))
+        self.vel[slots, 0] = np.cos(angle) * magnitude
+        self.vel[slots, 1] = np.sin(angle) * magnitude - 1.0  # Slight upward kick
+        life = 20 + rng.random(total, dtype=np.float32) * 25
+        self.life[slots] = life
+        self.max_life[slots] = life
+        self.color[slots] = colors
+
+    def update(self):
+        if self.pending:
+            self.emit_pending()
+        self.vel *= self.drag
+        self.vel[:, 1] += self.gravity
+        self.pos += self.vel
+        np.maximum(self.life - 1, 0, out=self.life)
+
+    def draw(self, view):
+        live = np.flatnonzero(self.life)
+        if not len(live):
+            return
+        width, height = view.surface.get_size()
+        xy = (self.pos[live] * view.scale).astype(np.int32)
+        dot = view.scale_length(2)
+        inside = (xy[:, 0] >= 0) & (xy[:, 0] <= width - dot) & (xy[:, 1] >= 0) & (xy[:, 1] <= height - dot)
+        xy, live = xy[inside], live[inside]
+        colors = (self.color[live] * (self.life[live] / self.max_life[live])[:, None]).astype(np.uint8)
+
+        # One locked pixel array for every particle; each is a 2x2 (logical) dot blended with max() for a glow.
+        # maximum.at accumulates, so particles sharing a pixel keep the brightest colour, not the last one
+        pixels = pygame.surfarray.pixels3d(view.surface)
+        for dx in range(dot):
+            for dy in range(dot):
+                np.maximum.at(pixels, (xy[:, 0] + dx, xy[:, 1] + dy), colors)
+        del pixels
+
+    def clear(self):
+        self.life[:] = 0
+        self.pending.clear()
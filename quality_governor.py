@@ -0,0 +1,72 @@
+from collections import deque
+
+# Ordered from best-looking to cheapest. Each step trades a little fidelity for frame time.
+QUALITY_LEVELS = [
+    {'name': 'HIGH', 'emotion_interval': 10, 'inference_scale': 1.0, 'inference_every': 1,
+     'trails': True, 'block_labels': True, 'particles': 1.0, 'preview_every': 1},
+    {'name': 'MEDIUM', 'emotion_interval': 30, 'inference_scale': 0.75, 'inference_every': 1,
+     'trails': True, 'block_labels': True, 'particles': 1.0, 'preview_every': 2},
+    {'name': 'LOW', 'emotion_interval': 60, 'inference_scale': 0.5, 'inference_every': 2,
+     'trails': False, 'block_labels': True, 'particles': 0.5, 'preview_every': 3},
+    {'name': 'MINIMAL', 'emotion_interval': 120, 'inference_scale': 0.5, 'inference_every': 3,
+     'trails': False, 'block_labels': False, 'particles': 0.0, 'preview_every': 6},
+]
+
+
+class QualityGovernor:
+    """Steps quality levels up or down to keep frame work inside the FPS budget.
+
+    Frame times are averaged over a rolling window. The level drops when the
+    average overruns the budget and climbs back once there has been clear
+    headroom for `recover_after` frames.
+    """
+
+    def __init__(self, target_fps=60, window=60, overrun=1.1, headroom=0.7, recover_after=180):
+        self.budget = 1.0 / target_fps
+        self.window = window
+        self.overrun = overrun
+        self.headroom = headroom
+        self.recover_after = recover_after
+        self.frame_times = deque(maxlen=window)
+        self.total = 0.0
+        self.level = 0
+        self.frames_since_change = 0
+        self.headroom_frames = 0
+
+    @property
+    def settings(self):
+        return QUALITY_LEVELS[self.level]
+
+    @property
+    def average(self):
+        return self.total / len(self.frame_times) if self.frame_times else 0.0
+
+    def record(self, frame_time):
+        """Add one frame's work time in seconds; returns True if the level changed"""
+        if len(self.frame_times) == self.window:
+            self.total -= self.frame_times[0]
+        self.frame_times.append(frame_time)
+        self.total += frame_time
+        self.frames_since_change += 1
+
+        # Wait for a full window after each change so its effect is measured
+        if self.frames_since_change < self.window:
+            return False
+
+        average = self.average
+        if average > self.budget * self.overrun and self.level < len(QUALITY_LEVELS) - 1:
+            return self.set_level(self.level + 1)
+
+        if average < self.budget * self.headroom:
+            self.headroom_frames += 1
+        else:
+            self.headroom_frames = 0
+        if self.headroom_frames >= self.recover_after and self.level > 0:
+            return self.set_level(self.level - 1)
+        return False
+
+    def set_level(self, level):
+        self.level = max(0, min(len(QUALITY_LEVELS) - 1, level))
+        self.frames_since_change = 0
+        self.headroom_frames = 0
+        return True
@@ -0,0 +1,76 @@
+import pygame
+
+from game_objects import SCREEN_WIDTH, SCREEN_HEIGHT
+
+_fonts = {}  # (path, pixel size) -> Font, shared by every view
+
+
+class RenderView:
+    """A render surface plus the transform from logical coordinates to its pixels.
+
+    Game and menu code always draws in the logical SCREEN_WIDTH x SCREEN_HEIGHT
+    space through a view: positions, sizes, line widths and font sizes are
+    scaled here. With a render scale below 1 the surface is that much smaller,
+    so every fill, blit and shape touches fewer pixels; UIManager.present()
+    stretches it to the window in one blit. At scale 1 calls go straight to
+    pygame unchanged.
+    """
+
+    def __init__(self, surface, scale=1.0):
+        self.surface = surface
+        self.scale = scale
+
+    @staticmethod
+    def render_size(scale):
+        return max(1, round(SCREEN_WIDTH * scale)), max(1, round(SCREEN_HEIGHT * scale))
+
+    def scale_point(self, point):
+        if self.scale == 1:
+            return point
+        return round(point[0] * self.scale), round(point[1] * self.scale)
+
+    def scale_length(self, length):
+        """Radii, widths and offsets; 0 stays 0 so filled shapes stay filled"""
+        if self.scale == 1 or length == 0:
+            return length
+        return max(1, round(length * self.scale))
+
+    def scale_rect(self, rect):
+        if self.scale == 1:
+            return rect
+        rect = pygame.Rect(rect)
+        left, top = self.scale_point(rect.topleft)
+        right, bottom = self.scale_point(rect.bottomright)
+        return pygame.Rect(left, top, max(1, right - left), max(1, bottom - top))
+
+    def font(self, path, size):
+        """Font whose glyphs are `size` logical pixels tall"""
+        size = self.scale_length(size)
+        font = _fonts.get((path, size))
+        if font is None:
+            font = _fonts[(path, size)] = pygame.font.Font(path, size)
+        return font
+
+    def offscreen(self):
+        """A blank surface matching this view's render size, e.g. for overlays and cached layers"""
+        return pygame.Surface(self.surface.get_size()).convert()
+
+    def fill(self, color):
+        self.surface.fill(color)
+
+    def blit(self, source, position, anchor='topleft'):
+        """Blit a surface already at render resolution (text, cached layers) with `anchor` at a logical point"""
+        rect = source.get_rect(**{anchor: self.scale_point(position)})
+        self.surface.blit(source, rect)
+        return rect
+
+    def circle(self, color, center, radius, width=0):
+        pygame.draw.circle(self.surface, color, self.scale_point(center), self.scale_length(radius),
+                           self.scale_length(width))
+
+    def rect(self, color, rect, width=0, border_radius=0):
+        pygame.draw.rect(self.surface, color, self.scale_rect(rect), self.scale_length(width),
+                         border_radius=self.scale_length(border_radius))
+
+    def line(self, color, start, end, width=1):
+        pygame.draw.line(self.surface, color, self.scale_point(start), self.scale_point(end), self.scale_length(width))
@@ -0,0 +1,322 @@
+"""Compact, seekable replays of GameLogic sessions.
+
+A replay stores each tick's gesture input for every player plus periodic
+keyframes of the full game state. Input is delta encoded against the
+previous tick (an unchanged hand costs one byte) and compressed in chunks
+that start at each keyframe, so any chunk can be decoded on its own.
+Seeking restores the nearest keyframe at or before the target tick and
+re-simulates forward; the game's seeded RNG makes that exact.
+
+File layout (little-endian): a header, then records of
+    kind u8, tick u32, length u32, zlib-compressed payload
+
+Usage:
+    python replay.py recording.brr            # watch (space pauses, arrows seek 10 s)
+    python replay.py recording.brr --verify   # re-simulate and check every keyframe
+"""
+import argparse
+import bisect
+import queue
+import struct
+import threading
+import zlib
+
+import snapshot
+from snapshot import GESTURE_STATES, STATE_CODES
+
+MAGIC = b'BRKRPLY\0'
+VERSION = 2  # Version 2 keyframes use snapshot version 2
+HEADER = struct.Struct('<8sHIB12sB')   # magic, version, seed, players, difficulty, endless
+RECORD = struct.Struct('<BII')         # kind, tick, payload length
+KEYFRAME, INPUTS, RESET_KEYFRAME = 1, 2, 3  # Reset keyframes mark state changed outside update()
+
+KEYFRAME_INTERVAL = 600  # ticks (10 s)
+POSITION_SCALE = 10000   # hand positions are stored in 1/10000ths of the camera frame
+
+
+def zigzag(value):
+    return (value << 1) ^ (value >> 63)
+
+
+def write_varint(buffer, value):
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class InputEncoder:
+    """Delta-encodes per-tick gestures; starts afresh with every chunk"""
+
+    def __init__(self, players):
+        self.players = players
+        self.start()
+
+    def start(self):
+        self.buffer = bytearray()
+        self.previous = [(0, 0, 0)] * self.players
+
+    def encode(self, gestures):
+        """Append one tick and return the gestures as they will be replayed"""
+        replayed = []
+        for player, gesture in enumerate(gestures[:self.players]):
+            x = round(gesture.get('hand_x', 0.5) * POSITION_SCALE)
+            y = round(gesture.get('hand_y', 0.5) * POSITION_SCALE)
+            state = STATE_CODES.get(gesture.get('hand_state', 'none'), 0)
+            detected = bool(gesture.get('detected'))
+            pinch = bool(gesture.get('pinch'))
+            px, py, pstate = self.previous[player]
+            flags = (state != pstate) | (x != px) << 1 | (y != py) << 2 | detected << 3 | pinch << 4
+            self.buffer.append(flags)
+            if state != pstate:
+                self.buffer.append(state)
+            if x != px:
+                write_varint(self.buffer, zigzag(x - px))
+            if y != py:
+                write_varint(self.buffer, zigzag(y - py))
+            self.previous[player] = (x, y, state)
+            replayed.append(gesture_dict(x, y, state, detected, pinch))
+        return replayed
+
+
+def gesture_dict(x, y, state, detected, pinch):
+    return {'hand_x': x / POSITION_SCALE, 'hand_y': y / POSITION_SCALE, 'hand_state': GESTURE_STATES[state],
+            'detected': detected, 'pinch': pinch}
+
+
+def decode_inputs(data, players):
+    """Inverse of InputEncoder: a list of per-tick gesture lists"""
+    ticks = []
+    previous = [(0, 0, 0)] * players
+    offset = 0
+    while offset < len(data):
+        gestures = []
+        for player in range(players):
+            flags = data[offset]
+            offset += 1
+            x, y, state = previous[player]
+            if flags & 1:
+                state = data[offset]
+                offset += 1
+            if flags & 2:
+                delta, offset = read_varint(data, offset)
+                x += (delta >> 1) ^ -(delta & 1)
+            if flags & 4:
+                delta, offset = read_varint(data, offset)
+                y += (delta >> 1) ^ -(delta & 1)
+            previous[player] = (x, y, state)
+            gestures.append(gesture_dict(x, y, state, bool(flags & 8), bool(flags & 16)))
+        ticks.append(gestures)
+    return ticks
+
+
+class ReplayRecorder:
+    """Records a GameLogic session; compression and disk writes happen on a worker thread.
+
+    Attach it as `game.recorder`; GameLogic calls `record` at the start of
+    every update and `request_keyframe` after changing state outside it.
+    """
+
+    def __init__(self, path, game, keyframe_interval=KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.encoder = InputEncoder(game.players)
+        self.chunk_tick = None
+        self.reset_pending = False
+        self.stopped = False
+        self.queue = queue.Queue()
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, game.seed, game.players, game.difficulty.encode('ascii'),
+                                    game.endless_levels is not None))
+        self.thread = threading.Thread(target=self.write_records, name="replay-writer", daemon=True)
+        self.thread.start()
+
+    def record(self, game, gestures):
+        if self.stopped or game.scrolling_level is not None:
+            if not self.stopped:
+                print("⚠️ Scrolling levels cannot be keyframed; replay recording stopped")
+                self.stopped = True
+            return gestures
+        tick = game.timers.tick
+        if self.chunk_tick is None or self.reset_pending or tick - self.chunk_tick >= self.keyframe_interval:
+            self.flush()
+            self.queue.put((RESET_KEYFRAME if self.reset_pending else KEYFRAME, tick, snapshot.capture(game)))
+            self.chunk_tick = tick
+            self.reset_pending = False
+        return self.encoder.encode(gestures)
+
+    def request_keyframe(self):
+        self.reset_pending = True
+
+    def flush(self):
+        if self.encoder.buffer:
+            self.queue.put((INPUTS, self.chunk_tick, bytes(self.encoder.buffer)))
+        self.encoder.start()
+
+    def write_records(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            kind, tick, payload = item
+            payload = zlib.compress(payload, 6)
+            self.file.write(RECORD.pack(kind, tick, len(payload)))
+            self.file.write(payload)
+        self.file.close()
+
+    def close(self):
+        self.flush()
+        self.queue.put(None)
+        self.thread.join()
+
+
+class Replay:
+    """Reads a replay and drives a GameLogic through it"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, self.seed, self.players, difficulty, endless = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay")
+        self.difficulty = difficulty.rstrip(b'\0').decode('ascii')
+        self.endless = bool(endless)
+        self.keyframes = {}     # tick -> (kind, compressed state)
+        self.chunks = []        # (start tick, compressed input)
+        offset = HEADER.size
+        while offset + RECORD.size <= len(data):
+            kind, tick, length = RECORD.unpack_from(data, offset)
+            offset += RECORD.size
+            payload = data[offset:offset + length]
+            offset += length
+            if kind == INPUTS:
+                self.chunks.append((tick, payload))
+            else:
+                self.keyframes[tick] = (kind, payload)
+        self.chunks.sort(key=lambda chunk: chunk[0])
+        self.chunk_starts = [tick for tick, _ in self.chunks]
+        self.keyframe_ticks = sorted(self.keyframes)
+        self.decoded = (None, None)  # (chunk start, ticks) of the last decoded chunk
+        self.start_tick = self.keyframe_ticks[0] if self.keyframe_ticks else 0
+        self.end_tick = self.start_tick
+        if self.chunks:
+            self.end_tick = self.chunks[-1][0] + len(self.chunk_inputs(len(self.chunks) - 1))
+
+    def create_game(self, level_cache=None):
+        from autoplay import NullCamera
+        from game_logic import GameLogic
+        game = GameLogic(None, shared_camera=NullCamera(), difficulty=self.difficulty, players=self.players,
+                         level_cache=level_cache, endless=self.endless, seed=self.seed)
+        self.seek(game, self.start_tick)
+        return game
+
+    def chunk_inputs(self, index):
+        start, payload = self.chunks[index]
+        if self.decoded[0] != start:
+            self.decoded = (start, decode_inputs(zlib.decompress(payload), self.players))
+        return self.decoded[1]
+
+    def inputs(self, tick):
+        """Gestures for `tick`, or None past the end of the recording"""
+        index = bisect.bisect_right(self.chunk_starts, tick) - 1
+        if index < 0:
+            return None
+        ticks = self.chunk_inputs(index)
+        offset = tick - self.chunks[index][0]
+        return ticks[offset] if offset < len(ticks) else None
+
+    def keyframe_state(self, tick):
+        return zlib.decompress(self.keyframes[tick][1])
+
+    def seek(self, game, tick):
+        """Restore the nearest keyframe at or before `tick`, then simulate up to it"""
+        tick = max(self.start_tick, min(tick, self.end_tick))
+        keyframe = self.keyframe_ticks[bisect.bisect_right(self.keyframe_ticks, tick) - 1]
+        snapshot.restore(game, self.keyframe_state(keyframe))
+        while game.timers.tick < tick:
+            self.step(game, sync=False)
+
+    def step(self, game, sync=True):
+        """Play one tick; returns GameLogic.update()'s result, or None at the end"""
+        tick = game.timers.tick
+        if sync and self.keyframes.get(tick, (None,))[0] == RESET_KEYFRAME:
+            snapshot.restore(game, self.keyframe_state(tick))
+        gestures = self.inputs(tick)
+        if gestures is None:
+            return None
+        game.current_gesture = gestures[0]
+        game.current_gestures = gestures
+        return game.update()
+
+    def verify(self, game):
+        """Re-simulate the whole replay; returns the ticks of keyframes that did not match"""
+        self.seek(game, self.start_tick)
+        mismatches = []
+        while True:
+            tick = game.timers.tick
+            kind = self.keyframes.get(tick, (None,))[0]
+            if kind == KEYFRAME and tick != self.start_tick and snapshot.capture(game) != self.keyframe_state(tick):
+                mismatches.append(tick)
+                snapshot.restore(game, self.keyframe_state(tick))
+            if self.step(game) is None:
+                return mismatches
+
+
+def watch(replay):
+    import pygame
+    from render_view import RenderView
+    pygame.init()
+    screen = pygame.display.set_mode((1000, 700))
+    view = RenderView(screen)
+    pygame.display.set_caption("Replay")
+    font = pygame.font.Font(None, 36)
+    small_font = pygame.font.Font(None, 24)
+    clock = pygame.time.Clock()
+    game = replay.create_game()
+    paused = False
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                return
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                    step = 600 if event.key == pygame.K_RIGHT else -600
+                    replay.seek(game, game.timers.tick + step)
+        if not paused and replay.step(game) is None:
+            paused = True
+        game.draw(view, font, small_font)
+        seconds = (game.timers.tick - replay.start_tick) / 60
+        total = (replay.end_tick - replay.start_tick) / 60
+        screen.blit(small_font.render(f"{seconds:6.1f} / {total:.1f} s", True, (255, 255, 255)), (850, 670))
+        pygame.display.flip()
+        clock.tick(60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play back or verify a replay")
+    parser.add_argument('path')
+    parser.add_argument('--verify', action='store_true', help="re-simulate and compare every keyframe")
+    args = parser.parse_args()
+
+    replay = Replay(args.path)
+    if args.verify:
+        import os
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        mismatches = replay.verify(replay.create_game())
+        ticks = replay.end_tick - replay.start_tick
+        print(f"{'✅' if not mismatches else '❌'} {ticks} ticks, {len(replay.keyframes)} keyframes, "
+              f"{len(mismatches)} mismatched" + (f" (first at tick {mismatches[0]})" if mismatches else ""))
+    else:
+        watch(replay)
@@ -0,0 +1,98 @@
+import numpy as np
+
+from block_store import BLOCK_TYPES, BLOCK_HEIGHT
+from game_objects import Block, SCREEN_HEIGHT
+
+CHUNK_HEIGHT = 80                   # Two rows of blocks per chunk
+START_BOTTOM = SCREEN_HEIGHT - 200  # Screen y of the bottom of the level when it starts
+EVICT_Y = SCREEN_HEIGHT - 60        # Chunks whose bottom scrolls past this line are dropped
+LOAD_MARGIN = CHUNK_HEIGHT          # Chunks are loaded this far above the top of the screen
+
+
+class LevelChunks:
+    """Splits a tall level layout into horizontal bands, numbered from the bottom up.
+
+    Block y positions are measured from the top of the level. Records are
+    only turned into (x, y, type, max_hits) tuples when their chunk is
+    requested, so a tall level costs one compact record array up front and
+    its blocks are built as they scroll into view.
+    """
+
+    def __init__(self, blocks, chunk_height=CHUNK_HEIGHT):
+        self.blocks = blocks
+        self.chunk_height = chunk_height
+        ys = blocks['y'] if hasattr(blocks, 'dtype') else np.array([b[1] for b in blocks], dtype=np.float32)
+        self.height = float(ys.max()) + BLOCK_HEIGHT if len(ys) else 0.0
+        chunk_ids = ((self.height - BLOCK_HEIGHT - ys) // chunk_height).astype(np.int64)
+        self.order = np.argsort(chunk_ids, kind='stable')
+        self.count = int(chunk_ids.max()) + 1 if len(ys) else 0
+        self.bounds = np.searchsorted(chunk_ids[self.order], np.arange(self.count + 1))
+
+    def __len__(self):
+        return self.count
+
+    def next_filled(self, i):
+        """Index of the first chunk from `i` on that has blocks, or len(self) if none is left"""
+        filled = np.flatnonzero(np.diff(self.bounds[i:]))
+        return i + int(filled[0]) if len(filled) else self.count
+
+    def chunk(self, i):
+        """(x, y, type, max_hits) records of one band, in level coordinates"""
+        rows = self.order[self.bounds[i]:self.bounds[i + 1]]
+        if hasattr(self.blocks, 'dtype'):
+            return [(float(r['x']), float(r['y']), BLOCK_TYPES[r['type']], int(r['max_hits']))
+                    for r in self.blocks[rows]]
+        return [self.blocks[j] for j in rows]
+
+
+class ScrollingLevel:
+    """Streams a tall level through the block store as the view scrolls up.
+
+    Scrolling moves every block at once through the store's `y_offset`.
+    Chunks are added just before they scroll into view and released once
+    they pass the paddle, so only a screen's worth of blocks is ever live.
+    When every live block is gone the level jumps to its next chunk.
+    `blocks` is the game's block list and is only rebuilt when a chunk
+    enters or leaves.
+    """
+
+    def __init__(self, chunks, store, blocks, scroll_speed=0.15):
+        self.chunks = chunks
+        self.store = store
+        self.blocks = blocks
+        self.scroll_speed = scroll_speed
+        self.shift = START_BOTTOM - chunks.height  # Level y -> screen y before any scrolling
+        self.loaded = {}  # chunk index -> Block handles
+        self.next_chunk = 0
+        self.stream()
+
+    def chunk_bottom(self, i):
+        return START_BOTTOM - i * self.chunks.chunk_height + self.store.y_offset
+
+    def update(self, scrolling=True):
+        if scrolling:
+            self.store.y_offset += self.scroll_speed
+        if self.store.all_destroyed():
+            # Nothing left to hit: skip ahead until the next chunk with blocks is well on screen
+            target = self.chunks.next_filled(self.next_chunk)
+            if target < len(self.chunks):
+                self.store.y_offset += max(0.0, 2 * self.chunks.chunk_height - self.chunk_bottom(target))
+        self.stream()
+
+    def stream(self):
+        changed = False
+        while self.next_chunk < len(self.chunks) and self.chunk_bottom(self.next_chunk) > -LOAD_MARGIN:
+            self.loaded[self.next_chunk] = [
+                Block.handle(self.store, self.store.add(x, y + self.shift, block_type, max_hits))
+                for x, y, block_type, max_hits in self.chunks.chunk(self.next_chunk)]
+            self.next_chunk += 1
+            changed = True
+        for i in [i for i in self.loaded if self.chunk_bottom(i) > EVICT_Y]:
+            for block in self.loaded.pop(i):
+                self.store.release(block.index)
+            changed = True
+        if changed:
+            self.blocks[:] = [block for chunk in self.loaded.values() for block in chunk]
+
+    def finished(self):
+        return self.next_chunk == len(self.chunks) and self.store.all_destroyed()
@@ -0,0 +1,207 @@
+"""Binary snapshots of GameLogic state.
+
+`capture` packs the balls, blocks, paddles (power-ups and cooldowns),
+score, level, aim mode, power shots, timers and RNG into one blob in a
+fraction of a millisecond; `restore` puts a game back into exactly that
+state. Replay keyframes, level-start autosaves and "retry level" all use
+the same format.
+"""
+import os
+import queue
+import struct
+import threading
+from array import array
+
+from block_store import BlockStore
+from game_objects import Block
+from gesture_classifier import HAND_STATES
+
+MAGIC = b'BRKSNAP\0'
+VERSION = 3
+HEADER = struct.Struct('<8sHIB12sBQ')  # magic, version, seed, players, difficulty, endless, run id
+
+GESTURE_STATES = ('none',) + HAND_STATES
+STATE_CODES = {state: i for i, state in enumerate(GESTURE_STATES)}
+
+STATE = struct.Struct('<IHiBBB4d')     # tick, level, score, power shots, aim mode, aim player, aim and smoothed aim
+COUNTS = struct.Struct('<BBIIH')       # paddles, balls, block rows, free rows, level name length
+PADDLE = struct.Struct('<2d6I')        # x, target x, width, speed, fist/peace cooldowns, big_paddle/speed_up ticks left
+BALL = struct.Struct('<4dB2I')         # x, y, vel x, vel y, power shot, blast radius, power shot ticks left
+RNG = struct.Struct('<Bd')             # has gauss_next, gauss_next
+POWER_UPS = ('big_paddle', 'speed_up')
+BLOCK_COLUMNS = ('x', 'y', 'type', 'hits', 'max_hits', 'alive')
+
+
+def capture(game):
+    """Serialise everything GameLogic.update() depends on"""
+    if game.scrolling_level is not None:
+        raise ValueError("scrolling levels cannot be captured")
+    store = game.block_store
+    timers = game.timers
+    name = (game.current_level_name or '').encode('utf-8')
+    parts = [
+        STATE.pack(timers.tick, game.level, game.score, game.power_shots_remaining, game.aim_mode,
+                   game.aim_player, *game.aim_vector, *game.smooth_aim_vector),
+        COUNTS.pack(len(game.paddles), len(game.balls), len(store.alive), len(store.free), len(name)),
+    ]
+    for paddle in game.paddles:
+        parts.append(PADDLE.pack(paddle.x, paddle.target_x, paddle.width, paddle.speed,
+                                 paddle.fist_action_cooldown, paddle.peace_cooldown,
+                                 *(timers.remaining(paddle.power_ups.get(p)) for p in POWER_UPS)))
+    for ball in game.balls:
+        parts.append(BALL.pack(ball.x, ball.y, ball.vel_x, ball.vel_y, ball.power_shot,
+                               ball.destruction_radius, ball.power_shot_timer))
+    parts.append(bytes(STATE_CODES.get(state, 0) for state in game.last_gesture_states))
+    parts.append(name)
+    _, internal, gauss = game.rng.getstate()
+    parts.append(array('I', internal).tobytes())
+    parts.append(RNG.pack(gauss is not None, gauss or 0.0))
+    for column in BLOCK_COLUMNS:
+        parts.append(getattr(store, column).tobytes())
+    parts.append(array('I', store.free).tobytes())
+    return b''.join(parts)
+
+
+def restore(game, data, keep_tick=False):
+    """Put `game` back into a state captured by `capture`.
+
+    With `keep_tick` the timer clock keeps running from its current tick
+    (timers are restored relative to it), so replays stay monotonic.
+    Raises ValueError, leaving the game untouched, for a snapshot of a game
+    with other settings.
+    """
+    tick, level, score, power_shots, aim_mode, aim_player, ax, ay, sx, sy = STATE.unpack_from(data, 0)
+    offset = STATE.size
+    paddles, balls, rows, free, name_length = COUNTS.unpack_from(data, offset)
+    offset += COUNTS.size
+    if paddles != len(game.paddles):
+        raise ValueError(f"snapshot has {paddles} paddles, this game has {len(game.paddles)}")
+    if balls > game.ball_pool.max_live:
+        raise ValueError(f"snapshot has {balls} balls, this game allows {game.ball_pool.max_live}")
+
+    # Timers are rebuilt by the objects that own them, on an empty wheel at the saved tick
+    game.clear_balls()
+    game.timers.clear()
+    if not keep_tick:
+        game.timers.tick = tick
+    game.events.clear()
+    game.particles.clear()
+    game.level, game.score, game.power_shots_remaining = level, score, power_shots
+    game.aim_mode, game.aim_player = bool(aim_mode), aim_player
+    game.aim_vector, game.smooth_aim_vector = (ax, ay), (sx, sy)
+    game.trajectory_points = []
+
+    for paddle in game.paddles:
+        x, target_x, width, speed, fist, peace, *power_ups = PADDLE.unpack_from(data, offset)
+        offset += PADDLE.size
+        paddle.power_ups = {}
+        paddle.x, paddle.target_x, paddle.width, paddle.speed = x, target_x, width, speed
+        paddle.fist_timer = paddle.peace_timer = None
+        paddle.fist_action_cooldown = fist
+        paddle.peace_cooldown = peace
+        for power_type, ticks in zip(POWER_UPS, power_ups):
+            if ticks:
+                paddle.schedule_power_up_expiry(power_type, ticks)
+
+    for _ in range(balls):
+        x, y, vel_x, vel_y, power_shot, radius, ticks = BALL.unpack_from(data, offset)
+        offset += BALL.size
+        ball = game.ball_pool.acquire(x, y, vel_x, vel_y)
+        ball.vel_x, ball.vel_y = vel_x, vel_y  # acquire() replaces zero velocities
+        if power_shot:
+            ball.start_power_shot(ticks, radius)
+        game.balls.append(ball)
+
+    game.last_gesture_states = [GESTURE_STATES[code] for code in data[offset:offset + len(game.paddles)]]
+    offset += len(game.paddles)
+    game.current_level_name = bytes(data[offset:offset + name_length]).decode('utf-8')
+    offset += name_length
+    internal = array('I')
+    internal.frombytes(data[offset:offset + 625 * internal.itemsize])
+    offset += 625 * internal.itemsize
+    has_gauss, gauss = RNG.unpack_from(data, offset)
+    offset += RNG.size
+    game.rng.setstate((3, tuple(internal), gauss if has_gauss else None))
+
+    store = BlockStore(game.events)
+    for column in BLOCK_COLUMNS:
+        values = getattr(store, column)
+        size = rows * values.itemsize
+        values.frombytes(data[offset:offset + size])
+        offset += size
+    free_rows = array('I')
+    free_rows.frombytes(data[offset:offset + free * free_rows.itemsize])
+    store.free = list(free_rows)
+    store.alive_count = sum(store.alive)
+    released = set(store.free)
+    game.block_store = store
+    game.scrolling_level = None
+    game.blocks = [Block.handle(store, i) for i in range(rows) if i not in released]
+
+
+def game_settings(game):
+    return {'seed': game.seed, 'players': game.players, 'difficulty': game.difficulty,
+            'endless': game.endless_levels is not None, 'run': game.run_id}
+
+
+def pack_file(game, data):
+    """A snapshot with the settings needed to recreate its game, as written to disk"""
+    settings = game_settings(game)
+    return HEADER.pack(MAGIC, VERSION, settings['seed'], settings['players'],
+                       settings['difficulty'].encode('ascii'), settings['endless'], settings['run']) + data
+
+
+def load(path):
+    """Read a snapshot file; returns (GameLogic settings, snapshot data)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} is not a version {VERSION} snapshot")
+    magic, version, seed, players, difficulty, endless, run = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} snapshot")
+    settings = {'seed': seed, 'players': players, 'difficulty': difficulty.rstrip(b'\0').decode('ascii'),
+                'endless': bool(endless), 'run': run}
+    return settings, data[HEADER.size:]
+
+
+class Autosaver:
+    """Writes snapshots to disk on a background thread.
+
+    Only the newest pending snapshot is written; each write goes to a
+    temporary file that then replaces the old save, so a crash mid-write
+    never leaves a broken autosave behind.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.write_snapshots, name="autosave", daemon=True)
+        self.thread.start()
+
+    def save(self, game, data):
+        self.queue.put(pack_file(game, data))
+
+    def write_snapshots(self):
+        closing = False
+        while not closing:
+            blob = self.queue.get()
+            # Skip to the newest snapshot if several queued up
+            while not self.queue.empty():
+                newer = self.queue.get()
+                if newer is None:
+                    closing = True
+                else:
+                    blob = newer
+            if blob is None:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path + '.tmp', 'wb') as f:
+                f.write(blob)
+            os.replace(self.path + '.tmp', self.path)
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
@@ -0,0 +1,140 @@
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY, played_at REAL, difficulty TEXT, score INTEGER, level INTEGER,
+    players INTEGER, endless INTEGER, run INTEGER);
+CREATE TABLE IF NOT EXISTS level_clears (
+    id INTEGER PRIMARY KEY, cleared_at REAL, difficulty TEXT, level INTEGER, seconds REAL);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY, started_at REAL, ended_at REAL, difficulty TEXT, players INTEGER,
+    endless INTEGER, score INTEGER, level INTEGER, levels_cleared INTEGER, power_shots_used INTEGER,
+    gestures_recognized INTEGER, balls_lost INTEGER, blocks_destroyed INTEGER, run INTEGER);
+"""
+# Created once the run columns exist, which databases from older versions first need adding
+INDEXES = """
+DROP INDEX IF EXISTS scores_by_difficulty;
+CREATE INDEX IF NOT EXISTS scores_by_mode ON scores (difficulty, players, endless, score DESC);
+CREATE UNIQUE INDEX IF NOT EXISTS scores_by_run ON scores (run);
+"""
+
+# One row per run: a run recorded again (e.g. quit, then continued from the autosave) keeps its best score
+UPSERT_SCORE = ("INSERT INTO scores (played_at, difficulty, score, level, players, endless, run) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (run) DO UPDATE SET played_at = excluded.played_at, "
+                "score = excluded.score, level = excluded.level WHERE excluded.score > scores.score")
+INSERT_CLEAR = "INSERT INTO level_clears (cleared_at, difficulty, level, seconds) VALUES (?, ?, ?, ?)"
+INSERT_SESSION = ("INSERT INTO sessions (started_at, ended_at, difficulty, players, endless, score, level, "
+                  "levels_cleared, power_shots_used, gestures_recognized, balls_lost, blocks_destroyed, run) "
+                  "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+
+class StatsStore:
+    """Local SQLite store for high scores, level clear times and session stats.
+
+    The game thread only queues rows; a writer thread owns the connection
+    and inserts whatever has queued up in one transaction per batch. High
+    scores are read once at startup and then kept up to date in memory, so
+    drawing the leaderboard never touches the disk.
+
+    Leaderboards are kept per difficulty, player count and endless mode. A
+    run is one game from level 1 to game over, identified by GameLogic's
+    run id; a run that is continued from its autosave is still one run, so
+    it keeps a single score row however often it is recorded.
+    """
+
+    def __init__(self, path="stats.db", leaderboard_size=5, batch_size=256):
+        self.path = path
+        self.leaderboard_size = leaderboard_size
+        self.batch_size = batch_size
+        # (difficulty, players, endless) -> ((score, level, run), ...) best first
+        self.leaderboards = self.load_leaderboards()
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.write_rows, name="stats-writer", daemon=True)
+        self.thread.start()
+
+    def connect(self):
+        connection = sqlite3.connect(self.path)
+        # WAL lets readers (e.g. an external stats viewer) work while the game writes
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        for table in ('scores', 'sessions'):
+            columns = [row[1] for row in connection.execute(f"PRAGMA table_info({table})")]
+            if 'run' not in columns:
+                connection.execute(f"ALTER TABLE {table} ADD COLUMN run INTEGER")
+        connection.executescript(INDEXES)
+        return connection
+
+    def load_leaderboards(self):
+        connection = self.connect()
+        try:
+            rows = connection.execute(
+                "SELECT difficulty, players, endless, score, level, run FROM ("
+                " SELECT difficulty, players, endless, score, level, run, ROW_NUMBER() OVER"
+                " (PARTITION BY difficulty, players, endless ORDER BY score DESC, id) AS rank FROM scores)"
+                " WHERE rank <= ? ORDER BY difficulty, players, endless, rank", (self.leaderboard_size,)).fetchall()
+        finally:
+            connection.close()
+        leaderboards = {}
+        for difficulty, players, endless, score, level, run in rows:
+            key = (difficulty, players, bool(endless))
+            leaderboards[key] = leaderboards.get(key, ()) + ((score, level, run),)
+        return leaderboards
+
+    def top_scores(self, difficulty, players=1, endless=False):
+        """((score, level), ...) best first for one game mode"""
+        return tuple((score, level) for score, level, _ in self.leaderboards.get((difficulty, players, endless), ()))
+
+    def record_score(self, difficulty, score, level, players=1, endless=False, run=None):
+        self.queue.put((UPSERT_SCORE, (time.time(), difficulty, score, level, players, int(endless), run)))
+        key = (difficulty, players, bool(endless))
+        entries = self.leaderboards.get(key, ())
+        if run is not None:
+            if any(entry[2] == run and entry[0] >= score for entry in entries):
+                return  # The run already has a better score on the board
+            entries = tuple(entry for entry in entries if entry[2] != run)
+        # Stable sort keeps earlier scores ahead of equal later ones, like the SQL ordering
+        entries += ((score, level, run),)
+        self.leaderboards[key] = tuple(sorted(entries, key=lambda entry: -entry[0])[:self.leaderboard_size])
+
+    def record_level_clear(self, difficulty, level, seconds):
+        self.queue.put((INSERT_CLEAR, (time.time(), difficulty, level, seconds)))
+
+    def record_session(self, started_at, difficulty, players, endless, score, level, stats, run=None):
+        """One row per play session; a continued run gets a row for each session it was played in"""
+        self.queue.put((INSERT_SESSION, (started_at, time.time(), difficulty, players, int(endless), score, level,
+                                         stats['levels_cleared'], stats['power_shots_used'],
+                                         stats['gestures_recognized'], stats['balls_lost'],
+                                         stats['blocks_destroyed'], run)))
+
+    def write_rows(self):
+        connection = self.connect()
+        closing = False
+        while not closing:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                closing = True
+                batch = [item for item in batch if item is not None]
+
+            rows_by_statement = {}
+            for statement, row in batch:
+                rows_by_statement.setdefault(statement, []).append(row)
+            try:
+                with connection:
+                    for statement, rows in rows_by_statement.items():
+                        connection.executemany(statement, rows)
+            except sqlite3.Error as e:
+                print(f"❌ Error saving stats: {e}")
+        connection.close()
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
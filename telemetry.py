@@ -0,0 +1,148 @@
+"""Structured telemetry written as size-rotated JSON-lines files.
+
+Used like the logging module: configure once at startup, then emit from
+anywhere. Until `configure` is called every call is a no-op, so tools that
+run GameLogic headless pay nothing.
+
+    import telemetry
+    telemetry.configure("telemetry")
+    telemetry.emit("level_load", difficulty="HARD", level=3, blocks=48)
+
+Each line is {"t": unix time, "event": name, ...fields}. The game thread
+only appends to a bounded buffer; when the writer falls behind, events are
+dropped (and later reported as a "telemetry_dropped" event) rather than
+blocking a frame.
+"""
+import bisect
+import collections
+import json
+import os
+import threading
+import time
+import traceback
+
+_sink = None
+
+
+class TelemetrySink:
+    """Buffers events and writes them to <directory>/telemetry.jsonl on a background thread"""
+
+    def __init__(self, directory, max_bytes=5 * 1024 * 1024, backups=5, capacity=10000, flush_interval=0.5):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "telemetry.jsonl")
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        # deque append/popleft are atomic, so producers never take a lock
+        self.buffer = collections.deque()
+        self.dropped = 0
+        self.reported_dropped = 0
+        self.stopping = threading.Event()
+        self.file = open(self.path, 'a', encoding='utf-8')
+        self.thread = threading.Thread(target=self.write_events, name="telemetry-writer", daemon=True)
+        self.thread.start()
+
+    def emit(self, event, fields):
+        if len(self.buffer) >= self.capacity:
+            self.dropped += 1
+            return
+        self.buffer.append((time.time(), event, fields))
+
+    def write_events(self):
+        while not self.stopping.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+        self.file.close()
+
+    def flush(self):
+        dropped = self.dropped - self.reported_dropped
+        if dropped:
+            self.reported_dropped += dropped
+            self.write_line({'t': time.time(), 'event': 'telemetry_dropped', 'count': dropped})
+        while self.buffer:
+            timestamp, event, fields = self.buffer.popleft()
+            self.write_line({'t': timestamp, 'event': event, **fields})
+        self.file.flush()
+
+    def write_line(self, record):
+        # default=str covers NumPy scalars and other values that are not JSON types
+        self.file.write(json.dumps(record, default=str) + "\n")
+        if self.file.tell() >= self.max_bytes:
+            self.rotate()
+
+    def rotate(self):
+        """telemetry.jsonl -> telemetry.1.jsonl -> ... -> telemetry.<backups>.jsonl, like RotatingFileHandler"""
+        self.file.close()
+        base, extension = os.path.splitext(self.path)
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{base}.{index}{extension}"
+            if os.path.exists(source):
+                os.replace(source, f"{base}.{index + 1}{extension}")
+        if self.backups > 0:
+            os.replace(self.path, f"{base}.1{extension}")
+        self.file = open(self.path, 'w', encoding='utf-8')  # With no backups the file just starts over
+
+    def close(self):
+        self.stopping.set()
+        self.thread.join()
+
+
+class FrameTimeHistogram:
+    """Counts frame times into fixed millisecond buckets and emits them every `interval` frames"""
+
+    EDGES_MS = (4, 8, 12, 16.7, 20, 25, 33.3, 50, 100)
+
+    def __init__(self, interval=600):
+        self.interval = interval
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.EDGES_MS) + 1)
+        self.frames = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+    def record(self, frame_time):
+        ms = frame_time * 1000
+        self.counts[bisect.bisect_right(self.EDGES_MS, ms)] += 1
+        self.frames += 1
+        self.total += ms
+        self.worst = max(self.worst, ms)
+        if self.frames >= self.interval:
+            labels = [f"<{edge}" for edge in self.EDGES_MS] + [f">={self.EDGES_MS[-1]}"]
+            emit("frame_times", frames=self.frames, mean_ms=round(self.total / self.frames, 3),
+                 max_ms=round(self.worst, 3), buckets_ms=dict(zip(labels, self.counts)))
+            self.reset()
+
+
+def configure(directory="telemetry", **options):
+    """Start writing telemetry to `directory`; options are passed to TelemetrySink"""
+    global _sink
+    shutdown()
+    _sink = TelemetrySink(directory, **options)
+    return _sink
+
+
+def enabled():
+    return _sink is not None
+
+
+def emit(event, **fields):
+    sink = _sink
+    if sink is not None:
+        sink.emit(event, fields)
+
+
+def exception(event, **fields):
+    """Emit an event carrying the exception currently being handled"""
+    if _sink is not None:
+        emit(event, traceback=traceback.format_exc(), **fields)
+
+
+def shutdown():
+    """Write out everything buffered and stop the writer"""
+    global _sink
+    sink, _sink = _sink, None
+    if sink is not None:
+        sink.close()
@@ -0,0 +1,106 @@
+import random
+
+import pygame
+import pytest
+
+from autoplay import AutoplayAgent, NullCamera, close_game
+from game_logic import GameLogic
+from replay import (POSITION_SCALE, InputEncoder, Replay, ReplayRecorder, decode_inputs, read_varint,
+                    write_varint, zigzag)
+from snapshot import GESTURE_STATES
+
+
+def unzigzag(value):
+    return (value >> 1) ^ -(value & 1)
+
+
+def test_zigzag_interleaves_signs():
+    assert [zigzag(v) for v in (0, -1, 1, -2, 2, -64, 63)] == [0, 1, 2, 3, 4, 127, 126]
+    for value in (0, 1, -1, 5000, -5000, 2 ** 40, -2 ** 40):
+        assert unzigzag(zigzag(value)) == value
+
+
+@pytest.mark.parametrize('value, size', [(0, 1), (127, 1), (128, 2), (16383, 2), (16384, 3), (2 ** 35, 6)])
+def test_varint_round_trip(value, size):
+    buffer = bytearray()
+    write_varint(buffer, value)
+    assert len(buffer) == size
+    assert read_varint(buffer, 0) == (value, size)
+
+
+def test_varints_read_back_to_back():
+    values = [0, 1, 300, 127, 128, 2 ** 20, zigzag(-9999)]
+    buffer = bytearray()
+    for value in values:
+        write_varint(buffer, value)
+    offset, decoded = 0, []
+    while offset < len(buffer):
+        value, offset = read_varint(buffer, offset)
+        decoded.append(value)
+    assert decoded == values
+
+
+def random_gestures(rng, players, ticks):
+    """Gesture streams with jumps both ways, held positions and every flag combination"""
+    stream = []
+    previous = [{'hand_x': 0.5, 'hand_y': 0.5, 'hand_state': 'none', 'detected': False, 'pinch': False}] * players
+    for _ in range(ticks):
+        gestures = []
+        for gesture in previous:
+            if rng.random() < 0.7:
+                gesture = {'hand_x': rng.random(), 'hand_y': rng.random(), 'hand_state': rng.choice(GESTURE_STATES),
+                           'detected': rng.random() < 0.8, 'pinch': rng.random() < 0.3}
+            gestures.append(gesture)
+        stream.append(gestures)
+        previous = gestures
+    return stream
+
+
+@pytest.mark.parametrize('players', [1, 2])
+def test_encoder_and_decoder_agree(players):
+    rng = random.Random(players)
+    encoder = InputEncoder(players)
+    stream = random_gestures(rng, players, 2000)
+    replayed = [encoder.encode(gestures) for gestures in stream]
+
+    assert decode_inputs(bytes(encoder.buffer), players) == replayed
+    for gestures, played in zip(stream, replayed):
+        for gesture, replayed_gesture in zip(gestures, played):
+            assert abs(replayed_gesture['hand_x'] - gesture['hand_x']) <= 0.5 / POSITION_SCALE
+            assert abs(replayed_gesture['hand_y'] - gesture['hand_y']) <= 0.5 / POSITION_SCALE
+            assert (replayed_gesture['hand_state'], replayed_gesture['detected'], replayed_gesture['pinch']) == \
+                (gesture['hand_state'], gesture['detected'], gesture['pinch'])
+
+
+def test_unchanged_hand_costs_one_byte():
+    encoder = InputEncoder(1)
+    gesture = {'hand_x': 0.25, 'hand_y': 0.75, 'hand_state': 'open', 'detected': True, 'pinch': True}
+    encoder.encode([gesture])
+    size = len(encoder.buffer)
+    encoder.encode([gesture])
+    assert len(encoder.buffer) == size + 1
+
+
+def test_autoplay_replay_verifies(tmp_path):
+    pygame.init()
+    path = str(tmp_path / 'autoplay.brr')
+    game = GameLogic(None, shared_camera=NullCamera(), seed=11)
+    agent = AutoplayAgent(game, seed=11)
+    game.recorder = ReplayRecorder(path, game, keyframe_interval=120)
+    for _ in range(900):
+        gesture = agent.act()
+        game.current_gesture = gesture
+        game.current_gestures = [gesture]
+        game.update()
+    game.recorder.close()
+    game.recorder = None
+    close_game(game)
+
+    replay = Replay(path)
+    assert replay.end_tick - replay.start_tick == 900
+    assert len(replay.keyframe_ticks) == 900 // 120 + 1
+    playback = replay.create_game()
+    try:
+        assert replay.verify(playback) == []
+    finally:
+        close_game(playback)
@@ -0,0 +1,87 @@
+import pygame
+import pytest
+
+import snapshot
+from autoplay import AutoplayAgent, NullCamera, close_game
+from game_logic import GameLogic
+
+
+@pytest.fixture
+def new_game():
+    pygame.init()
+    games = []
+
+    def create(**options):
+        game = GameLogic(None, shared_camera=NullCamera(), seed=options.pop('seed', 21), **options)
+        games.append(game)
+        return game
+
+    yield create
+    for game in games:
+        close_game(game)
+
+
+def play(game, ticks, seed=21):
+    agent = AutoplayAgent(game, seed=seed)
+    for _ in range(ticks):
+        gesture = agent.act()
+        game.current_gesture = gesture
+        game.current_gestures = [gesture]
+        game.update()
+
+
+def test_capture_restore_capture_round_trips(new_game):
+    game = new_game()
+    play(game, 600)
+    game.paddle.schedule_power_up_expiry('speed_up', 300)
+    data = snapshot.capture(game)
+
+    restored = new_game(seed=99)
+    snapshot.restore(restored, data)
+    assert snapshot.capture(restored) == data
+    assert (restored.score, restored.level, len(restored.balls)) == (game.score, game.level, len(game.balls))
+
+    # Both games carry on identically from the snapshot
+    play(game, 300, seed=5)
+    play(restored, 300, seed=5)
+    assert snapshot.capture(restored) == snapshot.capture(game)
+
+
+def test_long_timers_fit(new_game):
+    game = new_game()
+    game.paddle.schedule_power_up_expiry('big_paddle', 100000)
+    game.paddle.fist_action_cooldown = 70000
+    ball = game.spawn_ball(500, 400, 3, -5)
+    ball.start_power_shot(80000, 120)
+    data = snapshot.capture(game)
+
+    restored = new_game()
+    snapshot.restore(restored, data)
+    assert restored.timers.remaining(restored.paddle.power_ups['big_paddle']) == 100000
+    assert restored.paddle.fist_action_cooldown == 70000
+    assert restored.balls[0].power_shot_timer == 80000
+    assert snapshot.capture(restored) == data
+
+
+def test_restore_rejects_more_balls_than_the_pool_allows(new_game):
+    game = new_game()
+    for x in (300, 500, 700):
+        game.spawn_ball(x, 400, 3, -5)
+    data = snapshot.capture(game)
+
+    small = new_game(max_balls=2)
+    before = snapshot.capture(small)
+    with pytest.raises(ValueError):
+        snapshot.restore(small, data)
+    assert snapshot.capture(small) == before
+
+
+def test_file_round_trip(new_game, tmp_path):
+    game = new_game(difficulty="HARD", seed=1234)
+    path = str(tmp_path / 'save.snap')
+    saver = snapshot.Autosaver(path)
+    saver.save(game, snapshot.capture(game))
+    saver.close()
+    settings, data = snapshot.load(path)
+    assert settings == {'seed': 1234, 'players': 1, 'difficulty': "HARD", 'endless': False, 'run': game.run_id}
+    assert data == snapshot.capture(game)
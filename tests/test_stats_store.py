@@ -0,0 +1,52 @@
+import sqlite3
+
+from stats_store import StatsStore
+
+
+def test_run_keeps_one_score_row(tmp_path):
+    path = str(tmp_path / 'stats.db')
+    store = StatsStore(path)
+    store.record_score("EASY", 300, 2, run=7)
+    store.record_score("EASY", 200, 2, run=7)  # continued from the level start, then lost earlier
+    store.record_score("EASY", 500, 3, run=7)
+    store.record_score("EASY", 100, 1, run=8)
+    assert store.top_scores("EASY") == ((500, 3), (100, 1))
+    store.close()
+
+    connection = sqlite3.connect(path)
+    assert connection.execute("SELECT run, score, level FROM scores ORDER BY run").fetchall() == [(7, 500, 3),
+                                                                                                  (8, 100, 1)]
+    connection.close()
+    reopened = StatsStore(path)
+    assert reopened.top_scores("EASY") == ((500, 3), (100, 1))
+    reopened.close()
+
+
+def test_leaderboards_per_mode(tmp_path):
+    path = str(tmp_path / 'stats.db')
+    store = StatsStore(path)
+    store.record_score("HARD", 100, 1, run=1)
+    store.record_score("HARD", 900, 5, players=2, run=2)
+    store.record_score("HARD", 800, 9, endless=True, run=3)
+    store.close()
+    reopened = StatsStore(path)
+    for board in (store, reopened):
+        assert board.top_scores("HARD") == ((100, 1),)
+        assert board.top_scores("HARD", players=2) == ((900, 5),)
+        assert board.top_scores("HARD", endless=True) == ((800, 9),)
+    reopened.close()
+
+
+def test_adds_run_columns_to_old_database(tmp_path):
+    path = str(tmp_path / 'stats.db')
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE scores (id INTEGER PRIMARY KEY, played_at REAL, difficulty TEXT, "
+                       "score INTEGER, level INTEGER, players INTEGER, endless INTEGER)")
+    connection.execute("INSERT INTO scores (played_at, difficulty, score, level, players, endless) "
+                       "VALUES (0, 'EASY', 50, 1, 1, 0)")
+    connection.commit()
+    connection.close()
+    store = StatsStore(path)
+    store.record_score("EASY", 60, 1, run=5)
+    assert store.top_scores("EASY") == ((60, 1), (50, 1))
+    store.close()
@@ -0,0 +1,105 @@
+WHEEL_BITS = 6
+WHEEL_SIZE = 1 << WHEEL_BITS
+WHEEL_MASK = WHEEL_SIZE - 1
+WHEEL_LEVELS = 4
+MAX_DELAY = (1 << (WHEEL_BITS * WHEEL_LEVELS)) - 1  # ~77 hours at 60 ticks/s
+
+
+class Timer:
+    """A scheduled callback; keep it to cancel or query remaining ticks"""
+    __slots__ = ('deadline', 'callback', 'name', 'level', 'slot', 'active')
+
+    def __init__(self, deadline, callback, name):
+        self.deadline = deadline
+        self.callback = callback
+        self.name = name
+        self.level = 0
+        self.slot = 0
+        self.active = True
+
+
+class TimerWheel:
+    """Hierarchical timing wheel keyed by simulation tick.
+
+    Timers sit in a slot of the coarsest level that can hold their delay and
+    cascade down as their deadline approaches, so `advance` only touches the
+    slot for the current tick. Idle timers cost nothing per frame.
+    """
+
+    def __init__(self):
+        self.tick = 0
+        self._wheels = [[{} for _ in range(WHEEL_SIZE)] for _ in range(WHEEL_LEVELS)]
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def schedule(self, delay, callback=None, name=None):
+        """Call `callback()` after `delay` ticks and return the Timer"""
+        delay = max(1, min(MAX_DELAY, int(delay)))
+        timer = Timer(self.tick + delay, callback, name)
+        self._insert(timer)
+        self._count += 1
+        return timer
+
+    def cancel(self, timer):
+        if timer is None or not timer.active:
+            return
+        del self._wheels[timer.level][timer.slot][timer]
+        timer.active = False
+        self._count -= 1
+
+    def remaining(self, timer):
+        """Ticks until `timer` fires, or 0 if it is not pending"""
+        if timer is None or not timer.active:
+            return 0
+        return timer.deadline - self.tick
+
+    def advance(self):
+        """Move forward one tick and fire every timer that is now due"""
+        self.tick += 1
+        tick = self.tick
+
+        # Cascade coarser levels whose slot boundary we just crossed
+        for level in range(WHEEL_LEVELS - 1, 0, -1):
+            if tick & ((1 << (WHEEL_BITS * level)) - 1) == 0:
+                slot = self._wheels[level][(tick >> (WHEEL_BITS * level)) & WHEEL_MASK]
+                timers = list(slot)
+                slot.clear()
+                for timer in timers:
+                    self._insert(timer)
+
+        slot = self._wheels[0][tick & WHEEL_MASK]
+        if not slot:
+            return
+        due = list(slot)
+        slot.clear()
+        for timer in due:
+            timer.active = False
+            self._count -= 1
+        for timer in due:
+            if timer.callback is not None:
+                timer.callback()
+
+    def pending(self):
+        """(name, remaining ticks) for every pending timer, soonest first"""
+        timers = [timer for wheel in self._wheels for slot in wheel for timer in slot]
+        timers.sort(key=lambda timer: timer.deadline)
+        return [(timer.name, timer.deadline - self.tick) for timer in timers]
+
+    def clear(self):
+        for wheel in self._wheels:
+            for slot in wheel:
+                for timer in slot:
+                    timer.active = False
+                slot.clear()
+        self._count = 0
+
+    def _insert(self, timer):
+        delta = timer.deadline - self.tick
+        level = 0
+        while level < WHEEL_LEVELS - 1 and delta >= (1 << (WHEEL_BITS * (level + 1))):
+            level += 1
+        timer.level = level
+        timer.slot = (timer.deadline >> (WHEEL_BITS * level)) & WHEEL_MASK
+        self._wheels[level][timer.slot][timer] = None
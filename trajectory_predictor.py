@@ -1,4 +1,3 @@
-import pygame
 import math
 from game_objects import SCREEN_WIDTH, SCREEN_HEIGHT
 
@@ -51,10 +50,10 @@ class TrajectoryPredictor:
         px, py = pos
         return (block.x <= px <= block.x + block.width) and (block.y <= py <= block.y + block.height)
 
-    def draw(self, screen, points):
+    def draw(self, view, points):
         if len(points) < 2:
             return
         for i in range(1, len(points)):
             alpha = 255 * (1 - i / len(points))
             color = (255, 255, int(100 * (i / len(points))))
-            pygame.draw.line(screen, color, points[i - 1], points[i], 2)
+            view.line(color, points[i - 1], points[i], 2)
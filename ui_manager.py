@@ -1,6 +1,7 @@
 import pygame
 import sys
 from game_objects import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK, BLUE, GREEN, YELLOW, ORANGE, RED, CYAN
+from render_view import RenderView
 
 #.
 #.
@@ -8,18 +9,18 @@ from game_objects import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK, BLUE, GREEN,
 #.
 
 class UIManager:
-    def __init__(self):
+    def __init__(self, fullscreen=False, resizable=False, render_scale=1.0):
         pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.create_display(fullscreen, resizable, render_scale)
         pygame.display.set_caption("Gesture Block Breaker")
         self.clock = pygame.time.Clock()
         
-        # Fonts
+        # Fonts, sized for the render scale
         font_path = "assets/fonts/PressStart2P-Regular.ttf"
-        self.title_font = pygame.font.Font(font_path, 28)
-        self.subtitle_font = pygame.font.Font(font_path, 20)
-        self.font = pygame.font.Font(font_path, 18)
-        self.small_font = pygame.font.Font(font_path, 12)
+        self.title_font = self.view.font(font_path, 28)
+        self.subtitle_font = self.view.font(font_path, 20)
+        self.font = self.view.font(font_path, 18)
+        self.small_font = self.view.font(font_path, 12)
 
         
         # UI States
@@ -27,8 +28,8 @@ class UIManager:
         self.selected_option = 0
         
         # Menu options
-        self.home_options = ["PLAY GAME", "HOW TO PLAY", "QUIT"]
-        self.pause_options = ["RESUME", "RESTART", "HOME", "QUIT"]
+        self.home_options = ["PLAY GAME", "TWO PLAYER", "ENDLESS", "HOW TO PLAY", "QUIT"]
+        self.pause_options = ["RESUME", "RETRY LEVEL", "RESTART", "HOME", "QUIT"]
         self.game_over_options = ["PLAY AGAIN", "HOME", "QUIT"]
         self.difficulty_options = ["EASY", "MEDIUM", "HARD", "EXPERT"]
 
@@ -49,17 +50,42 @@ class UIManager:
         self.difficulty_button_rects = []
         self.update_button_rects()
 
-    def draw_button(self, screen, rect, text, selected=False):
+        # Cached menu layers: state -> (key, surface)
+        self.static_layers = {}
+        self.status_surfaces = {}
+
+    def create_display(self, fullscreen=False, resizable=False, render_scale=1.0):
+        """Create the window and `self.view`, which everything draws through in logical coordinates.
+
+        Fullscreen and resizable windows use SDL's SCALED mode, which stretches
+        the 1000x700 logical frame to the real window on the GPU, so physics and
+        drawing never see the real window size. Below a render scale of 1 the
+        view draws to a smaller off-screen surface that present() scales up.
+        """
+        flags = (pygame.FULLSCREEN if fullscreen else 0) | (pygame.RESIZABLE if resizable else 0)
+        if flags:
+            flags |= pygame.SCALED
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags)
+        surface = self.screen
+        if render_scale != 1:
+            surface = pygame.Surface(RenderView.render_size(render_scale)).convert()
+        self.view = RenderView(surface, render_scale)
+
+    def present(self):
+        if self.view.surface is not self.screen:
+            pygame.transform.scale(self.view.surface, self.screen.get_size(), self.screen)
+        pygame.display.flip()
+
+    def draw_button(self, view, rect, text, selected=False):
         bg_color = (34, 40, 49)
         border_color = (255, 255, 255) if selected else (100, 100, 100)
         text_color = (255, 255, 255)
 
-        pygame.draw.rect(screen, bg_color, rect, border_radius=8)
-        pygame.draw.rect(screen, border_color, rect, 2, border_radius=8)
+        view.rect(bg_color, rect, border_radius=8)
+        view.rect(border_color, rect, 2, border_radius=8)
 
         font_surface = self.font.render(text, True, text_color)
-        text_rect = font_surface.get_rect(center=rect.center)
-        screen.blit(font_surface, text_rect)
+        view.blit(font_surface, rect.center, 'center')
 
     # Add this method to the UIManager class
     def draw_level_info(self, level_name, difficulty):
@@ -67,11 +93,11 @@ class UIManager:
         if hasattr(self, 'current_level_name'):
             level_text = f"Level: {level_name}"
             level_surface = self.small_font.render(level_text, True, CYAN)
-            self.screen.blit(level_surface, (20, SCREEN_HEIGHT - 60))
+            self.view.blit(level_surface, (20, SCREEN_HEIGHT - 60))
             
             difficulty_text = f"Difficulty: {difficulty}"
             difficulty_surface = self.small_font.render(difficulty_text, True, YELLOW)
-            self.screen.blit(difficulty_surface, (20, SCREEN_HEIGHT - 40))
+            self.view.blit(difficulty_surface, (20, SCREEN_HEIGHT - 40))
 
 
 
@@ -167,25 +193,25 @@ class UIManager:
         for i in range(3, 0, -1):
             alpha_size = size + i * 3
             alpha_color = (color[0] // (i + 1), color[1] // (i + 1), color[2] // (i + 1))
-            pygame.draw.circle(self.screen, alpha_color, (self.cursor_x, self.cursor_y), alpha_size)
+            self.view.circle(alpha_color, (self.cursor_x, self.cursor_y), alpha_size)
         
         # Draw main cursor
-        pygame.draw.circle(self.screen, color, (self.cursor_x, self.cursor_y), size)
-        pygame.draw.circle(self.screen, WHITE, (self.cursor_x, self.cursor_y), size, 2)
+        self.view.circle(color, (self.cursor_x, self.cursor_y), size)
+        self.view.circle(WHITE, (self.cursor_x, self.cursor_y), size, 2)
         
         # Draw crosshair for precision
-        pygame.draw.line(self.screen, WHITE, 
-                        (self.cursor_x - size - 5, self.cursor_y), 
-                        (self.cursor_x - size, self.cursor_y), 2)
-        pygame.draw.line(self.screen, WHITE, 
-                        (self.cursor_x + size, self.cursor_y), 
-                        (self.cursor_x + size + 5, self.cursor_y), 2)
-        pygame.draw.line(self.screen, WHITE, 
-                        (self.cursor_x, self.cursor_y - size - 5), 
-                        (self.cursor_x, self.cursor_y - size), 2)
-        pygame.draw.line(self.screen, WHITE, 
-                        (self.cursor_x, self.cursor_y + size), 
-                        (self.cursor_x, self.cursor_y + size + 5), 2)
+        self.view.line(WHITE, 
+                       (self.cursor_x - size - 5, self.cursor_y), 
+                       (self.cursor_x - size, self.cursor_y), 2)
+        self.view.line(WHITE, 
+                       (self.cursor_x + size, self.cursor_y), 
+                       (self.cursor_x + size + 5, self.cursor_y), 2)
+        self.view.line(WHITE, 
+                       (self.cursor_x, self.cursor_y - size - 5), 
+                       (self.cursor_x, self.cursor_y - size), 2)
+        self.view.line(WHITE, 
+                       (self.cursor_x, self.cursor_y + size), 
+                       (self.cursor_x, self.cursor_y + size + 5), 2)
     
     def draw_gesture_status(self):
         """Draw gesture detection status"""
@@ -200,45 +226,79 @@ class UIManager:
             status_text = "No Hand Detected"
             color = ORANGE
         
-        status_surface = self.small_font.render(status_text, True, color)
+        # Only a few distinct status lines exist, so keep their rendered surfaces
+        status_surface = self.status_surfaces.get(status_text)
+        if status_surface is None:
+            status_surface = self.small_font.render(status_text, True, color)
+            self.status_surfaces[status_text] = status_surface
         # Position in top-left, below camera feed area
-        self.screen.blit(status_surface, (10, 170))
+        self.view.blit(status_surface, (10, 170))
     
-    def draw_static_background(self):
-        self.screen.fill((13, 17, 23))  # Deep navy/black — #0d1117
+    def draw_static_background(self, view=None):
+        (view or self.view).fill((13, 17, 23))  # Deep navy/black — #0d1117
+
+    def blit_static_layer(self, key, build, *args):
+        """Blit the cached static layer for the current menu, rebuilding it when `key` changes.
+
+        Backgrounds, titles, buttons and text only change with the state, the
+        selected option or the displayed score, so they are rendered once into
+        a surface; the cursor and camera preview are drawn on top each frame.
+        """
+        cached = self.static_layers.get(self.current_state)
+        if cached is None or cached[0] != key:
+            surface = self.view.offscreen()
+            build(RenderView(surface, self.view.scale), *args)
+            cached = (key, surface)
+            self.static_layers[self.current_state] = cached
+        self.view.blit(cached[1], (0, 0))
 
-    
     def draw_home_screen(self):
-        self.draw_static_background()
+        self.blit_static_layer(self.selected_option, self.build_home_layer)
+        self.draw_gesture_status()
+        self.draw_cursor()
+
+    def draw_instructions_screen(self):
+        self.blit_static_layer(None, self.build_instructions_layer)
+        self.draw_gesture_status()
+        self.draw_cursor()
+
+    def draw_difficulty_screen(self):
+        self.blit_static_layer(self.selected_option, self.build_difficulty_layer)
+        self.draw_gesture_status()
+        self.draw_cursor()
+
+    def draw_game_over_screen(self, score, level, high_scores=()):
+        """high_scores: ((score, level), ...) best first, from the in-memory leaderboard"""
+        self.blit_static_layer((self.selected_option, score, level, high_scores), self.build_game_over_layer,
+                               score, level, high_scores)
+        self.draw_gesture_status()
+        self.draw_cursor()
+
+    
+    def build_home_layer(self, view):
+        self.draw_static_background(view)
 
         # Title
         title_text = "GESTURE BREAKER"
         title_surface = self.title_font.render(title_text, True, (255, 255, 255))
-        title_rect = title_surface.get_rect(center=(SCREEN_WIDTH // 2, 120))
-        self.screen.blit(title_surface, title_rect)
+        view.blit(title_surface, (SCREEN_WIDTH // 2, 120), 'center')
 
         # Buttons
         for i, option in enumerate(self.home_options):
-            self.draw_button(self.screen, self.home_button_rects[i], option, i == self.selected_option)
+            self.draw_button(view, self.home_button_rects[i], option, i == self.selected_option)
 
 
         # Instructions
         instruction = "🖐️ Move hand to select • 🤏 Pinch to confirm • ESC to quit"
         text = self.small_font.render(instruction, True, (150, 150, 150))
-        rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 40))
-        self.screen.blit(text, rect)
+        view.blit(text, (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 40), 'center')
 
-        # Draw cursor and gesture feedback
-        self.draw_gesture_status()
-        self.draw_cursor()
 
-    
-    def draw_instructions_screen(self):
-        self.draw_static_background()
+    def build_instructions_layer(self, view):
+        self.draw_static_background(view)
 
         title_surface = self.subtitle_font.render("HOW TO PLAY", True, (255, 255, 255))
-        title_rect = title_surface.get_rect(center=(SCREEN_WIDTH//2, 60))
-        self.screen.blit(title_surface, title_rect)
+        view.blit(title_surface, (SCREEN_WIDTH//2, 60), 'center')
 
         start_y = 120
         lines = [
@@ -257,72 +317,69 @@ class UIManager:
         for i, line in enumerate(lines):
             if line.strip() == "":
                 continue
-            surface = self.small_font.render(line, True, (200, 200, 200))
-            rect = surface.get_rect(center=(SCREEN_WIDTH // 2, start_y + i * 26))
-            self.screen.blit(surface, rect)
+            line_surface = self.small_font.render(line, True, (200, 200, 200))
+            view.blit(line_surface, (SCREEN_WIDTH // 2, start_y + i * 26), 'center')
 
         back_surface = self.font.render("ESC or PINCH to go back", True, (150, 200, 255))
-        back_rect = back_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 40))
-        self.screen.blit(back_surface, back_rect)
+        view.blit(back_surface, (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 40), 'center')
 
-        self.draw_gesture_status()
-        self.draw_cursor()
 
-    
     def draw_pause_screen(self):
         # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        overlay = pygame.Surface(self.view.surface.get_size())
         overlay.set_alpha(128)
         overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.view.blit(overlay, (0, 0))
         
         # Pause title
         pause_surface = self.subtitle_font.render("PAUSED", True, YELLOW)
-        pause_rect = pause_surface.get_rect(center=(SCREEN_WIDTH//2, 200))
-        self.screen.blit(pause_surface, pause_rect)
+        self.view.blit(pause_surface, (SCREEN_WIDTH//2, 200), 'center')
         
         # Menu options
         start_y = 280
         for i, option in enumerate(self.pause_options):  # or game_over_options
-            self.draw_button(self.screen, self.pause_button_rects[i], option, i == self.selected_option)
+            self.draw_button(self.view, self.pause_button_rects[i], option, i == self.selected_option)
         
         # Draw gesture status and cursor
         self.draw_gesture_status()
         self.draw_cursor()
     
-    def draw_game_over_screen(self, score, level):
-        self.draw_static_background()
+    def build_game_over_layer(self, view, score, level, high_scores=()):
+        self.draw_static_background(view)
         
         # Game Over title
         game_over_surface = self.subtitle_font.render("GAME OVER", True, RED)
-        game_over_rect = game_over_surface.get_rect(center=(SCREEN_WIDTH//2, 150))
-        self.screen.blit(game_over_surface, game_over_rect)
+        view.blit(game_over_surface, (SCREEN_WIDTH//2, 150), 'center')
         
         # Final stats
         score_surface = self.font.render(f"Final Score: {score}", True, WHITE)
-        score_rect = score_surface.get_rect(center=(SCREEN_WIDTH//2, 200))
-        self.screen.blit(score_surface, score_rect)
+        view.blit(score_surface, (SCREEN_WIDTH//2, 200), 'center')
         
         level_surface = self.font.render(f"Level Reached: {level}", True, WHITE)
-        level_rect = level_surface.get_rect(center=(SCREEN_WIDTH//2, 240))
-        self.screen.blit(level_surface, level_rect)
+        view.blit(level_surface, (SCREEN_WIDTH//2, 240), 'center')
         
         # Menu options
         start_y = 320
         for i, option in enumerate(self.game_over_options):  # or game_over_options
-            self.draw_button(self.screen, self.pause_button_rects[i], option, i == self.selected_option)
-        
-        # Draw gesture status and cursor
-        self.draw_gesture_status()
-        self.draw_cursor()
+            self.draw_button(view, self.pause_button_rects[i], option, i == self.selected_option)
 
-    def draw_difficulty_screen(self):
-        self.draw_static_background()
+        # Leaderboard beside the buttons
+        if high_scores:
+            column_x = SCREEN_WIDTH * 5 // 6
+            title_surface = self.small_font.render("HIGH SCORES", True, YELLOW)
+            view.blit(title_surface, (column_x, 260), 'center')
+            for rank, (high_score, high_level) in enumerate(high_scores, 1):
+                color = YELLOW if (high_score, high_level) == (score, level) else WHITE
+                entry_surface = self.small_font.render(f"{rank}. {high_score}  (level {high_level})", True, color)
+                view.blit(entry_surface, (column_x, 260 + rank * 30), 'center')
+
+
+    def build_difficulty_layer(self, view):
+        self.draw_static_background(view)
 
         # Title
         title_surface = self.subtitle_font.render("SELECT DIFFICULTY", True, (255, 255, 255))
-        title_rect = title_surface.get_rect(center=(SCREEN_WIDTH // 2, 100))
-        self.screen.blit(title_surface, title_rect)
+        view.blit(title_surface, (SCREEN_WIDTH // 2, 100), 'center')
 
         # Difficulty descriptions
         descriptions = {
@@ -340,21 +397,15 @@ class UIManager:
             # Draw description first — above the button
             desc = descriptions[option]
             desc_surface = self.small_font.render(desc, True, (150, 200, 255))
-            desc_rect = desc_surface.get_rect(center=(rect.centerx, rect.top - 8))
-            self.screen.blit(desc_surface, desc_rect)
+            view.blit(desc_surface, (rect.centerx, rect.top - 8), 'center')
 
             # Then draw the button on top
-            self.draw_button(self.screen, rect, option, selected)
+            self.draw_button(view, rect, option, selected)
 
         # Back instruction
         back_text = "ESC to go back"
         back_surface = self.small_font.render(back_text, True, (180, 180, 180))
-        back_rect = back_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 40))
-        self.screen.blit(back_surface, back_rect)
-
-        self.draw_gesture_status()
-        self.draw_cursor()
-
+        view.blit(back_surface, (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 40), 'center')
 
 
     def handle_menu_input(self, event, gesture=None):
@@ -0,0 +1,89 @@
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+import pygame
+
+
+class VideoRecorder:
+    """Records the composited game screen to a video file on a background thread.
+
+    `capture` runs on the game thread once per drawn frame. At most `fps`
+    times a second it scales the screen into a preallocated surface and
+    copies that into one of a few preallocated frame buffers; a worker
+    converts and encodes buffers with cv2.VideoWriter. When every buffer is
+    still waiting for the encoder the frame is dropped, so a slow encoder
+    costs video frames, never game frames; the next frame that gets a
+    buffer is held for the dropped ones too, so the video keeps real time.
+    """
+
+    def __init__(self, path, source_size, fps=30, scale=0.5, buffers=4, fourcc="mp4v"):
+        self.path = path
+        self.fps = fps
+        # Most codecs need even dimensions
+        self.size = (max(2, int(source_size[0] * scale) // 2 * 2), max(2, int(source_size[1] * scale) // 2 * 2))
+        self.writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, self.size)
+        if not self.writer.isOpened():
+            raise OSError(f"cannot open a {fourcc} video writer for {path}")
+
+        self.scaled = pygame.Surface(self.size)
+        self.buffers = [np.empty((self.size[0], self.size[1], 3), dtype=np.uint8) for _ in range(buffers)]
+        self.free = queue.Queue()
+        for index in range(buffers):
+            self.free.put(index)
+        self.pending = queue.Queue()
+        self.start_time = None
+        self.frames_due = 0  # Video frames the elapsed time calls for so far
+        self.carry = 0  # Frames due since the last captured one, held by the next capture
+        self.written = 0
+        self.dropped = 0
+        self.thread = threading.Thread(target=self.encode_frames, name="video-encoder", daemon=True)
+        self.thread.start()
+
+    def capture(self, surface):
+        now = time.perf_counter()
+        if self.start_time is None:
+            self.start_time = now
+        due = int((now - self.start_time) * self.fps) + 1
+        repeat = due - self.frames_due
+        if repeat <= 0:
+            return
+        self.frames_due = due
+        repeat += self.carry
+        try:
+            index = self.free.get_nowait()
+        except queue.Empty:
+            self.carry = repeat
+            return
+        self.carry = 0
+        if surface.get_size() == self.size:
+            self.scaled.blit(surface, (0, 0))
+        else:
+            pygame.transform.scale(surface, self.size, self.scaled)
+        pygame.pixelcopy.surface_to_array(self.buffers[index], self.scaled)
+        # A slow game frame is held for the frames it covered, up to a second; beyond that they are dropped
+        held = min(repeat, max(1, int(self.fps)))
+        self.dropped += repeat - held
+        self.pending.put((index, held))
+
+    def encode_frames(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            index, repeat = item
+            # Buffers are (width, height, RGB) like pygame; OpenCV wants (height, width, BGR)
+            frame = cv2.cvtColor(np.ascontiguousarray(self.buffers[index].transpose(1, 0, 2)), cv2.COLOR_RGB2BGR)
+            self.free.put(index)
+            for _ in range(repeat):
+                self.writer.write(frame)
+            self.written += repeat
+        self.writer.release()
+
+    def close(self):
+        self.dropped += self.carry  # No later frame came to hold for them
+        self.carry = 0
+        self.pending.put(None)
+        self.thread.join()